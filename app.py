@@ -1,21 +1,53 @@
 """Streamlit application entry point for vibe-todo."""
 
+import os
+import time
+from datetime import date
+
 import streamlit as st
 from sqlalchemy import Engine
 
-from vibe_todo.database import create_db_and_tables, get_engine
-from vibe_todo.db_helper import get_db_session
-from vibe_todo.logger import logger
-from vibe_todo.services import get_all_lists, create_list
+from vibe_todo.database import get_session
+from vibe_todo.db_helper import (
+    affects_ui,
+    get_change_inbox,
+    get_db_session,
+    get_reminder_feed,
+    get_tenant_engine,
+)
+from vibe_todo.invalidation import get_data_generation
+from vibe_todo.logger import logger, setup_logger
+from vibe_todo.memory import (
+    MEMORY_SESSION_SAMPLE_RERUNS,
+    MEMORY_TRACE_RERUNS,
+    RerunCapture,
+    record_session_size,
+    session_state_sizes,
+    start_rss_sampler,
+    traced,
+)
+from vibe_todo.metrics import CACHE_LOOKUPS, CACHE_MISSES, RERUN_DURATION, start_metrics_exporter
+from vibe_todo.services import get_all_lists, create_list, get_badge_counts
 from vibe_todo.state import (
     init_session_state,
     get_current_view,
     set_current_view,
     get_selected_list_id,
     get_show_add_list_dialog,
-    set_show_add_list_dialog
+    set_show_add_list_dialog,
+    sweep_task_keys,
 )
-from vibe_todo.ui import render_my_day_view, render_important_view, render_planned_view, render_tasks_view
+from vibe_todo.views import get_view_renderer
+
+# Seconds between checks for changes made by other sessions
+LIVE_UPDATE_SECONDS = float(os.getenv("LIVE_UPDATE_SECONDS", "2"))
+
+# Set to "true" to show the Admin view (process memory and allocation reports).
+# Every visitor of every tenant sees it, so enable it only on operator deployments.
+ADMIN_VIEW_ENABLED = os.getenv("ADMIN_VIEW_ENABLED", "false").lower() == "true"
+
+# start of this rerun, for the rerun duration metric
+rerun_started = time.perf_counter()
 
 # configure page
 st.set_page_config(
@@ -25,35 +57,37 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# initialize logger
+# initialize logger (deferred from import time to here)
+setup_logger()
 logger.info("Application started")
 
+# Prometheus metrics endpoint and/or textfile, if configured (once per process)
+start_metrics_exporter()
+
+
+def with_badge(label: str, count: int) -> str:
+    """Append a count badge to a sidebar label when the count is non-zero."""
+    return f"{label} · {count}" if count else label
 
-@st.cache_resource
-def get_cached_engine() -> Engine:
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def load_sidebar_data(database_url: str, generation: int, today: date, _engine: Engine) -> tuple[list[tuple[int, str]], dict]:
     """
-    Get cached database engine using Streamlit's cache_resource.
-    
-    This ensures the engine is created once and reused across reruns.
-    
-    Returns:
-        Engine: SQLModel engine instance
+    Load custom lists and badge counts for the sidebar.
+
+    Cached per database and cache generation, so reruns skip the queries until
+    this or another process writes to the database.
     """
-    try:
-        engine = get_engine()
-        logger.info("Database engine cached successfully")
-        return engine
-    except Exception as e:
-        logger.error(f"Failed to cache database engine: {e}")
-        raise
+    CACHE_MISSES.labels("sidebar").inc()
+    with get_session(_engine) as session:
+        custom_lists = [(lst.id, lst.name) for lst in get_all_lists(session) if not lst.is_system and lst.id is not None]
+        badges = get_badge_counts(today, session)
+    return custom_lists, badges
 
 
-# initialize database
+# initialize the current tenant's database (bootstrapped once per process and file)
 try:
-    # Use cached engine to initialize database
-    engine = get_cached_engine()
-    create_db_and_tables()
-    logger.info("Database initialized successfully")
+    engine = get_tenant_engine()
 except Exception as e:
     logger.error(f"Failed to initialize database: {e}")
     st.error("Failed to initialize database. Please check the logs.")
@@ -62,6 +96,22 @@ except Exception as e:
 # initialize session state
 init_session_state()
 
+# this run reads fresh data, so earlier change notifications are already covered
+get_change_inbox(engine).drain()
+
+# reminders fired before this session opened are not replayed
+reminder_feed = get_reminder_feed(engine)
+st.session_state.setdefault("reminder_sequence", reminder_feed.sequence)
+
+# memory accounting: RSS sampled in the background, tracemalloc only for requested reruns
+start_rss_sampler()
+unfinished_capture = st.session_state.pop("memory_capture", None)
+if unfinished_capture is not None:
+    # the captured run was cut short by st.rerun()
+    unfinished_capture.finish(interrupted=True)
+if st.session_state.pop("memory_capture_requested", False) or MEMORY_TRACE_RERUNS:
+    st.session_state.memory_capture = RerunCapture(f"rerun {get_current_view()}")
+
 # create navigation sidebar
 with st.sidebar:
     st.title("📋 Vibe Todo")
@@ -72,51 +122,69 @@ with st.sidebar:
     
     current_view = get_current_view()
     
+    # Custom lists and badge counts, cached until the database changes
+    try:
+        CACHE_LOOKUPS.labels("sidebar").inc()
+        custom_lists, badges = load_sidebar_data(str(engine.url), get_data_generation(engine), date.today(), engine)
+    except Exception as e:
+        logger.error(f"Failed to fetch sidebar data: {e}")
+        st.error("Failed to load custom lists")
+        custom_lists, badges = [], {"lists": {}, "views": {}}
+    view_badges = badges["views"]
+    
     # My Day button
-    if st.button("📅 My Day", use_container_width=True, type="primary" if current_view == "My Day" else "secondary"):
+    if st.button(with_badge("📅 My Day", view_badges.get("My Day", 0)), key="view_my_day", use_container_width=True, type="primary" if current_view == "My Day" else "secondary"):
         set_current_view("My Day")
         st.rerun()
     
     # Important button
-    if st.button("⭐ Important", use_container_width=True, type="primary" if current_view == "Important" else "secondary"):
+    if st.button(with_badge("⭐ Important", view_badges.get("Important", 0)), key="view_important", use_container_width=True, type="primary" if current_view == "Important" else "secondary"):
         set_current_view("Important")
         st.rerun()
     
     # Planned button
-    if st.button("📆 Planned", use_container_width=True, type="primary" if current_view == "Planned" else "secondary"):
+    if st.button(with_badge("📆 Planned", view_badges.get("Planned", 0)), key="view_planned", use_container_width=True, type="primary" if current_view == "Planned" else "secondary"):
         set_current_view("Planned")
         st.rerun()
     
     # Tasks (All) button
-    if st.button("📝 Tasks", use_container_width=True, type="primary" if current_view == "Tasks" else "secondary"):
+    if st.button(with_badge("📝 Tasks", view_badges.get("Tasks", 0)), key="view_tasks", use_container_width=True, type="primary" if current_view == "Tasks" else "secondary"):
         set_current_view("Tasks")
         st.rerun()
     
+    # Stats button
+    if st.button("📊 Stats", use_container_width=True, type="primary" if current_view == "Stats" else "secondary"):
+        set_current_view("Stats")
+        st.rerun()
+
+    # Trash button
+    if st.button("🗑️ Trash", key="view_trash", use_container_width=True, type="primary" if current_view == "Trash" else "secondary"):
+        set_current_view("Trash")
+        st.rerun()
+
+    # Admin button
+    if ADMIN_VIEW_ENABLED and st.button("🛠️ Admin", key="view_admin", use_container_width=True, type="primary" if current_view == "Admin" else "secondary"):
+        set_current_view("Admin")
+        st.rerun()
+    
     st.divider()
     
     # Custom Lists section
     st.subheader("Lists")
     
-    # Fetch custom lists (non-system lists)
-    try:
-        with get_db_session() as session:
-            all_lists = get_all_lists(session)
-            custom_lists = [lst for lst in all_lists if not lst.is_system]
-            
-            # Display custom lists
-            for custom_list in custom_lists:
-                is_selected = (current_view == "List" and get_selected_list_id() == custom_list.id)
-                if st.button(
-                    f"📁 {custom_list.name}",
-                    use_container_width=True,
-                    type="primary" if is_selected else "secondary",
-                    key=f"list_{custom_list.id}"
-                ):
-                    set_current_view("List", custom_list.id)
-                    st.rerun()
-    except Exception as e:
-        logger.error(f"Failed to fetch custom lists: {e}")
-        st.error("Failed to load custom lists")
+    # Display custom lists (non-system lists)
+    for list_id, list_name in custom_lists:
+        is_selected = (current_view == "List" and get_selected_list_id() == list_id)
+        list_badge = badges["lists"].get(list_id, {"open": 0, "overdue": 0, "important": 0})
+        if st.button(
+            with_badge(f"📁 {list_name}", list_badge["open"]),
+            use_container_width=True,
+            type="primary" if is_selected else "secondary",
+            key=f"list_{list_id}",
+            help=f"{list_badge['open']} open · {list_badge['overdue']} overdue · {list_badge['important']} important",
+        ):
+            set_current_view("List", list_id)
+            st.rerun()
     
     st.divider()
     
@@ -156,14 +224,11 @@ if get_show_add_list_dialog():
 # main content
 current_view_name = get_current_view()
 with get_db_session() as session:
-    if current_view_name == "My Day":
-        render_my_day_view(session)
-    elif current_view_name == "Important":
-        render_important_view(session)
-    elif current_view_name == "Planned":
-        render_planned_view(session)
-    elif current_view_name == "Tasks":
-        render_tasks_view(session)
+    # only the active view's module is imported
+    render_view = get_view_renderer(current_view_name) if ADMIN_VIEW_ENABLED or current_view_name != "Admin" else None
+    if render_view is not None:
+        with traced(f"render {current_view_name}", enabled="memory_capture" in st.session_state):
+            render_view(session)
     else:
         st.title("Hello World!")
         st.header("Welcome to Vibe Todo")
@@ -174,5 +239,30 @@ with get_db_session() as session:
         else:
             st.write(f"**Current view:** {current_view_name}")
 
+# forget per-task state of cards this run no longer shows
+sweep_task_keys()
+
+# finish this rerun's capture and, every few reruns, estimate the session's state size
+st.session_state.rerun_count = st.session_state.get("rerun_count", 0) + 1
+finished_capture = st.session_state.pop("memory_capture", None)
+if finished_capture is not None:
+    finished_capture.finish()
+if finished_capture is not None or (st.session_state.rerun_count - 1) % MEMORY_SESSION_SAMPLE_RERUNS == 0:
+    record_session_size(st.session_state.session_origin, session_state_sizes(st.session_state))
+
+
+@st.fragment(run_every=LIVE_UPDATE_SECONDS)
+def watch_changes():
+    """Show due reminders and rerun the page when another session changed something it shows."""
+    for sequence, reminder in reminder_feed.since(st.session_state.reminder_sequence):
+        st.toast(f"{reminder.title} · {reminder.remind_at.strftime('%H:%M')}", icon="⏰")
+        st.session_state.reminder_sequence = sequence
+    if any(affects_ui(event) for event in get_change_inbox(engine).drain()):
+        st.rerun()
+
+
+watch_changes()
+
 # log that page was rendered
+RERUN_DURATION.labels(current_view_name).observe(time.perf_counter() - rerun_started)
 logger.info(f"Page rendered: {current_view_name}")
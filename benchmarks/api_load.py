@@ -0,0 +1,140 @@
+"""Local load test for the HTTP JSON API.
+
+Starts ``vibe_todo.api`` in-process against a throwaway tenant database,
+seeds it, and has concurrent clients hammer a mix of endpoints over
+keep-alive connections: view reads (half of them revalidating with
+If-None-Match), single task creates and /tasks/bulk creates. Reports
+throughput and latency percentiles per endpoint.
+
+Usage:
+    uv run python benchmarks/api_load.py [--clients N] [--seconds S] [--seed-tasks N] [--json]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from http.client import HTTPConnection
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+TENANT = "bench"
+
+
+def _request(connection: HTTPConnection, method: str, path: str, body=None, headers=None):
+    """Send one request and return the response with its raw body."""
+    payload = json.dumps(body).encode() if body is not None else None
+    connection.request(method, path, body=payload, headers={"X-Tenant-ID": TENANT, "Accept-Encoding": "gzip", **(headers or {})})
+    response = connection.getresponse()
+    return response, response.read()
+
+
+def client(port: int, list_ids: list[int], stop: threading.Event, samples: dict, lock: threading.Lock) -> None:
+    """Issue requests until stopped, recording (endpoint, seconds, status)."""
+    connection = HTTPConnection("127.0.0.1", port, timeout=30)
+    etags: dict[str, str] = {}
+    local = defaultdict(list)
+    while not stop.is_set():
+        roll = random.random()
+        if roll < 0.7:
+            path = random.choice(["/views/important", "/views/planned", "/views/my-day", "/views/badges", f"/lists/{random.choice(list_ids)}/tasks"])
+            headers = {"If-None-Match": etags[path]} if path in etags and random.random() < 0.5 else {}
+            method, body = "GET", None
+            name = "GET /lists/{id}/tasks" if path.startswith("/lists") else f"GET {path}"
+        elif roll < 0.95:
+            path, method, headers, name = "/tasks", "POST", {}, "POST /tasks"
+            body = {"list_id": random.choice(list_ids), "title": "load", "is_important": random.random() < 0.2}
+        else:
+            path, method, headers, name = "/tasks/bulk", "POST", {}, "POST /tasks/bulk"
+            body = {"tasks": [{"list_id": random.choice(list_ids), "title": f"bulk {i}"} for i in range(50)]}
+        started = time.perf_counter()
+        response, _ = _request(connection, method, path, body, headers)
+        local[name].append((time.perf_counter() - started, response.status))
+        if method == "GET" and (etag := response.getheader("ETag")):
+            etags[path] = etag
+    connection.close()
+    with lock:
+        for name, values in local.items():
+            samples[name].extend(values)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=8, help="concurrent keep-alive clients")
+    parser.add_argument("--seconds", type=float, default=10, help="duration of the run")
+    parser.add_argument("--seed-tasks", type=int, default=2000, help="tasks created before the run")
+    parser.add_argument("--json", action="store_true", help="print a single JSON result line")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        os.environ["TENANT_DATA_DIR"] = workdir
+        os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/default.db"
+
+        from vibe_todo.api import ApiServer
+        from vibe_todo.logger import setup_logger
+
+        setup_logger()
+        server = ApiServer(("127.0.0.1", 0))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        seed = HTTPConnection("127.0.0.1", server.server_port, timeout=60)
+        list_ids = [json.loads(_request(seed, "POST", "/lists", {"name": f"List {i}"})[1])["id"] for i in range(5)]
+        for start in range(0, args.seed_tasks, 500):
+            tasks = [
+                {"list_id": random.choice(list_ids), "title": f"Seed {i}", "is_important": i % 7 == 0}
+                for i in range(start, min(start + 500, args.seed_tasks))
+            ]
+            _request(seed, "POST", "/tasks/bulk", {"tasks": tasks})
+        seed.close()
+
+        samples: dict[str, list] = defaultdict(list)
+        stop, lock = threading.Event(), threading.Lock()
+        threads = [
+            threading.Thread(target=client, args=(server.server_port, list_ids, stop, samples, lock))
+            for _ in range(args.clients)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        server.shutdown()
+        server.pool.dispose_all()
+
+    result = {"clients": args.clients, "seconds": elapsed, "requests": sum(len(v) for v in samples.values()), "endpoints": {}}
+    result["requests_per_s"] = result["requests"] / elapsed
+    for name, values in sorted(samples.items()):
+        latencies = sorted(seconds for seconds, _ in values)
+        statuses = defaultdict(int)
+        for _, status in values:
+            statuses[status] += 1
+        result["endpoints"][name] = {
+            "count": len(values),
+            "p50_ms": statistics.median(latencies) * 1000,
+            "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000 if len(latencies) >= 20 else max(latencies) * 1000,
+            "statuses": dict(statuses),
+        }
+
+    if args.json:
+        print(json.dumps(result))
+        return
+
+    print(f"{result['requests']} requests from {args.clients} clients in {elapsed:.1f}s: {result['requests_per_s']:.0f} req/s")
+    for name, stats in result["endpoints"].items():
+        print(f"  {name:20} {stats['count']:7}  p50 {stats['p50_ms']:7.2f} ms  p95 {stats['p95_ms']:7.2f} ms  {stats['statuses']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""Concurrent-session load test for the Streamlit app.
+
+Drives ``app.py`` with ``streamlit.testing.v1.AppTest``: every simulated
+user owns one AppTest (one browser session) and walks a scripted journey
+against a seeded throwaway database - switching views, opening lists,
+toggling tasks, adding tasks to My Day and creating lists. Users run as
+threads of one process, like sessions of one Streamlit server, or with
+``--processes`` as one process each.
+
+Each concurrency level runs for ``--seconds`` and reports rerun latency
+percentiles per journey step, reruns per second, errors (separating
+"database is locked" failures), process RSS per session and the sessions'
+estimated ``st.session_state`` size. Together the levels form a scaling
+curve; ``--output`` saves it as JSON and ``--baseline`` prints the change
+against a curve saved earlier.
+
+Usage:
+    uv run python benchmarks/app_load.py [--users 1,2,4,8] [--seconds S] [--processes]
+        [--seed-tasks N] [--output curve.json] [--baseline curve.json] [--json]
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from uuid import uuid4
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+APP = str(ROOT / "app.py")
+
+# Sidebar buttons of the system views, by widget key
+VIEW_BUTTONS = ["view_my_day", "view_important", "view_planned", "view_tasks", "view_trash"]
+
+# Journey steps and how often users take them
+STEP_WEIGHTS = {"switch_view": 30, "open_list": 20, "toggle_task": 30, "add_to_my_day": 15, "create_list": 5}
+
+
+def seed_database(database_url: str, tasks: int, lists: int = 5) -> None:
+    """Create lists and tasks, a few of them important, due or already in My Day."""
+    from datetime import date, timedelta
+
+    from sqlmodel import Session
+
+    from vibe_todo.database import bootstrap, create_database_engine
+    from vibe_todo.services import add_to_my_day, create_list, create_tasks
+
+    engine = bootstrap(create_database_engine(database_url))
+    rng = random.Random(0)
+    today = date.today()
+    with Session(engine) as session:
+        list_ids = [create_list(f"List {i}", session).id for i in range(lists)]
+        task_ids = create_tasks(
+            [
+                {
+                    "list_id": rng.choice(list_ids),
+                    "title": f"Task {i}",
+                    "is_important": rng.random() < 0.15,
+                    "due_date": today + timedelta(days=rng.randint(-3, 20)) if rng.random() < 0.3 else None,
+                }
+                for i in range(tasks)
+            ],
+            session,
+        )
+        for task_id in rng.sample(task_ids, min(20, len(task_ids))):
+            add_to_my_day(task_id, today, session)
+    engine.dispose()
+
+
+def _share_test_runtime() -> None:
+    """
+    Let AppTest runs overlap in threads.
+
+    AppTest installs a mock Runtime before each run and clears it afterwards,
+    so a run in another thread can find none. Fall back to the last runtime
+    seen instead of failing.
+    """
+    from streamlit.runtime.runtime import Runtime
+
+    last = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            last[:] = [cls._instance]
+            return cls._instance
+        if last:
+            return last[0]
+        raise RuntimeError("Runtime hasn't been created!")
+
+    Runtime.instance = classmethod(instance)  # type: ignore[method-assign]
+
+
+def _keys(elements, prefix: str) -> list[str]:
+    return [element.key for element in elements if element.key and element.key.startswith(prefix)]
+
+
+def take_step(at, step: str, rng: random.Random, user: int):
+    """Perform one journey step on an AppTest and rerun it; return the AppTest or None if the step does not apply."""
+    if step == "switch_view":
+        return at.button(key=rng.choice(VIEW_BUTTONS)).click()
+    if step == "open_list":
+        keys = _keys(at.sidebar.button, "list_")
+        return at.button(key=rng.choice(keys)).click() if keys else None
+    if step == "toggle_task":
+        keys = _keys(at.checkbox, "complete_")
+        if not keys:
+            return None
+        checkbox = at.checkbox(key=rng.choice(keys))
+        return checkbox.set_value(not checkbox.value)
+    if step == "add_to_my_day":
+        keys = _keys(at.button, "add_suggestion_") or _keys(at.button, "add_to_my_day_")
+        if not keys:
+            return at.button(key="view_my_day").click()
+        return at.button(key=rng.choice(keys)).click()
+    if step == "create_list":
+        if not _keys(at.text_input, "new_list_name_input"):
+            return next(b for b in at.sidebar.button if b.label == "➕ Add New List").click()
+        at.text_input(key="new_list_name_input").input(f"Load {user}-{uuid4().hex[:8]}")
+        return next(b for b in at.sidebar.button if b.label == "Create").click()
+    raise ValueError(f"Unknown step {step}")
+
+
+def run_user(user: int, seconds: float, samples: list, barrier=None) -> None:
+    """
+    Run one session's journey for a number of seconds.
+
+    Appends (step, seconds, outcome) to samples, where outcome is "ok",
+    "locked" or "error".
+    """
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(user)
+    steps, weights = list(STEP_WEIGHTS), list(STEP_WEIGHTS.values())
+    at = AppTest.from_file(APP, default_timeout=60)
+    started = time.perf_counter()
+    at.run()
+    samples.append(("first_render", time.perf_counter() - started, _outcome(at)))
+    if barrier is not None:
+        barrier.wait()
+
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        step = rng.choices(steps, weights)[0]
+        try:
+            prepared = take_step(at, step, rng, user)
+            if prepared is None:
+                continue
+            started = time.perf_counter()
+            prepared.run()
+            samples.append((step, time.perf_counter() - started, _outcome(at)))
+        except Exception as e:
+            samples.append((step, 0.0, "locked" if "locked" in str(e) else "error"))
+            at = AppTest.from_file(APP, default_timeout=60)
+            at.run()
+
+
+def _outcome(at) -> str:
+    """Classify a finished rerun by its exceptions and error messages."""
+    messages = [str(e.value) for e in at.exception] + [str(e.value) for e in at.error]
+    if any("locked" in message for message in messages):
+        return "locked"
+    return "error" if messages else "ok"
+
+
+def _process_user(user: int, seconds: float, queue, barrier) -> None:
+    """Entry point of one user process: run the journey and report samples, RSS and session_state sizes."""
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    from vibe_todo.memory import process_rss, session_sizes
+
+    samples: list = []
+    run_user(user, seconds, samples, barrier)
+    queue.put((samples, process_rss(), [size.total for size in session_sizes().values()]))
+
+
+def run_level(users: int, seconds: float, processes: bool) -> dict:
+    """Run one concurrency level and summarize it."""
+    from vibe_todo import memory
+
+    memory._sessions.clear()
+    samples: list = []
+    started = time.perf_counter()
+    if processes:
+        context = multiprocessing.get_context("spawn")
+        queue, barrier = context.Queue(), context.Barrier(users)
+        workers = [context.Process(target=_process_user, args=(user, seconds, queue, barrier)) for user in range(users)]
+        for worker in workers:
+            worker.start()
+        results = [queue.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+        for user_samples, _, _ in results:
+            samples.extend(user_samples)
+        rss_per_session = statistics.mean(rss for _, rss, _ in results)
+        state_sizes = [size for _, _, sizes in results for size in sizes]
+    else:
+        baseline_rss = memory.process_rss()
+        barrier = threading.Barrier(users)
+        threads = [threading.Thread(target=run_user, args=(user, seconds, samples, barrier)) for user in range(users)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        rss_per_session = max(memory.process_rss() - baseline_rss, 0) / users
+        state_sizes = [size.total for size in memory.session_sizes().values()]
+    elapsed = time.perf_counter() - started
+
+    reruns = [sample for sample in samples if sample[0] != "first_render"]
+    result = {
+        "users": users,
+        "seconds": elapsed,
+        "reruns": len(reruns),
+        "reruns_per_s": len(reruns) / seconds,
+        "errors": sum(outcome == "error" for _, _, outcome in samples),
+        "lock_errors": sum(outcome == "locked" for _, _, outcome in samples),
+        "rss_mib_per_session": rss_per_session / 2**20,
+        "session_state_kib": statistics.mean(state_sizes) / 1024 if state_sizes else None,
+        "latency_ms": _percentiles([seconds for _, seconds, _ in reruns]),
+        "steps": {},
+    }
+    by_step = defaultdict(list)
+    for step, seconds_taken, _ in samples:
+        by_step[step].append(seconds_taken)
+    for step, values in sorted(by_step.items()):
+        result["steps"][step] = {"count": len(values), **_percentiles(values)}
+    return result
+
+
+def _percentiles(values: list[float]) -> dict:
+    """p50/p95/p99 of latencies in milliseconds."""
+    if not values:
+        return {"p50": None, "p95": None, "p99": None}
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(int(len(ordered) * q), len(ordered) - 1)] * 1000  # noqa: E731
+    return {"p50": statistics.median(ordered) * 1000, "p95": pick(0.95), "p99": pick(0.99)}
+
+
+def _print_curve(curve: list[dict], baseline: dict | None) -> None:
+    """Print the scaling curve, with changes against a baseline curve when given."""
+    print(f"{'users':>5}  {'reruns/s':>8}  {'p50 ms':>7}  {'p95 ms':>7}  {'p99 ms':>7}  {'errors':>6}  {'locked':>6}  {'MiB/user':>8}  {'state KiB':>9}")
+    for level in curve:
+        latency = level["latency_ms"]
+        line = (
+            f"{level['users']:5}  {level['reruns_per_s']:8.1f}  {latency['p50'] or 0:7.1f}  {latency['p95'] or 0:7.1f}  "
+            f"{latency['p99'] or 0:7.1f}  {level['errors']:6}  {level['lock_errors']:6}  {level['rss_mib_per_session']:8.1f}  "
+            f"{level['session_state_kib'] or 0:9.1f}"
+        )
+        previous = (baseline or {}).get(level["users"])
+        if previous and previous["reruns_per_s"] and previous["latency_ms"]["p95"]:
+            throughput = level["reruns_per_s"] / previous["reruns_per_s"] - 1
+            p95 = (latency["p95"] or 0) / previous["latency_ms"]["p95"] - 1
+            line += f"   vs baseline: throughput {throughput:+.0%}, p95 {p95:+.0%}"
+        print(line)
+    print("\nPer step at the highest level:")
+    for step, stats in curve[-1]["steps"].items():
+        print(f"  {step:14} {stats['count']:6}  p50 {stats['p50']:7.1f} ms  p95 {stats['p95']:7.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", default="1,2,4,8", help="comma-separated concurrency levels")
+    parser.add_argument("--seconds", type=float, default=20, help="duration of each level")
+    parser.add_argument("--processes", action="store_true", help="one process per user instead of threads")
+    parser.add_argument("--seed-tasks", type=int, default=500, help="tasks created before the run")
+    parser.add_argument("--output", help="write the curve to this JSON file")
+    parser.add_argument("--baseline", help="compare against a curve written by --output")
+    parser.add_argument("--json", action="store_true", help="print a single JSON result line")
+    args = parser.parse_args()
+    levels = [int(users) for users in args.users.split(",")]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/todos.db"
+        os.environ["TENANT_DATA_DIR"] = workdir
+        logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+        from vibe_todo.logger import setup_logger
+
+        setup_logger()
+        seed_database(os.environ["DATABASE_URL"], args.seed_tasks)
+        _share_test_runtime()
+        curve = [run_level(users, args.seconds, args.processes) for users in levels]
+
+    result = {"mode": "processes" if args.processes else "threads", "seed_tasks": args.seed_tasks, "levels": curve}
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2))
+    if args.json:
+        print(json.dumps(result))
+        return
+
+    baseline = None
+    if args.baseline:
+        baseline = {level["users"]: level for level in json.loads(Path(args.baseline).read_text())["levels"]}
+    print(f"{result['mode']}, {args.seconds:.0f}s per level, {args.seed_tasks} seeded tasks\n")
+    _print_curve(curve, baseline)
+
+
+if __name__ == "__main__":
+    main()
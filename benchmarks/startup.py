@@ -0,0 +1,118 @@
+"""Cold-start benchmark for vibe-todo.
+
+Measures, each in a fresh interpreter:
+- the ``-X importtime`` profile of the modules app.py imports before the first paint
+- wall-clock time of those imports
+- time to the first full render of app.py under Streamlit's AppTest
+
+Usage:
+    uv run python benchmarks/startup.py [--runs N] [--top N] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules app.py imports before rendering anything
+STARTUP_MODULES = [
+    "streamlit",
+    "vibe_todo.database",
+    "vibe_todo.db_helper",
+    "vibe_todo.services",
+    "vibe_todo.state",
+    "vibe_todo.views",
+]
+
+FIRST_RENDER_SCRIPT = f"""
+import time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({str(ROOT / "app.py")!r}, default_timeout=60).run()
+assert not at.exception, at.exception
+print(time.perf_counter() - started)
+"""
+
+
+def _run_python(args: list[str], cwd: str | None = None) -> subprocess.CompletedProcess:
+    """Run the current interpreter with src/ on the path."""
+    env = {**os.environ, "PYTHONPATH": str(ROOT / "src"), "LOG_LEVEL": "WARNING"}
+    return subprocess.run(
+        [sys.executable, *args], cwd=cwd, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def import_profile(modules: list[str]) -> list[tuple[str, int, int]]:
+    """
+    Collect the -X importtime profile for importing modules.
+
+    Returns:
+        list[tuple[str, int, int]]: (module, self_us, cumulative_us), slowest cumulative first
+    """
+    result = _run_python(["-X", "importtime", "-c", "import " + ", ".join(modules)])
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return sorted(rows, key=lambda row: row[2], reverse=True)
+
+
+def import_wall_time(modules: list[str]) -> float:
+    """Measure the wall-clock seconds to import modules in a fresh interpreter."""
+    script = "import time; t = time.perf_counter(); import " + ", ".join(modules) + "; print(time.perf_counter() - t)"
+    return float(_run_python(["-c", script]).stdout.strip())
+
+
+def first_render_time() -> float:
+    """Measure seconds to the first full render of app.py against an empty database."""
+    with tempfile.TemporaryDirectory() as workdir:
+        return float(_run_python(["-c", FIRST_RENDER_SCRIPT], cwd=workdir).stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    parser.add_argument("--json", action="store_true", help="print a single JSON result line")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    import_times = [import_wall_time(STARTUP_MODULES) for _ in range(args.runs)]
+    render_times = [first_render_time() for _ in range(args.runs)]
+    profile = import_profile(STARTUP_MODULES)
+
+    result = {
+        "import_s_median": statistics.median(import_times),
+        "import_s_min": min(import_times),
+        "first_render_s_median": statistics.median(render_times),
+        "first_render_s_min": min(render_times),
+        "runs": args.runs,
+        "slowest_imports": [
+            {"module": name, "self_ms": self_us / 1000, "cumulative_ms": cumulative_us / 1000}
+            for name, self_us, cumulative_us in profile[: args.top]
+        ],
+    }
+
+    if args.json:
+        print(json.dumps(result))
+        return
+
+    print(f"Startup imports: median {result['import_s_median'] * 1000:.0f} ms, min {result['import_s_min'] * 1000:.0f} ms")
+    print(f"First render:    median {result['first_render_s_median'] * 1000:.0f} ms, min {result['first_render_s_min'] * 1000:.0f} ms")
+    print("\nSlowest imports (cumulative):")
+    for row in result["slowest_imports"]:
+        print(f"  {row['cumulative_ms']:8.1f} ms  {row['self_ms']:7.1f} ms self  {row['module']}")
+    print(f"\n({args.runs} runs in {time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
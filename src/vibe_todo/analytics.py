@@ -0,0 +1,366 @@
+"""Columnar analytics over tasks using NumPy arrays.
+
+The snapshot loads the ``task``, ``subtask`` and ``mydaytask`` tables into
+NumPy column arrays in one streamed pass and computes dashboard aggregates
+with vectorized operations. Later refreshes only fetch tasks whose
+``updated_at`` is newer than the last watermark, less a safety margin for
+rows stamped before it but committed after the previous refresh.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import Engine, func, select, union_all
+from sqlmodel import col
+
+from vibe_todo.logger import logger
+from vibe_todo.models import ArchivedSubtask, ArchivedTask, MyDaySummary, MyDayTask, Subtask, Task, TodoList
+
+# Rows fetched per round trip while streaming tables into arrays
+CHUNK_SIZE = 10_000
+
+# How far before the watermark refreshes look again; must exceed the longest write transaction
+WATERMARK_MARGIN_SECONDS = float(os.getenv("ANALYTICS_WATERMARK_MARGIN_SECONDS", "300"))
+
+_TASK_COLUMNS = (
+    col(Task.id),
+    col(Task.list_id),
+    col(Task.is_completed),
+    col(Task.is_important),
+    col(Task.due_date),
+    col(Task.created_at),
+    col(Task.updated_at),
+)
+_TASK_DTYPES = {
+    "id": np.int64,
+    "list_id": np.int64,
+    "is_completed": np.bool_,
+    "is_important": np.bool_,
+    "due_date": "datetime64[D]",
+    "created_at": "datetime64[us]",
+    "updated_at": "datetime64[us]",
+}
+_SUBTASK_COLUMNS = (col(Subtask.id), col(Subtask.task_id), col(Subtask.is_completed))
+_SUBTASK_DTYPES = {"id": np.int64, "task_id": np.int64, "is_completed": np.bool_}
+_MY_DAY_COLUMNS = (col(MyDayTask.task_id), col(MyDayTask.task_date))
+
+# Tasks in the Trash are left out of all statistics
+_LIVE = col(Task.deleted_at).is_(None)
+
+# Archived tasks of live lists count too. Their ids are negated so they can
+# never clash with hot task ids; archived rows never change, so refreshes
+# only detect them through the row count.
+_ARCHIVED_TASKS = (
+    select(
+        (-col(ArchivedTask.id)).label("id"),
+        col(ArchivedTask.list_id),
+        col(ArchivedTask.is_completed),
+        col(ArchivedTask.is_important),
+        col(ArchivedTask.due_date),
+        col(ArchivedTask.created_at),
+        col(ArchivedTask.updated_at),
+    )
+    .join(TodoList, col(TodoList.id) == ArchivedTask.list_id)
+    .where(col(TodoList.deleted_at).is_(None))
+)
+_ALL_TASKS = union_all(select(*_TASK_COLUMNS).where(_LIVE), _ARCHIVED_TASKS)
+_ALL_SUBTASKS = union_all(
+    select(*_SUBTASK_COLUMNS),
+    select(col(ArchivedSubtask.id), (-col(ArchivedSubtask.task_id)).label("task_id"), col(ArchivedSubtask.is_completed)),
+)
+_MY_DAY_DTYPES = {"task_id": np.int64, "task_date": "datetime64[D]"}
+
+# Days whose My Day entries were compacted (see services.compact_my_day); a small table, reloaded on every refresh
+_SUMMARY_COLUMNS = (col(MyDaySummary.task_date), col(MyDaySummary.planned), col(MyDaySummary.completed))
+_SUMMARY_DTYPES = {"task_date": "datetime64[D]", "planned": np.int64, "completed": np.int64}
+
+
+def _empty_columns(dtypes: dict) -> dict[str, np.ndarray]:
+    """Create a set of empty column arrays."""
+    return {name: np.empty(0, dtype=dtype) for name, dtype in dtypes.items()}
+
+
+def _stream_columns(engine: Engine, statement, dtypes: dict) -> dict[str, np.ndarray]:
+    """
+    Execute a statement and convert its rows into NumPy column arrays.
+
+    Rows are streamed in chunks of CHUNK_SIZE so the full result set is never
+    materialized as Python objects at once.
+
+    Args:
+        engine: Database engine
+        statement: Select statement whose columns match the dtypes order
+        dtypes: Mapping of column name to NumPy dtype
+
+    Returns:
+        dict[str, np.ndarray]: Column arrays keyed by name
+    """
+    names = list(dtypes)
+    chunks: dict[str, list[np.ndarray]] = {name: [] for name in names}
+
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=CHUNK_SIZE).execute(statement)
+        for partition in result.partitions():
+            for name, values in zip(names, zip(*partition)):
+                chunks[name].append(np.array(values, dtype=dtypes[name]))
+
+    return {
+        name: np.concatenate(parts) if parts else np.empty(0, dtype=dtypes[name])
+        for name, parts in chunks.items()
+    }
+
+
+def _drop_rows(columns: dict[str, np.ndarray], mask: np.ndarray) -> dict[str, np.ndarray]:
+    """Return columns with the rows selected by mask removed."""
+    return {name: values[~mask] for name, values in columns.items()}
+
+
+def _append_rows(columns: dict[str, np.ndarray], other: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Return columns with the rows of other appended."""
+    return {name: np.concatenate([values, other[name]]) for name, values in columns.items()}
+
+
+class TaskSnapshot:
+    """
+    In-memory columnar snapshot of tasks, subtasks and My Day entries.
+
+    Subtask services touch the parent task's ``updated_at``, so subtasks are
+    refreshed together with the tasks that changed. My Day entries are
+    reloaded from the date of the previous refresh onwards, the summaries of
+    compacted days in full.
+
+    Example:
+        snapshot = TaskSnapshot(engine)
+        snapshot.refresh()
+        rates = snapshot.completion_rate_by_list()
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.tasks = _empty_columns(_TASK_DTYPES)
+        self.subtasks = _empty_columns(_SUBTASK_DTYPES)
+        self.my_day = _empty_columns(_MY_DAY_DTYPES)
+        self.my_day_summary = _empty_columns(_SUMMARY_DTYPES)
+        self.watermark: datetime | None = None
+        self.my_day_watermark: date | None = None
+        self.generation: int | None = None
+        self._lock = threading.Lock()
+
+    def refresh(self, generation: int | None = None) -> None:
+        """
+        Load the tables on first use, then merge changes since the last watermark.
+
+        Args:
+            generation: Cache generation of the database (see vibe_todo.invalidation);
+                when it matches the last refresh on the same day, no query is run
+        """
+        with self._lock:
+            if (
+                generation is not None
+                and generation == self.generation
+                and self.my_day_watermark == date.today()
+            ):
+                return
+            if self.watermark is None:
+                self._load_all()
+            else:
+                self._load_changes()
+            self.generation = generation
+
+    def _load_all(self) -> None:
+        """Load every table from scratch."""
+        started = datetime.now()
+        self.tasks = _stream_columns(self.engine, _ALL_TASKS, _TASK_DTYPES)
+        self.subtasks = _stream_columns(self.engine, _ALL_SUBTASKS, _SUBTASK_DTYPES)
+        self.my_day = _stream_columns(self.engine, select(*_MY_DAY_COLUMNS), _MY_DAY_DTYPES)
+        self.my_day_summary = _stream_columns(self.engine, select(*_SUMMARY_COLUMNS), _SUMMARY_DTYPES)
+        self._advance_watermarks()
+        logger.info(
+            f"Analytics snapshot loaded: {len(self.tasks['id'])} tasks, "
+            f"{len(self.subtasks['id'])} subtasks, {len(self.my_day['task_id'])} My Day entries "
+            f"in {(datetime.now() - started).total_seconds():.3f}s"
+        )
+
+    def _load_changes(self) -> None:
+        """Merge tasks updated since the watermark and drop deleted or trashed ones."""
+        # another writer may commit a row stamped before the watermark after we read it;
+        # rows read twice replace themselves, as merging drops their ids first
+        margin = timedelta(seconds=WATERMARK_MARGIN_SECONDS)
+        watermark = self.watermark or datetime.min
+        since = watermark - margin if watermark - datetime.min > margin else datetime.min
+        changed = _stream_columns(
+            self.engine,
+            select(*_TASK_COLUMNS).where(col(Task.updated_at) > since, _LIVE),
+            _TASK_DTYPES,
+        )
+        changed_ids = changed["id"]
+
+        if len(changed_ids):
+            self.tasks = _append_rows(_drop_rows(self.tasks, np.isin(self.tasks["id"], changed_ids)), changed)
+            if len(changed_ids) > CHUNK_SIZE:
+                # Too many ids for one IN clause; a full reload is cheaper
+                self.subtasks = _stream_columns(self.engine, _ALL_SUBTASKS, _SUBTASK_DTYPES)
+            else:
+                changed_subtasks = _stream_columns(
+                    self.engine,
+                    select(*_SUBTASK_COLUMNS).where(col(Subtask.task_id).in_(changed_ids.tolist())),
+                    _SUBTASK_DTYPES,
+                )
+                self.subtasks = _append_rows(
+                    _drop_rows(self.subtasks, np.isin(self.subtasks["task_id"], changed_ids)),
+                    changed_subtasks,
+                )
+
+        # Deletions, trashed and archived tasks leave no watermark behind; compare row counts to detect them
+        archived = _ARCHIVED_TASKS.subquery()
+        with self.engine.connect() as conn:
+            task_count = conn.execute(select(func.count()).select_from(Task).where(_LIVE)).scalar_one()
+            archived_count = conn.execute(select(func.count()).select_from(archived)).scalar_one()
+        if task_count != np.count_nonzero(self.tasks["id"] > 0):
+            live_ids = _stream_columns(self.engine, select(col(Task.id)).where(_LIVE), {"id": np.int64})["id"]
+            gone = (self.tasks["id"] > 0) & ~np.isin(self.tasks["id"], live_ids)
+            self.subtasks = _drop_rows(self.subtasks, np.isin(self.subtasks["task_id"], self.tasks["id"][gone]))
+            self.tasks = _drop_rows(self.tasks, gone)
+        if archived_count != np.count_nonzero(self.tasks["id"] < 0):
+            # Newly archived tasks are only reachable through their archive ids; start over
+            self._load_all()
+            return
+
+        my_day_watermark = self.my_day_watermark or date.min
+        recent_days = _stream_columns(
+            self.engine,
+            select(*_MY_DAY_COLUMNS).where(col(MyDayTask.task_date) >= my_day_watermark),
+            _MY_DAY_DTYPES,
+        )
+        stale = self.my_day["task_date"] >= np.datetime64(my_day_watermark, "D")
+        stale |= ~np.isin(self.my_day["task_id"], self.tasks["id"])
+        # entries of compacted days are gone from the table and now counted by their summary
+        self.my_day_summary = _stream_columns(self.engine, select(*_SUMMARY_COLUMNS), _SUMMARY_DTYPES)
+        stale |= np.isin(self.my_day["task_date"], self.my_day_summary["task_date"])
+        self.my_day = _append_rows(_drop_rows(self.my_day, stale), recent_days)
+
+        self._advance_watermarks()
+        logger.debug(f"Analytics snapshot refreshed: {len(changed_ids)} changed tasks")
+
+    def _advance_watermarks(self) -> None:
+        """Move the watermarks to the newest data held in the snapshot."""
+        updated_at = self.tasks["updated_at"]
+        if len(updated_at):
+            self.watermark = updated_at.max().astype(datetime)
+        elif self.watermark is None:
+            self.watermark = datetime.min
+        self.my_day_watermark = date.today()
+
+    # ------------------------------------------------------------------------
+    # Aggregates
+    # ------------------------------------------------------------------------
+
+    def completion_rate_by_list(self) -> dict[int, dict[str, float]]:
+        """
+        Compute total, completed and completion rate per list.
+
+        Returns:
+            dict[int, dict[str, float]]: Stats keyed by list id
+        """
+        list_ids, inverse = np.unique(self.tasks["list_id"], return_inverse=True)
+        totals = np.bincount(inverse, minlength=len(list_ids))
+        completed = np.bincount(inverse, weights=self.tasks["is_completed"], minlength=len(list_ids))
+        return {
+            int(list_id): {"total": int(total), "completed": int(done), "rate": float(done / total)}
+            for list_id, total, done in zip(list_ids, totals, completed)
+        }
+
+    def overdue_count(self, today: date | None = None) -> int:
+        """
+        Count incomplete tasks whose due date is before today.
+
+        Args:
+            today: Reference date (defaults to date.today())
+
+        Returns:
+            int: Number of overdue tasks
+        """
+        today_d = np.datetime64(today or date.today(), "D")
+        due = self.tasks["due_date"]
+        return int(np.count_nonzero(~self.tasks["is_completed"] & ~np.isnat(due) & (due < today_d)))
+
+    def due_date_histogram(self, start: date, end: date, include_completed: bool = False) -> dict[date, int]:
+        """
+        Count tasks due on each day of an inclusive date range.
+
+        Args:
+            start: First day of the range
+            end: Last day of the range
+            include_completed: Whether completed tasks are counted
+
+        Returns:
+            dict[date, int]: Number of tasks due per day
+        """
+        start_d = np.datetime64(start, "D")
+        end_d = np.datetime64(end, "D")
+        days = max(int((end_d - start_d).astype(int)) + 1, 0)
+        due = self.tasks["due_date"]
+        mask = ~np.isnat(due) & (due >= start_d) & (due <= end_d)
+        if not include_completed:
+            mask &= ~self.tasks["is_completed"]
+        counts = np.bincount((due[mask] - start_d).astype(int), minlength=days)
+        return {(start_d + np.timedelta64(i, "D")).astype(date): int(n) for i, n in enumerate(counts)}
+
+    def my_day_adherence(self, start: date, end: date) -> dict[date, dict[str, float]]:
+        """
+        Compute how many My Day tasks were completed for each day in a range.
+
+        Completion reflects the task's current status, not its status at the
+        end of that day; for compacted days it is the status at compaction.
+
+        Args:
+            start: First day of the range
+            end: Last day of the range
+
+        Returns:
+            dict[date, dict[str, float]]: Planned, completed and rate per day with entries
+        """
+        task_dates = self.my_day["task_date"]
+        mask = (task_dates >= np.datetime64(start, "D")) & (task_dates <= np.datetime64(end, "D"))
+        task_ids, task_dates = self.my_day["task_id"][mask], task_dates[mask]
+
+        order = np.argsort(self.tasks["id"])
+        sorted_ids = self.tasks["id"][order]
+        positions = np.clip(np.searchsorted(sorted_ids, task_ids), 0, max(len(sorted_ids) - 1, 0))
+        found = sorted_ids[positions] == task_ids if len(sorted_ids) else np.zeros(len(task_ids), dtype=bool)
+        completed = np.zeros(len(task_ids), dtype=bool)
+        completed[found] = self.tasks["is_completed"][order][positions[found]]
+
+        summary_dates = self.my_day_summary["task_date"]
+        in_range = (summary_dates >= np.datetime64(start, "D")) & (summary_dates <= np.datetime64(end, "D"))
+        task_dates = np.concatenate([task_dates, summary_dates[in_range]])
+        days, inverse = np.unique(task_dates, return_inverse=True)
+        planned = np.bincount(
+            inverse,
+            weights=np.concatenate([np.ones(len(task_ids)), self.my_day_summary["planned"][in_range]]),
+            minlength=len(days),
+        )
+        done = np.bincount(
+            inverse,
+            weights=np.concatenate([completed, self.my_day_summary["completed"][in_range]]),
+            minlength=len(days),
+        )
+        return {
+            day.astype(date): {"planned": int(p), "completed": int(d), "rate": float(d / p)}
+            for day, p, d in zip(days, planned, done)
+        }
+
+    def subtask_progress(self) -> dict[str, float]:
+        """
+        Compute overall subtask completion.
+
+        Returns:
+            dict[str, float]: Total, completed and completion rate of subtasks
+        """
+        total = len(self.subtasks["id"])
+        completed = int(np.count_nonzero(self.subtasks["is_completed"]))
+        return {"total": total, "completed": completed, "rate": completed / total if total else 0.0}
@@ -0,0 +1,569 @@
+"""Headless HTTP JSON API over vibe_todo.services.
+
+Integrations call the services directly instead of driving the Streamlit UI,
+which costs a full script rerun per action. The server is the standard
+library's ``ThreadingHTTPServer`` speaking HTTP/1.1, so connections are kept
+alive between requests. Engines come from the same bootstrapped pool as
+``app.py`` (see vibe_todo.tenancy); the tenant is picked with the ``tenant``
+query parameter or the ``X-Tenant-ID`` header.
+
+GET responses carry an ETag derived from the database's data generation (see
+vibe_todo.invalidation) and the current date, and answer ``If-None-Match``
+with 304 Not Modified without running a query. Responses larger than
+API_GZIP_MIN_BYTES are gzip-compressed for clients that accept it.
+
+Endpoints::
+
+    GET    /lists                      POST   /lists {"name"}
+    GET    /lists/{id}                 PATCH  /lists/{id} {"name"}
+    DELETE /lists/{id}                 GET    /lists/{id}/tasks
+    GET    /tasks?list_id=&is_completed=&is_important=&due_date=&title=&include_archived=
+    POST   /tasks {"list_id", "title", ...}
+    POST   /tasks/bulk {"tasks": [...]} -> {"ids"} (one transaction)
+    GET    /tasks/{id}                 PATCH  /tasks/{id} {...}
+    DELETE /tasks/{id}                 POST   /tasks/{id}/move {"before_id", "after_id"}
+    GET    /tasks/{id}/subtasks        POST   /tasks/{id}/subtasks {"title"}
+    POST   /subtasks/{id}/toggle       DELETE /subtasks/{id}
+    GET    /views/my-day?date=         PUT/DELETE /views/my-day/{task_id}?date=
+    GET    /views/important            GET    /views/planned
+    GET    /views/suggestions          GET    /views/badges
+    POST   /batch {"requests": [{"method", "path", "body"}]}
+
+``/batch`` runs up to API_BATCH_LIMIT requests in one round trip, each in
+its own transaction, and returns their statuses and bodies in order.
+
+Usage:
+    vibe-todo-api --port 8502
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import zlib
+from datetime import date, datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, NamedTuple
+from urllib.parse import parse_qs, urlsplit
+from uuid import uuid4
+
+from sqlalchemy import Engine
+from sqlmodel import Session, SQLModel
+
+from vibe_todo.database import get_session
+from vibe_todo.invalidation import get_data_generation
+from vibe_todo.logger import logger, setup_logger
+from vibe_todo.metrics import CACHE_LOOKUPS, CACHE_MISSES, start_metrics_exporter
+from vibe_todo.models import TaskRow
+from vibe_todo.services import (
+    add_to_my_day,
+    create_list,
+    create_subtask,
+    create_task,
+    create_tasks,
+    delete_list,
+    delete_subtask,
+    delete_task,
+    get_all_lists,
+    get_all_tasks,
+    get_badge_counts,
+    get_important_tasks,
+    get_list_by_id,
+    get_my_day_suggestions,
+    get_my_day_tasks,
+    get_planned_tasks,
+    get_subtasks_by_task,
+    get_task_by_id,
+    get_tasks_by_list,
+    move_task,
+    remove_from_my_day,
+    toggle_subtask_complete,
+    update_list,
+    update_task,
+)
+from vibe_todo.tenancy import TENANT_HEADER, TENANT_QUERY_PARAM, EnginePool, get_engine_pool
+
+# Interface and port the API listens on
+API_HOST = os.getenv("API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("API_PORT", "8502"))
+
+# Responses at least this large are gzip-compressed when the client accepts it
+API_GZIP_MIN_BYTES = int(os.getenv("API_GZIP_MIN_BYTES", "1024"))
+
+# Largest accepted request body
+API_MAX_BODY_BYTES = int(os.getenv("API_MAX_BODY_BYTES", str(1024 * 1024)))
+
+# Seconds an idle keep-alive connection stays open
+API_KEEPALIVE_SECONDS = float(os.getenv("API_KEEPALIVE_SECONDS", "15"))
+
+# Maximum number of requests in one /batch call
+API_BATCH_LIMIT = int(os.getenv("API_BATCH_LIMIT", "100"))
+
+# Fields a client may set on a task
+_TASK_FIELDS = {"list_id", "title", "description", "due_date", "is_completed", "is_important", "recurrence", "remind_at"}
+
+# JSON types of the task fields that are not parsed from strings, and whether null is allowed
+_TASK_FIELD_TYPES: dict[str, tuple[type, bool]] = {
+    "list_id": (int, False),
+    "title": (str, False),
+    "description": (str, True),
+    "is_completed": (bool, False),
+    "is_important": (bool, False),
+    "recurrence": (str, True),
+}
+
+# Distinguishes ETags of this process from those of an earlier one, whose generations restarted at 0
+_PROCESS_TAG = uuid4().hex[:8]
+
+
+class ApiError(Exception):
+    """Error answered with its HTTP status and message."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ApiRequest(NamedTuple):
+    """A parsed request as seen by route handlers."""
+
+    params: dict[str, int]
+    query: dict[str, str]
+    body: Any
+
+
+class Route(NamedTuple):
+    """An endpoint: method, path pattern and handler."""
+
+    method: str
+    pattern: re.Pattern
+    handler: Callable[[ApiRequest, Session], Any]
+    status: HTTPStatus = HTTPStatus.OK
+
+
+# ============================================================================
+# Request parsing
+# ============================================================================
+
+
+def _require(body: Any, key: str) -> Any:
+    """Get a required key of a JSON object body."""
+    if not isinstance(body, dict) or key not in body:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Missing field: {key}")
+    return body[key]
+
+
+def _parse_date(value: str | None, name: str) -> date | None:
+    """Parse an ISO date, or pass None through."""
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid date for {name}: {value!r}") from None
+
+
+def _check_type(value: Any, expected: type, name: str, nullable: bool = False) -> None:
+    """Reject a JSON value of the wrong type; true and false do not count as integers."""
+    if value is None and nullable:
+        return
+    if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid {expected.__name__} for {name}: {value!r}")
+
+
+def _parse_bool(value: str, name: str) -> bool:
+    """Parse a boolean query parameter."""
+    if value.lower() in ("1", "true", "yes"):
+        return True
+    if value.lower() in ("0", "false", "no"):
+        return False
+    raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid boolean for {name}: {value!r}")
+
+
+def task_fields(body: Any) -> dict[str, Any]:
+    """
+    Convert a JSON task object into keyword arguments for the task services.
+
+    Args:
+        body: Decoded JSON object
+
+    Returns:
+        dict[str, Any]: Task fields with dates and datetimes parsed
+
+    Raises:
+        ApiError: If the body is not an object, has unknown fields, values of the wrong type or invalid dates
+    """
+    if not isinstance(body, dict):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Expected a JSON object")
+    unknown = body.keys() - _TASK_FIELDS
+    if unknown:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Unknown task fields: {', '.join(sorted(unknown))}")
+    fields = dict(body)
+    for name, (expected, nullable) in _TASK_FIELD_TYPES.items():
+        if name in fields:
+            _check_type(fields[name], expected, name, nullable)
+    if "due_date" in fields:
+        fields["due_date"] = _parse_date(fields["due_date"], "due_date")
+    if fields.get("remind_at") is not None:
+        try:
+            fields["remind_at"] = datetime.fromisoformat(fields["remind_at"])
+        except (TypeError, ValueError):
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid datetime for remind_at: {fields['remind_at']!r}") from None
+    return fields
+
+
+def to_json(value: Any) -> Any:
+    """Convert service results (models, task rows, dates) into JSON-compatible values."""
+    if isinstance(value, SQLModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, TaskRow):
+        return to_json(value._asdict())
+    if isinstance(value, dict):
+        return {key: to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _found(value: Any, entity: str, entity_id: int) -> Any:
+    """Raise 404 when a lookup returned nothing."""
+    if value is None:
+        raise ApiError(HTTPStatus.NOT_FOUND, f"{entity} with id {entity_id} not found")
+    return value
+
+
+def _deleted(deleted: bool, entity: str, entity_id: int) -> None:
+    """Raise 404 when a delete service found nothing to delete."""
+    if not deleted:
+        raise ApiError(HTTPStatus.NOT_FOUND, f"{entity} with id {entity_id} not found")
+
+
+# ============================================================================
+# Handlers
+# ============================================================================
+
+
+def _get_tasks(request: ApiRequest, session: Session) -> list[TaskRow]:
+    filters: dict[str, Any] = {}
+    query = request.query
+    if "list_id" in query:
+        if not query["list_id"].isdigit():
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid list_id: {query['list_id']!r}")
+        filters["list_id"] = int(query["list_id"])
+    for name in ("is_completed", "is_important"):
+        if name in query:
+            filters[name] = _parse_bool(query[name], name)
+    if "due_date" in query:
+        filters["due_date"] = _parse_date(query["due_date"], "due_date")
+    if "title" in query:
+        filters["title"] = query["title"]
+    include_archived = _parse_bool(query.get("include_archived", "false"), "include_archived")
+    return get_all_tasks(session, filters=filters or None, include_archived=include_archived)
+
+
+def _create_tasks(request: ApiRequest, session: Session) -> dict[str, list[int]]:
+    tasks = _require(request.body, "tasks")
+    if not isinstance(tasks, list):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "tasks must be a list")
+    return {"ids": create_tasks([task_fields(fields) for fields in tasks], session)}
+
+
+def _create_task(request: ApiRequest, session: Session):
+    fields = task_fields(request.body)
+    _require(fields, "list_id")
+    return create_task(fields.pop("list_id"), fields.pop("title", ""), session, **fields)
+
+
+def _move_task(request: ApiRequest, session: Session):
+    body = {} if request.body is None else request.body
+    if not isinstance(body, dict):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Expected a JSON object")
+    for name in ("before_id", "after_id"):
+        _check_type(body.get(name), int, name, nullable=True)
+    return move_task(request.params["task_id"], body.get("before_id"), body.get("after_id"), session)
+
+
+def _my_day_date(request: ApiRequest) -> date:
+    return _parse_date(request.query.get("date"), "date") or date.today()
+
+
+def _tasks_view(service: Callable[..., list[TaskRow]]) -> Callable[[ApiRequest, Session], list[TaskRow]]:
+    """Handler for a view service taking (session, include_archived)."""
+
+    def handler(request: ApiRequest, session: Session) -> list[TaskRow]:
+        include_archived = _parse_bool(request.query.get("include_archived", "false"), "include_archived")
+        return service(session, include_archived=include_archived)
+
+    return handler
+
+
+def _route(method: str, path: str, handler: Callable, status: HTTPStatus = HTTPStatus.OK) -> Route:
+    """Build a route; ``{name}`` path segments match integer ids."""
+    pattern = re.sub(r"\{(\w+)\}", r"(?P<\1>[0-9]+)", path)
+    return Route(method, re.compile(f"^{pattern}$"), handler, status)
+
+
+ROUTES = [
+    _route("GET", "/lists", lambda r, s: get_all_lists(s)),
+    _route("POST", "/lists", lambda r, s: create_list(_require(r.body, "name"), s), HTTPStatus.CREATED),
+    _route("GET", "/lists/{list_id}", lambda r, s: _found(get_list_by_id(r.params["list_id"], s), "List", r.params["list_id"])),
+    _route("PATCH", "/lists/{list_id}", lambda r, s: update_list(r.params["list_id"], _require(r.body, "name"), s)),
+    _route("DELETE", "/lists/{list_id}", lambda r, s: _deleted(delete_list(r.params["list_id"], s), "List", r.params["list_id"]), HTTPStatus.NO_CONTENT),
+    _route("GET", "/lists/{list_id}/tasks", lambda r, s: get_tasks_by_list(r.params["list_id"], s)),
+    _route("GET", "/tasks", _get_tasks),
+    _route("POST", "/tasks", _create_task, HTTPStatus.CREATED),
+    _route("POST", "/tasks/bulk", _create_tasks, HTTPStatus.CREATED),
+    _route("GET", "/tasks/{task_id}", lambda r, s: _found(get_task_by_id(r.params["task_id"], s), "Task", r.params["task_id"])),
+    _route("PATCH", "/tasks/{task_id}", lambda r, s: update_task(r.params["task_id"], s, **task_fields(r.body))),
+    _route("DELETE", "/tasks/{task_id}", lambda r, s: _deleted(delete_task(r.params["task_id"], s), "Task", r.params["task_id"]), HTTPStatus.NO_CONTENT),
+    _route("POST", "/tasks/{task_id}/move", _move_task),
+    _route("GET", "/tasks/{task_id}/subtasks", lambda r, s: get_subtasks_by_task(r.params["task_id"], s)),
+    _route("POST", "/tasks/{task_id}/subtasks", lambda r, s: create_subtask(r.params["task_id"], _require(r.body, "title"), s), HTTPStatus.CREATED),
+    _route("POST", "/subtasks/{subtask_id}/toggle", lambda r, s: toggle_subtask_complete(r.params["subtask_id"], s)),
+    _route("DELETE", "/subtasks/{subtask_id}", lambda r, s: _deleted(delete_subtask(r.params["subtask_id"], s), "Subtask", r.params["subtask_id"]), HTTPStatus.NO_CONTENT),
+    _route("GET", "/views/my-day", lambda r, s: get_my_day_tasks(_my_day_date(r), s)),
+    _route("PUT", "/views/my-day/{task_id}", lambda r, s: add_to_my_day(r.params["task_id"], _my_day_date(r), s)),
+    _route(
+        "DELETE",
+        "/views/my-day/{task_id}",
+        lambda r, s: _deleted(remove_from_my_day(r.params["task_id"], _my_day_date(r), s), "My Day entry of task", r.params["task_id"]),
+        HTTPStatus.NO_CONTENT,
+    ),
+    _route("GET", "/views/important", _tasks_view(get_important_tasks)),
+    _route("GET", "/views/planned", _tasks_view(get_planned_tasks)),
+    _route("GET", "/views/suggestions", lambda r, s: get_my_day_suggestions(date.today(), s)),
+    _route("GET", "/views/badges", lambda r, s: get_badge_counts(date.today(), s)),
+]
+
+
+# ============================================================================
+# Dispatch
+# ============================================================================
+
+
+def etag_for(engine: Engine) -> str:
+    """
+    Compute the ETag of every GET response of a database.
+
+    Any committed write bumps the data generation, and views depending on
+    "today" change at midnight, so both are part of the tag.
+
+    Args:
+        engine: The tenant's engine
+
+    Returns:
+        str: Weak ETag header value
+    """
+    database = zlib.crc32(str(engine.url).encode())
+    return f'W/"{_PROCESS_TAG}-{database:x}-{get_data_generation(engine)}-{date.today().isoformat()}"'
+
+
+def dispatch(engine: Engine, method: str, target: str, body: Any) -> tuple[HTTPStatus, Any]:
+    """
+    Run one request against a tenant's database.
+
+    Args:
+        engine: The tenant's engine
+        method: HTTP method
+        target: Request path, optionally with a query string
+        body: Decoded JSON body, or None
+
+    Returns:
+        tuple[HTTPStatus, Any]: Status and JSON-compatible response body
+    """
+    url = urlsplit(target)
+    query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+    path = url.path.rstrip("/") or "/"
+
+    if path == "/batch" and method == "POST":
+        return HTTPStatus.OK, _run_batch(engine, body)
+
+    allowed = []
+    for route in ROUTES:
+        match = route.pattern.match(path)
+        if not match:
+            continue
+        if route.method != method:
+            allowed.append(route.method)
+            continue
+        request = ApiRequest({key: int(value) for key, value in match.groupdict().items()}, query, body)
+        try:
+            with get_session(engine) as session:
+                result = to_json(route.handler(request, session))
+        except ApiError as e:
+            return e.status, {"error": str(e)}
+        except ValueError as e:
+            # the services report missing rows and invalid input alike as ValueError
+            status = HTTPStatus.NOT_FOUND if "not found" in str(e) else HTTPStatus.BAD_REQUEST
+            return status, {"error": str(e)}
+        return route.status, result
+
+    if allowed:
+        return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"{method} not allowed on {path}"}
+    return HTTPStatus.NOT_FOUND, {"error": f"No endpoint at {path}"}
+
+
+def _run_batch(engine: Engine, body: Any) -> list[dict[str, Any]]:
+    """Dispatch the sub-requests of a /batch call in order, each with its own status."""
+    requests = _require(body, "requests") if isinstance(body, dict) else None
+    if not isinstance(requests, list) or len(requests) > API_BATCH_LIMIT:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"requests must be a list of at most {API_BATCH_LIMIT} items")
+
+    responses = []
+    for item in requests:
+        if not isinstance(item, dict) or not isinstance(item.get("path"), str):
+            responses.append({"status": HTTPStatus.BAD_REQUEST, "body": {"error": "Each request needs a path"}})
+            continue
+        method = str(item.get("method", "GET")).upper()
+        if urlsplit(item["path"]).path.rstrip("/") == "/batch":
+            status, result = HTTPStatus.BAD_REQUEST, {"error": "Batches cannot be nested"}
+        else:
+            try:
+                status, result = dispatch(engine, method, item["path"], item.get("body"))
+            except Exception as e:
+                # earlier items are committed already; report this one and carry on
+                logger.error(f"API batch request {method} {item['path']} failed: {e}")
+                status, result = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}
+        responses.append({"status": int(status), "body": result})
+    return responses
+
+
+def _etags(header: str) -> set[str]:
+    """Split an If-None-Match header into its entity tags."""
+    return {tag.strip() for tag in header.split(",") if tag.strip()}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Request handler translating HTTP requests into service calls."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "vibe-todo-api"
+    timeout = API_KEEPALIVE_SECONDS
+    # headers and body go out in separate writes; without TCP_NODELAY the body waits for a delayed ACK
+    disable_nagle_algorithm = True
+    server: "ApiServer"  # type: ignore[assignment]
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_PUT(self) -> None:
+        self._handle("PUT")
+
+    def do_PATCH(self) -> None:
+        self._handle("PATCH")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+    def _handle(self, method: str) -> None:
+        try:
+            body = self._read_body()
+            engine = self.server.pool.get_engine(self._tenant())
+            etag = etag_for(engine) if method == "GET" else None
+            if etag is not None and "If-None-Match" in self.headers:
+                CACHE_LOOKUPS.labels("api_etag").inc()
+                if etag in _etags(self.headers["If-None-Match"]):
+                    self._send(HTTPStatus.NOT_MODIFIED, None, etag)
+                    return
+                CACHE_MISSES.labels("api_etag").inc()
+            status, result = dispatch(engine, method, self.path, body)
+            if status != HTTPStatus.OK:
+                etag = None
+        except ApiError as e:
+            status, result, etag = e.status, {"error": str(e)}, None
+        except ValueError as e:
+            # invalid tenant ids
+            status, result, etag = HTTPStatus.BAD_REQUEST, {"error": str(e)}, None
+        except Exception as e:
+            logger.error(f"API request {method} {self.path} failed: {e}")
+            status, result, etag = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}, None
+        self._send(status, result, etag)
+
+    def _tenant(self) -> str | None:
+        query = parse_qs(urlsplit(self.path).query)
+        tenant = query.get(TENANT_QUERY_PARAM, [None])[-1] or self.headers.get(TENANT_HEADER)
+        return tenant or None
+
+    def _read_body(self) -> Any:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # the body cannot be framed, so neither can the next request on this connection
+            self.close_connection = True
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > API_MAX_BODY_BYTES:
+            self.close_connection = True
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Body exceeds {API_MAX_BODY_BYTES} bytes")
+        if not length:
+            return None
+        raw = self.rfile.read(length)
+        try:
+            return json.loads(raw)
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Body is not valid JSON") from None
+
+    def _send(self, status: HTTPStatus, result: Any, etag: str | None) -> None:
+        payload = b""
+        if status not in (HTTPStatus.NO_CONTENT, HTTPStatus.NOT_MODIFIED):
+            payload = json.dumps(result, separators=(",", ":")).encode()
+        self.send_response(status)
+        if payload:
+            self.send_header("Content-Type", "application/json")
+            if len(payload) >= API_GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", ""):
+                payload = gzip.compress(payload, compresslevel=5)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Vary", f"Accept-Encoding, {TENANT_HEADER}")
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if payload:
+            self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(f"API {self.address_string()} {format % args}")
+
+
+class ApiServer(ThreadingHTTPServer):
+    """Threaded HTTP server sharing a tenant engine pool across requests."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], pool: EnginePool | None = None):
+        super().__init__(address, ApiHandler)
+        self.pool = pool or get_engine_pool()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the API server until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve the vibe-todo HTTP JSON API")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    args = parser.parse_args(argv)
+
+    setup_logger()
+    start_metrics_exporter()
+    server = ApiServer((args.host, args.port))
+    # bootstrap the default database up front, like app.py does on its first run
+    server.pool.get_engine(None)
+    logger.info(f"API listening on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
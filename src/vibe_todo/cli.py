@@ -0,0 +1,277 @@
+"""Command-line interface for scripts and cron jobs.
+
+``vibe-todo`` talks to the database through vibe_todo.services without
+booting Streamlit: only ``database``, ``models`` and ``services`` (and their
+SQLAlchemy dependencies) are imported, and only once the arguments parsed,
+so ``--help`` and usage errors return at once.
+
+Commands reading ids or titles take them as arguments or, when none are
+given, one per line from stdin. Stdin is consumed in batches of
+CLI_BATCH_SIZE items, each written with one bulk service call and one
+commit (see services.create_tasks, complete_tasks and move_tasks).
+
+Examples:
+    vibe-todo add --list Work "Write report" "Book flights"
+    seq 1 10000 | sed 's/^/Task /' | vibe-todo add --list Work
+    vibe-todo list --list Work --open | cut -f1 | vibe-todo complete
+    vibe-todo export > backup.jsonl && vibe-todo --database sqlite:///copy.db import backup.jsonl
+    vibe-todo stats
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import date
+from itertools import islice
+from typing import Iterable, Iterator, TextIO
+
+# Items written per transaction when reading from stdin or a file
+CLI_BATCH_SIZE = int(os.getenv("CLI_BATCH_SIZE", "5000"))
+
+# Task fields written by export and read by import, besides the list name
+EXPORT_FIELDS = ("title", "description", "due_date", "is_completed", "is_important", "recurrence")
+
+
+def _batches(items: Iterable, size: int) -> Iterator[list]:
+    """Split an iterable into lists of at most size items."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _stdin_items(values: list[str], stream: TextIO) -> Iterable[str]:
+    """Arguments if any were given, otherwise the non-empty lines of stream."""
+    if values:
+        return values
+    return (line.strip() for line in stream if line.strip())
+
+
+def _ids(values: Iterable[str]) -> Iterator[int]:
+    """Parse task ids, taking the first tab-separated field so `list` output can be piped back."""
+    for value in values:
+        field = value.split("\t", 1)[0]
+        if not field.isdigit():
+            raise ValueError(f"Not a task id: {field!r}")
+        yield int(field)
+
+
+def _list_id(name: str, session, create: bool = False) -> int:
+    """Resolve a list name to its id."""
+    from vibe_todo.services import create_list, get_all_lists, get_trash
+
+    for todo_list in get_all_lists(session):
+        if todo_list.name == name:
+            return todo_list.id  # type: ignore[return-value]
+    if create:
+        # a trashed list still holds its unique name
+        if any(todo_list.name == name for todo_list in get_trash(session)["lists"]):
+            raise ValueError(f"List {name!r} is in the Trash; restore or purge it first")
+        return create_list(name, session).id  # type: ignore[return-value]
+    raise ValueError(f"List {name!r} not found")
+
+
+def _parse_task(line: str, number: int) -> dict:
+    """Parse one exported JSON line into a list name and task fields."""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        raise ValueError(f"Line {number}: not valid JSON") from None
+    if not isinstance(record, dict) or not record.get("list"):
+        raise ValueError(f"Line {number}: expected an object with a list name")
+    fields = {key: record[key] for key in EXPORT_FIELDS if record.get(key) is not None}
+    if "due_date" in fields:
+        fields["due_date"] = date.fromisoformat(fields["due_date"])
+    return {"list": record["list"], **fields}
+
+
+# ============================================================================
+# Commands
+# ============================================================================
+
+
+def cmd_add(args, session) -> None:
+    from vibe_todo.services import create_tasks
+
+    list_id = _list_id(args.list, session)
+    due_date = date.fromisoformat(args.due) if args.due else None
+    created = 0
+    for titles in _batches(_stdin_items(args.titles, sys.stdin), args.batch_size):
+        task_ids = create_tasks(
+            [{"list_id": list_id, "title": title, "due_date": due_date, "is_important": args.important} for title in titles],
+            session,
+        )
+        created += len(task_ids)
+        if args.titles:
+            print("\n".join(map(str, task_ids)))
+    print(f"Added {created} tasks", file=sys.stderr)
+
+
+def cmd_list(args, session) -> None:
+    from vibe_todo.services import get_all_lists, get_all_tasks
+
+    names = {todo_list.id: todo_list.name for todo_list in get_all_lists(session)}
+    filters = {"list_id": _list_id(args.list, session)} if args.list else {}
+    if args.status is not None:
+        filters["is_completed"] = args.status == "completed"
+    out = sys.stdout
+    for row in get_all_tasks(session, filters=filters or None):
+        if args.json:
+            record = {**row._asdict(), "list": names.get(row.list_id)}
+            record["due_date"] = row.due_date.isoformat() if row.due_date else None
+            out.write(json.dumps(record) + "\n")
+        else:
+            mark = "x" if row.is_completed else " "
+            out.write(f"{row.id}\t{names.get(row.list_id, '')}\t[{mark}]\t{row.due_date or ''}\t{row.title}\n")
+
+
+def cmd_complete(args, session) -> None:
+    from vibe_todo.services import complete_tasks
+
+    completed = sum(
+        complete_tasks(task_ids, session)
+        for task_ids in _batches(_ids(_stdin_items(args.ids, sys.stdin)), args.batch_size)
+    )
+    print(f"Completed {completed} tasks", file=sys.stderr)
+
+
+def cmd_move(args, session) -> None:
+    from vibe_todo.services import move_tasks
+
+    list_id = _list_id(args.to, session)
+    moved = sum(
+        move_tasks(task_ids, list_id, session)
+        for task_ids in _batches(_ids(_stdin_items(args.ids, sys.stdin)), args.batch_size)
+    )
+    print(f"Moved {moved} tasks", file=sys.stderr)
+
+
+def cmd_import(args, session) -> None:
+    from vibe_todo.services import create_tasks
+
+    stream = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")
+    list_ids: dict[str, int] = {}
+    imported = 0
+    try:
+        lines = ((number, line) for number, line in enumerate(stream, 1) if line.strip())
+        for batch in _batches(lines, args.batch_size):
+            tasks = []
+            for number, line in batch:
+                fields = _parse_task(line, number)
+                name = fields.pop("list")
+                if name not in list_ids:
+                    list_ids[name] = _list_id(name, session, create=True)
+                tasks.append({"list_id": list_ids[name], **fields})
+            imported += len(create_tasks(tasks, session))
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    print(f"Imported {imported} tasks", file=sys.stderr)
+
+
+def cmd_export(args, session) -> None:
+    from vibe_todo.services import get_all_lists, get_all_tasks
+
+    names = {todo_list.id: todo_list.name for todo_list in get_all_lists(session)}
+    filters = {"list_id": _list_id(args.list, session)} if args.list else None
+    out = sys.stdout
+    for row in get_all_tasks(session, filters=filters, include_archived=args.include_archived):
+        record = {"list": names[row.list_id], **{key: getattr(row, key) for key in EXPORT_FIELDS}}
+        record["due_date"] = row.due_date.isoformat() if row.due_date else None
+        out.write(json.dumps(record) + "\n")
+
+
+def cmd_stats(args, session) -> None:
+    from vibe_todo.services import get_all_lists, get_badge_counts
+
+    names = {todo_list.id: todo_list.name for todo_list in get_all_lists(session)}
+    counts = get_badge_counts(date.today(), session)
+    if args.json:
+        lists = {names.get(list_id, str(list_id)): stats for list_id, stats in counts["lists"].items()}
+        print(json.dumps({"views": counts["views"], "lists": lists}))
+        return
+    for view, count in counts["views"].items():
+        print(f"{view}\t{count}")
+    for list_id, stats in counts["lists"].items():
+        print(f"{names.get(list_id, list_id)}\topen {stats['open']}\toverdue {stats['overdue']}\timportant {stats['important']}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all subcommands."""
+    parser = argparse.ArgumentParser(
+        prog="vibe-todo", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--database", help="SQLAlchemy database URL (defaults to DATABASE_URL)")
+    parser.add_argument("--batch-size", type=int, default=CLI_BATCH_SIZE, help="items written per transaction")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log service calls to stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="add tasks (titles as arguments or one per stdin line)")
+    add.add_argument("titles", nargs="*")
+    add.add_argument("--list", default="Tasks", help="list name (default: Tasks)")
+    add.add_argument("--due", help="due date, YYYY-MM-DD")
+    add.add_argument("--important", action="store_true")
+    add.set_defaults(handler=cmd_add)
+
+    list_ = commands.add_parser("list", help="print tasks as tab-separated lines")
+    list_.add_argument("--list", help="only tasks of this list")
+    status = list_.add_mutually_exclusive_group()
+    status.add_argument("--open", dest="status", action="store_const", const="open")
+    status.add_argument("--completed", dest="status", action="store_const", const="completed")
+    list_.add_argument("--json", action="store_true", help="print JSON lines instead")
+    list_.set_defaults(handler=cmd_list, status=None)
+
+    complete = commands.add_parser("complete", help="complete tasks (ids as arguments or from stdin)")
+    complete.add_argument("ids", nargs="*")
+    complete.set_defaults(handler=cmd_complete)
+
+    move = commands.add_parser("move", help="move tasks to the end of another list")
+    move.add_argument("ids", nargs="*")
+    move.add_argument("--to", required=True, help="target list name")
+    move.set_defaults(handler=cmd_move)
+
+    import_ = commands.add_parser("import", help="import tasks from JSON lines written by export")
+    import_.add_argument("file", nargs="?", default="-")
+    import_.set_defaults(handler=cmd_import)
+
+    export = commands.add_parser("export", help="write tasks as JSON lines")
+    export.add_argument("--list", help="only tasks of this list")
+    export.add_argument("--include-archived", action="store_true")
+    export.set_defaults(handler=cmd_export)
+
+    stats = commands.add_parser("stats", help="print open, overdue and important counts")
+    stats.add_argument("--json", action="store_true")
+    stats.set_defaults(handler=cmd_stats)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run one CLI command and return the exit status."""
+    args = build_parser().parse_args(argv)
+    if args.batch_size < 1:
+        print("error: --batch-size must be at least 1", file=sys.stderr)
+        return 2
+
+    from sqlmodel import Session
+
+    from vibe_todo.database import bootstrap, create_database_engine, get_engine
+    from vibe_todo.logger import configure_logger
+
+    configure_logger(log_level="INFO" if args.verbose else os.getenv("LOG_LEVEL", "WARNING"))
+    engine = bootstrap(create_database_engine(args.database) if args.database else get_engine())
+    try:
+        with Session(engine) as session:
+            args.handler(args, session)
+    except BrokenPipeError:
+        # output piped into head and the like
+        return 0
+    except (ValueError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,248 @@
 """Database module for SQLModel ORM setup and session management."""
 
+import os
+import sqlite3
+import threading
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Generator
 
+from sqlalchemy import DefaultClause, Engine, event, inspect, make_url, text
 from sqlmodel import SQLModel, create_engine, Session
 
 from vibe_todo.logger import logger
 
 # Import all models to register them with SQLModel metadata
-from vibe_todo.models import MyDayTask, Subtask, Task, TodoList  # noqa: F401
+from vibe_todo.models import (  # noqa: F401
+    ArchivedSubtask,
+    ArchivedTask,
+    ChangeSequence,
+    MyDayCounter,
+    MyDaySummary,
+    MyDayTask,
+    SchemaVersion,
+    Subtask,
+    SuggestionState,
+    Task,
+    TaskCounter,
+    TodoList,
+)
 
 # Database connection string
-DATABASE_URL = "sqlite:///data/todos.db"
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///data/todos.db")
+
+# Connection pool settings for server databases (ignored for SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# SQLite journal mode; WAL lets readers run alongside the writer (see vibe_todo.maintenance for checkpoints)
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+
+# Schema version written by bootstrap(); bump it whenever tables, indexes or triggers change
+SCHEMA_VERSION = 10
 
 # Global engine instance (singleton pattern)
 _engine = None
 
+# Database URLs already bootstrapped by this process
+_bootstrapped: set[str] = set()
+_bootstrap_lock = threading.Lock()
+
+# Indexes replaced by later schema versions, dropped at bootstrap
+OBSOLETE_INDEXES = ["ix_task_list_id_rank"]
+
+# Triggers keeping task_counter and my_day_counter in sync with task and mydaytask.
+# A task counts as open while it is neither completed nor in the Trash.
+COUNTER_TRIGGERS = {
+    "task_counter_insert": """
+        CREATE TRIGGER IF NOT EXISTS task_counter_insert AFTER INSERT ON task
+        WHEN NEW.is_completed = 0 AND NEW.deleted_at IS NULL
+        BEGIN
+            INSERT INTO task_counter (list_id, due_key, open_count, important_count)
+            VALUES (NEW.list_id, IFNULL(NEW.due_date, ''), 1, NEW.is_important)
+            ON CONFLICT (list_id, due_key) DO UPDATE SET
+                open_count = open_count + 1,
+                important_count = important_count + excluded.important_count;
+        END
+    """,
+    "task_counter_delete": """
+        CREATE TRIGGER IF NOT EXISTS task_counter_delete AFTER DELETE ON task
+        WHEN OLD.is_completed = 0 AND OLD.deleted_at IS NULL
+        BEGIN
+            UPDATE task_counter
+            SET open_count = open_count - 1, important_count = important_count - OLD.is_important
+            WHERE list_id = OLD.list_id AND due_key = IFNULL(OLD.due_date, '');
+            DELETE FROM task_counter
+            WHERE list_id = OLD.list_id AND due_key = IFNULL(OLD.due_date, '') AND open_count <= 0;
+        END
+    """,
+    "task_counter_update": """
+        CREATE TRIGGER IF NOT EXISTS task_counter_update
+        AFTER UPDATE OF list_id, due_date, is_completed, is_important, deleted_at ON task
+        BEGIN
+            UPDATE task_counter
+            SET open_count = open_count - 1, important_count = important_count - OLD.is_important
+            WHERE OLD.is_completed = 0 AND OLD.deleted_at IS NULL
+            AND list_id = OLD.list_id AND due_key = IFNULL(OLD.due_date, '');
+            DELETE FROM task_counter
+            WHERE list_id = OLD.list_id AND due_key = IFNULL(OLD.due_date, '') AND open_count <= 0;
+            INSERT INTO task_counter (list_id, due_key, open_count, important_count)
+            SELECT NEW.list_id, IFNULL(NEW.due_date, ''), 1, NEW.is_important
+            WHERE NEW.is_completed = 0 AND NEW.deleted_at IS NULL
+            ON CONFLICT (list_id, due_key) DO UPDATE SET
+                open_count = open_count + 1,
+                important_count = important_count + excluded.important_count;
+        END
+    """,
+    "my_day_counter_complete": """
+        CREATE TRIGGER IF NOT EXISTS my_day_counter_complete
+        AFTER UPDATE OF is_completed, deleted_at ON task
+        WHEN (OLD.is_completed = 0 AND OLD.deleted_at IS NULL) <> (NEW.is_completed = 0 AND NEW.deleted_at IS NULL)
+        BEGIN
+            INSERT INTO my_day_counter (task_date, open_count)
+            SELECT task_date, CASE WHEN NEW.is_completed = 0 AND NEW.deleted_at IS NULL THEN 1 ELSE -1 END
+            FROM mydaytask WHERE task_id = NEW.id
+            ON CONFLICT (task_date) DO UPDATE SET open_count = open_count + excluded.open_count;
+        END
+    """,
+    # BEFORE, because ON DELETE CASCADE removes the mydaytask rows ahead of AFTER triggers
+    "my_day_counter_task_delete": """
+        CREATE TRIGGER IF NOT EXISTS my_day_counter_task_delete BEFORE DELETE ON task
+        WHEN OLD.is_completed = 0 AND OLD.deleted_at IS NULL
+        BEGIN
+            UPDATE my_day_counter SET open_count = open_count - 1
+            WHERE task_date IN (SELECT task_date FROM mydaytask WHERE task_id = OLD.id);
+        END
+    """,
+    "my_day_counter_insert": """
+        CREATE TRIGGER IF NOT EXISTS my_day_counter_insert AFTER INSERT ON mydaytask
+        BEGIN
+            INSERT INTO my_day_counter (task_date, open_count)
+            SELECT NEW.task_date, 1 FROM task WHERE id = NEW.task_id AND is_completed = 0 AND deleted_at IS NULL
+            ON CONFLICT (task_date) DO UPDATE SET open_count = open_count + 1;
+        END
+    """,
+    "my_day_counter_delete": """
+        CREATE TRIGGER IF NOT EXISTS my_day_counter_delete AFTER DELETE ON mydaytask
+        BEGIN
+            UPDATE my_day_counter SET open_count = open_count - 1
+            WHERE task_date = OLD.task_date
+            AND EXISTS (SELECT 1 FROM task WHERE id = OLD.task_id AND is_completed = 0 AND deleted_at IS NULL);
+        END
+    """,
+}
+
+
+@event.listens_for(Engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Enable foreign key enforcement on every new SQLite connection.
+
+    SQLite ships with foreign keys disabled, so the ON DELETE CASCADE clauses
+    declared on the models only take effect once this pragma is set.
+
+    Also asks for incremental auto-vacuum, which only takes effect on a new,
+    empty database file (existing files need a one-off VACUUM, see
+    ``just enable-incremental-vacuum``), and sets SQLITE_JOURNAL_MODE.
+    Setting auto_vacuum moves every other connection's data_version, so it
+    is left alone once the file has pages.
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        if cursor.execute("PRAGMA page_count").fetchone()[0] == 0:
+            cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+        cursor.close()
+
+
+def is_sqlite(bind) -> bool:
+    """
+    Check whether an engine, connection or session bind talks to SQLite.
+
+    Args:
+        bind: Engine or Connection
+
+    Returns:
+        bool: True for the SQLite dialect
+    """
+    return bind.dialect.name == "sqlite"
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _mark_change(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Flag connections that ran an INSERT, UPDATE or DELETE in this transaction."""
+    if context is not None and (context.isinsert or context.isupdate or context.isdelete):
+        conn.info["vibe_todo_changed"] = True
+
+
+@event.listens_for(Engine, "rollback")
+def _forget_change(conn) -> None:
+    """Rolled-back writes change nothing."""
+    conn.info.pop("vibe_todo_changed", None)
+
+
+@event.listens_for(Engine, "commit")
+def _bump_change_sequence(conn) -> None:
+    """
+    Bump change_sequence inside every writing transaction on a server database.
+
+    Other processes poll this one row to notice writes (see
+    vibe_todo.invalidation). SQLite is skipped, as it has PRAGMA data_version.
+    """
+    if not conn.info.pop("vibe_todo_changed", False) or is_sqlite(conn):
+        return
+    # a raw cursor, so the bump does not run these listeners again
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("UPDATE change_sequence SET value = value + 1 WHERE id = 1")
+    finally:
+        cursor.close()
+
+
+def create_database_engine(database_url: str) -> Engine:
+    """
+    Create a new engine for a database URL.
+
+    SQLite gets its thread-sharing connect args and, for file databases, its
+    parent directory created. Server databases get a pre-pinged, recycled
+    connection pool sized from the DB_POOL_* environment variables.
+
+    Args:
+        database_url: SQLAlchemy database URL
+
+    Returns:
+        Engine: SQLModel engine instance
+    """
+    url = make_url(database_url)
+
+    if url.get_backend_name() == "sqlite":
+        if url.database and url.database != ":memory:":
+            # Ensure data directory exists
+            db_path = Path(url.database).parent
+            db_path.mkdir(parents=True, exist_ok=True)
+            logger.info(f"Database directory ensured: {db_path.absolute()}")
+        engine_kwargs = {
+            "connect_args": {"check_same_thread": False},  # Required for SQLite with multiple threads
+        }
+    else:
+        engine_kwargs = {
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_pre_ping": DB_POOL_PRE_PING,
+            "pool_recycle": DB_POOL_RECYCLE,
+        }
+
+    engine = create_engine(
+        database_url,
+        echo=False,  # Set to True for SQL query logging
+        **engine_kwargs,
+    )
+    logger.info(f"Database engine created successfully: {url.render_as_string(hide_password=True)}")
+    return engine
+
 
 def get_engine():
     """
@@ -28,18 +254,7 @@ def get_engine():
     global _engine
     if _engine is None:
         try:
-            # Ensure data directory exists
-            db_path = Path("data")
-            db_path.mkdir(exist_ok=True)
-            logger.info(f"Database directory ensured: {db_path.absolute()}")
-
-            # Create engine
-            _engine = create_engine(
-                DATABASE_URL,
-                echo=False,  # Set to True for SQL query logging
-                connect_args={"check_same_thread": False},  # Required for SQLite with multiple threads
-            )
-            logger.info(f"Database engine created successfully: {DATABASE_URL}")
+            _engine = create_database_engine(DATABASE_URL)
         except Exception as e:
             logger.error(f"Failed to create database engine: {e}")
             raise
@@ -47,10 +262,13 @@ def get_engine():
 
 
 @contextmanager
-def get_session() -> Generator[Session, None, None]:
+def get_session(engine: Engine | None = None) -> Generator[Session, None, None]:
     """
     Create a database session context manager.
 
+    Args:
+        engine: Engine to bind the session to (defaults to get_engine())
+
     Yields:
         Session: SQLModel session instance
 
@@ -59,8 +277,7 @@ def get_session() -> Generator[Session, None, None]:
             # Use session for database operations
             pass
     """
-    engine = get_engine()
-    session = Session(engine)
+    session = Session(engine or get_engine())
     try:
         logger.debug("Database session created")
         yield session
@@ -75,24 +292,207 @@ def get_session() -> Generator[Session, None, None]:
         logger.debug("Database session closed")
 
 
-def create_db_and_tables() -> None:
+def create_db_and_tables(engine: Engine | None = None) -> None:
     """
     Create database and all tables defined in SQLModel models.
 
-    This function should be called on application startup to ensure
-    the database schema is initialized. Also initializes system lists.
+    Also creates missing indexes and counter triggers and initializes system
+    lists. Prefer bootstrap(), which only runs this when the stored schema
+    version is out of date.
+
+    Args:
+        engine: Engine to initialize (defaults to get_engine())
     """
     try:
-        engine = get_engine()
+        engine = engine or get_engine()
         SQLModel.metadata.create_all(engine)
         logger.info("Database tables created successfully")
 
+        # create_all skips columns added to tables that already exist
+        add_missing_columns(engine)
+
+        # create_all skips indexes on tables that already exist
+        with engine.begin() as conn:
+            for name in OBSOLETE_INDEXES:
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(engine, checkfirst=True)
+        logger.info("Database indexes ensured")
+
+        # trigger definitions may have changed with the schema version
+        counters_missing = install_counter_triggers(engine, replace=True)
+
         # Initialize system lists
-        from vibe_todo.services import initialize_system_lists
+        from vibe_todo.services import delete_orphans, initialize_system_lists, rebalance_ranks, rebuild_counters
 
-        with get_session() as session:
+        with Session(engine) as session:
+            if session.get(ChangeSequence, 1) is None:
+                session.add(ChangeSequence(id=1))
+                session.commit()
             initialize_system_lists(session)
             logger.info("System lists initialized successfully")
+            delete_orphans(session)
+            # rows created before manual ordering get their initial ranks
+            rebalance_ranks(session)
+            if counters_missing:
+                rebuild_counters(session)
     except Exception as e:
         logger.error(f"Failed to create database tables: {e}")
         raise
+
+
+def add_missing_columns(engine: Engine) -> list[str]:
+    """
+    Add model columns missing from existing tables with ALTER TABLE.
+
+    New columns must be nullable or have a server default so existing rows
+    stay valid.
+
+    Args:
+        engine: Database engine
+
+    Returns:
+        list[str]: Added columns as "table.column"
+
+    Raises:
+        ValueError: If a missing column is NOT NULL without a server default
+    """
+    inspector = inspect(engine)
+    added = []
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                if not column.nullable and column.server_default is None:
+                    raise ValueError(f"Cannot add NOT NULL column {table.name}.{column.name} without a server default")
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+                if isinstance(column.server_default, DefaultClause):
+                    default = column.server_default.arg
+                    ddl += f" DEFAULT '{default}'" if isinstance(default, str) else f" DEFAULT {default.compile(dialect=engine.dialect)}"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+                conn.execute(text(ddl))
+                added.append(f"{table.name}.{column.name}")
+                logger.info(f"Added column {table.name}.{column.name}")
+    return added
+
+
+def get_schema_version(engine: Engine) -> int:
+    """
+    Read the schema version stored in the database.
+
+    Args:
+        engine: Database engine
+
+    Returns:
+        int: Stored schema version, or 0 if the database was never bootstrapped
+    """
+    if not inspect(engine).has_table("schema_version"):
+        return 0
+    with Session(engine) as session:
+        row = session.get(SchemaVersion, 1)
+        return row.version if row else 0
+
+
+def bootstrap(engine: Engine | None = None) -> Engine:
+    """
+    Prepare the database once per process and database URL.
+
+    The schema is only (re)created when the stored schema version differs
+    from SCHEMA_VERSION; afterwards calls for the same URL return
+    immediately without touching the database.
+
+    Args:
+        engine: Engine to bootstrap (defaults to get_engine())
+
+    Returns:
+        Engine: The bootstrapped engine
+    """
+    engine = engine or get_engine()
+    key = str(engine.url)
+
+    with _bootstrap_lock:
+        if key in _bootstrapped:
+            return engine
+
+        version = get_schema_version(engine)
+        if version == SCHEMA_VERSION:
+            logger.info(f"Database schema is current (version {version})")
+        else:
+            logger.info(f"Bootstrapping database schema from version {version} to {SCHEMA_VERSION}")
+            create_db_and_tables(engine)
+            with Session(engine) as session:
+                session.merge(SchemaVersion(id=1, version=SCHEMA_VERSION))
+                session.commit()
+            logger.info(f"Database schema bootstrapped to version {SCHEMA_VERSION}")
+
+        _bootstrapped.add(key)
+
+    return engine
+
+
+def install_counter_triggers(engine, replace: bool = False) -> bool:
+    """
+    Create the triggers that maintain the sidebar badge counters.
+
+    The triggers are SQLite-only; on other databases get_badge_counts
+    aggregates the task table directly and this is a no-op.
+
+    Args:
+        engine: Database engine
+        replace: Drop and recreate all triggers, e.g. after their definitions changed
+
+    Returns:
+        bool: True if any trigger was (re)installed, meaning the counters must be rebuilt
+    """
+    if not is_sqlite(engine):
+        return False
+
+    with engine.begin() as conn:
+        if replace:
+            for name in COUNTER_TRIGGERS:
+                conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+        existing = set(
+            conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")).scalars()
+        )
+        missing = [name for name in COUNTER_TRIGGERS if name not in existing]
+        for name in missing:
+            conn.execute(text(COUNTER_TRIGGERS[name]))
+
+    if missing:
+        logger.info(f"Installed counter triggers: {missing}")
+    return bool(missing)
+
+
+def incremental_vacuum(engine: Engine, pages: int | None = None) -> int:
+    """
+    Return free pages to the file system with PRAGMA incremental_vacuum.
+
+    Only SQLite files with auto_vacuum=INCREMENTAL shrink; elsewhere this is a no-op.
+
+    Args:
+        engine: Database engine
+        pages: Maximum number of pages to free, or None for all free pages
+
+    Returns:
+        int: Number of free pages before vacuuming
+    """
+    if not is_sqlite(engine):
+        return 0
+
+    with engine.connect() as conn:
+        if conn.execute(text("PRAGMA auto_vacuum")).scalar() != 2:
+            return 0
+        free_pages = conn.execute(text("PRAGMA freelist_count")).scalar() or 0
+        if free_pages:
+            # sqlite3's execute() steps this pragma only once, freeing a single page;
+            # executescript() runs it to completion
+            conn.connection.dbapi_connection.executescript(f"PRAGMA incremental_vacuum({int(pages) if pages else 0})")  # type: ignore[union-attr]
+    if free_pages:
+        logger.info(f"Incremental vacuum released up to {pages or free_pages} of {free_pages} free pages")
+    return free_pages
@@ -1,20 +1,121 @@
 from contextlib import contextmanager
-from typing import Generator
+from typing import Callable, Generator
+from uuid import uuid4
 import streamlit as st
+from sqlalchemy import Engine
 from sqlmodel import Session
 from vibe_todo.database import get_session as _get_session
+from vibe_todo.events import ChangeEvent, ChangeInbox, get_event_bus, set_event_origin
+from vibe_todo.scheduler import ReminderFeed, log_notifier, start_reminders
 from vibe_todo.logger import logger
+from vibe_todo.metrics import CACHE_LOOKUPS, CACHE_MISSES
+from vibe_todo.tenancy import TENANT_HEADER, TENANT_QUERY_PARAM, get_engine_pool
+
+
+def resolve_tenant_from_request() -> str | None:
+    """
+    Default tenant resolver: the ?tenant= query parameter, then the X-Tenant-ID header.
+
+    Returns None (the default database) when neither is present.
+    """
+    tenant = st.query_params.get(TENANT_QUERY_PARAM)
+    if not tenant:
+        try:
+            tenant = st.context.headers.get(TENANT_HEADER)
+        except Exception:
+            # headers are unavailable outside a browser session (e.g. AppTest)
+            tenant = None
+    return tenant or None
+
+
+_tenant_resolver: Callable[[], str | None] = resolve_tenant_from_request
+
+
+def set_tenant_resolver(resolver: Callable[[], str | None]) -> None:
+    """Replace the hook that maps the current request to a tenant id."""
+    global _tenant_resolver
+    _tenant_resolver = resolver
+
+
+def get_current_tenant() -> str | None:
+    """Get the tenant id for the current Streamlit session."""
+    return _tenant_resolver()
+
+
+def get_tenant_engine() -> Engine:
+    """Get the bootstrapped engine for the current tenant from the shared LRU pool."""
+    return get_engine_pool().get_engine(get_current_tenant())
+
 
 @contextmanager
 def get_db_session() -> Generator[Session, None, None]:
     """
     Streamlit-aware database session context manager.
-    Handles errors by showing a Streamlit error message.
+    Binds to the current tenant's database and handles errors
+    by showing a Streamlit error message.
     """
     try:
-        with _get_session() as session:
+        with _get_session(get_tenant_engine()) as session:
             yield session
     except Exception as e:
         logger.error(f"Database error: {e}")
         st.error(f"An error occurred: {e}")
         raise e
+
+
+def get_change_inbox(engine: Engine) -> ChangeInbox:
+    """
+    Get this browser session's inbox of changes made by other sessions.
+
+    Also tags the events this session publishes with its origin, so its own
+    writes are not echoed back. The inbox lives in session state and its bus
+    subscription ends when the session is garbage collected.
+
+    Args:
+        engine: The session's database engine
+
+    Returns:
+        ChangeInbox: Inbox for the engine's database
+    """
+    origin = st.session_state.setdefault("session_origin", uuid4().hex)
+    set_event_origin(origin)
+
+    database = str(engine.url)
+    inbox = st.session_state.get("change_inbox")
+    if inbox is None or inbox.database != database:
+        inbox = ChangeInbox(database, origin=origin)
+        get_event_bus().subscribe(inbox.receive, weak=True)
+        st.session_state.change_inbox = inbox
+    return inbox
+
+
+def affects_ui(event: ChangeEvent) -> bool:
+    """Whether an event changes anything the app renders (subtasks are not shown yet)."""
+    return event.entity != "subtask"
+
+
+@st.cache_resource
+def _get_reminder_feed(database_url: str) -> ReminderFeed:
+    """Process-wide feed of a database's fired reminders, shared by all sessions."""
+    CACHE_MISSES.labels("reminder_feed").inc()
+    return ReminderFeed()
+
+
+def get_reminder_feed(engine: Engine) -> ReminderFeed:
+    """
+    Get a database's feed of fired reminders, starting its reminder scheduler if needed.
+
+    The scheduler is registered per engine (see vibe_todo.scheduler), so the
+    tenant pool stops it on eviction and a recreated engine gets a new one.
+
+    Args:
+        engine: The session's database engine
+
+    Returns:
+        ReminderFeed: Feed of fired reminders for sessions to show as toasts
+    """
+    CACHE_LOOKUPS.labels("reminder_feed").inc()
+    feed = _get_reminder_feed(str(engine.url))
+    start_reminders(engine, notifiers=[log_notifier, feed])
+    return feed
+
@@ -0,0 +1,174 @@
+"""In-process change feed published by the mutating services.
+
+Every service that writes publishes a ``ChangeEvent`` after its commit.
+Subscribers, for example the open Streamlit sessions, receive the events
+synchronously on the writer's thread and should only record them. The
+actual refresh happens later on the subscriber's own thread.
+"""
+
+import threading
+import weakref
+from collections import deque
+from contextvars import ContextVar
+from typing import Callable, NamedTuple
+
+from vibe_todo.logger import logger
+
+# Entities and actions carried by ChangeEvent
+ENTITIES = ("list", "task", "subtask", "my_day")
+ACTIONS = ("created", "updated", "deleted")
+
+# Identifies the writer (e.g. a Streamlit session id) on the current thread or task
+_event_origin: ContextVar[str | None] = ContextVar("event_origin", default=None)
+
+
+class ChangeEvent(NamedTuple):
+    """
+    A committed change to one row.
+
+    ``entity_id`` is the id of the changed row; My Day entries have no id of
+    their own, so for them it is the task id. ``database`` is the engine URL,
+    which keeps tenants apart.
+    """
+
+    entity: str
+    action: str
+    entity_id: int
+    list_id: int | None = None
+    task_id: int | None = None
+    database: str | None = None
+    origin: str | None = None
+
+
+def set_event_origin(origin: str | None) -> None:
+    """
+    Tag events published from the current thread with an origin.
+
+    Lets a subscriber ignore the events it caused itself.
+
+    Args:
+        origin: Origin identifier, or None to clear it
+    """
+    _event_origin.set(origin)
+
+
+def get_event_origin() -> str | None:
+    """Get the origin tag of the current thread."""
+    return _event_origin.get()
+
+
+class EventBus:
+    """
+    Thread-safe publish/subscribe hub for change events.
+
+    Example:
+        bus = EventBus()
+        unsubscribe = bus.subscribe(print)
+        bus.publish(ChangeEvent("task", "created", 1, list_id=2))
+        unsubscribe()
+    """
+
+    def __init__(self):
+        self._subscribers: list[Callable[[], Callable[[ChangeEvent], None] | None]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, callback: Callable[[ChangeEvent], None], weak: bool = False) -> Callable[[], None]:
+        """
+        Subscribe to all events.
+
+        Args:
+            callback: Function called with each published event
+            weak: Hold a bound method weakly, so the subscription ends when its object is garbage collected
+
+        Returns:
+            Callable[[], None]: Function that removes the subscription
+        """
+        ref = weakref.WeakMethod(callback) if weak else (lambda: callback)
+        with self._lock:
+            self._subscribers.append(ref)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if ref in self._subscribers:
+                    self._subscribers.remove(ref)
+
+        return unsubscribe
+
+    def publish(self, event: ChangeEvent) -> None:
+        """
+        Deliver an event to every live subscriber.
+
+        The current origin is filled in if the event has none. Subscriber
+        errors are logged and never reach the publishing service.
+
+        Args:
+            event: Event to deliver
+        """
+        if event.origin is None:
+            event = event._replace(origin=get_event_origin())
+
+        with self._lock:
+            self._subscribers = [ref for ref in self._subscribers if ref() is not None]
+            callbacks = [ref() for ref in self._subscribers]
+
+        for callback in callbacks:
+            if callback is None:
+                continue
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Change event subscriber failed: {e}")
+
+
+class ChangeInbox:
+    """
+    Bounded buffer of one database's events caused by other origins.
+
+    Subscribe it weakly so the subscription ends with its owner (e.g. a
+    Streamlit session):
+
+        inbox = ChangeInbox(database_url, origin=session_id)
+        get_event_bus().subscribe(inbox.receive, weak=True)
+    """
+
+    def __init__(self, database: str | None, origin: str | None = None, max_events: int = 1000):
+        self.database = database
+        self.origin = origin
+        self._events: deque[ChangeEvent] = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+
+    def receive(self, event: ChangeEvent) -> None:
+        """Keep an event unless it is for another database or from our own origin."""
+        if event.database != self.database or (self.origin is not None and event.origin == self.origin):
+            return
+        with self._lock:
+            self._events.append(event)
+
+    def drain(self) -> list[ChangeEvent]:
+        """
+        Take all buffered events.
+
+        Returns:
+            list[ChangeEvent]: Events received since the last drain, oldest first
+        """
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+        return events
+
+
+# Process-wide bus shared by the services and all sessions
+_bus = EventBus()
+
+
+def get_event_bus() -> EventBus:
+    """
+    Get the process-wide event bus.
+
+    Returns:
+        EventBus: Shared event bus
+    """
+    return _bus
@@ -0,0 +1,267 @@
+"""Cross-process cache invalidation based on database change detection.
+
+Several Streamlit processes can share one database file, so an in-process
+cache can go stale when another process writes. A ``DataVersionWatcher``
+detects writes made through any other connection - including other
+processes - and bumps a local generation number that caches use as part of
+their key. Generations are drawn from one process-wide counter, so a
+watcher created for a recreated engine never repeats a number an earlier
+watcher of the same database already handed out.
+
+On SQLite this polls ``PRAGMA data_version`` on a dedicated connection,
+which costs no table access. Other databases read the single
+``change_sequence`` row, which every writing commit bumps (see
+vibe_todo.database).
+
+Commits that write through the watched engine bump the generation at once,
+so this process sees its own changes without waiting for the next poll.
+Consumers that learn about local writes another way, such as the event bus,
+can instead have those commits folded into the baseline, so that only
+writes through other engines or processes move the generation.
+"""
+
+import itertools
+import os
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy import Engine, event, select
+from sqlmodel import col
+
+from vibe_todo.database import is_sqlite
+from vibe_todo.logger import logger
+from vibe_todo.models import ChangeSequence
+
+# Minimum seconds between two polls of the same database
+INVALIDATION_POLL_SECONDS = float(os.getenv("INVALIDATION_POLL_SECONDS", "1.0"))
+
+# Source of every watcher's generations; unique across the watchers of this process
+_generations = itertools.count()
+
+
+class DataVersionWatcher:
+    """
+    Track external writes to one database as a monotonically increasing generation.
+
+    Example:
+        watcher = DataVersionWatcher(engine)
+        watcher.subscribe(lambda generation: my_cache.clear())
+        generation = watcher.poll()
+
+    With count_local_writes=False, writing commits made through the watched
+    engine do not bump the generation; only writes through other engines or
+    processes do.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        poll_interval: float = INVALIDATION_POLL_SECONDS,
+        count_local_writes: bool = True,
+    ):
+        self.engine = engine
+        self.poll_interval = poll_interval
+        self.count_local_writes = count_local_writes
+        self.generation = next(_generations)
+        self._last_poll = float("-inf")
+        self._version = None
+        self._connection = None
+        self._callbacks: list[Callable[[int], None]] = []
+        self._lock = threading.Lock()
+        # per-watcher keys, so several watchers of one engine each see every write
+        self._wrote_key = f"vibe_todo_wrote_{id(self)}"
+        self._absorb_key = f"vibe_todo_absorb_{id(self)}"
+
+        event.listen(engine, "after_cursor_execute", self._mark_write)
+        if count_local_writes:
+            event.listen(engine, "commit", self._on_commit)
+        else:
+            event.listen(engine, "commit", self._before_local_commit)
+            event.listen(engine, "checkin", self._after_local_commit)
+
+    def subscribe(self, callback: Callable[[int], None]) -> None:
+        """
+        Register a callback invoked with the new generation after each change.
+
+        Args:
+            callback: Function taking the new generation number
+        """
+        self._callbacks.append(callback)
+
+    def poll(self) -> int:
+        """
+        Check for writes since the last poll, at most once per poll_interval.
+
+        Returns:
+            int: Current generation, a new and higher one if the database changed
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_poll < self.poll_interval:
+                return self.generation
+            self._last_poll = now
+
+            version = self._read_version()
+            if self._version is None or version == self._version:
+                self._version = version
+                return self.generation
+
+            self._version = version
+            self.generation = next(_generations)
+            generation = self.generation
+
+        logger.debug(f"External write detected on {self.engine.url}, cache generation {generation}")
+        self._notify(generation)
+        return generation
+
+    def invalidate(self) -> int:
+        """
+        Bump the generation immediately, e.g. after a local write.
+
+        Returns:
+            int: The new generation
+        """
+        with self._lock:
+            self.generation = next(_generations)
+            generation = self.generation
+        self._notify(generation)
+        return generation
+
+    def _notify(self, generation: int) -> None:
+        """Run the subscribed callbacks for a new generation."""
+        for callback in list(self._callbacks):
+            try:
+                callback(generation)
+            except Exception as e:
+                logger.error(f"Cache invalidation callback failed: {e}")
+
+    def _mark_write(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        """Flag connections that ran an INSERT, UPDATE or DELETE in this transaction."""
+        if context is not None and (context.isinsert or context.isupdate or context.isdelete):
+            conn.info[self._wrote_key] = True
+
+    def _on_commit(self, conn) -> None:
+        """Invalidate local caches when a writing transaction commits."""
+        if conn.info.pop(self._wrote_key, False):
+            self.invalidate()
+
+    def _before_local_commit(self, conn) -> None:
+        """
+        Settle external writes before a local writing commit, which is then absorbed.
+
+        The writing transaction holds SQLite's write lock until it commits, so
+        a change seen here was made by someone else.
+        """
+        if not conn.info.pop(self._wrote_key, False):
+            return
+        with self._lock:
+            version = self._read_version()
+            changed = self._version is not None and version != self._version
+            self._version = version
+            if changed:
+                self.generation = next(_generations)
+            generation = self.generation
+        conn.info[self._absorb_key] = True
+        if changed:
+            logger.debug(f"External write detected on {self.engine.url}, cache generation {generation}")
+            self._notify(generation)
+
+    def _after_local_commit(self, dbapi_connection, connection_record) -> None:
+        """Take the marker left by a local commit as the new baseline once its connection is returned."""
+        if connection_record is None or not connection_record.info.pop(self._absorb_key, False):
+            return
+        with self._lock:
+            if self._version is not None:
+                self._version = self._read_version()
+
+    def _read_version(self):
+        """Read the current change marker (caller holds the lock)."""
+        if is_sqlite(self.engine):
+            # data_version only moves for commits made by *other* connections,
+            # so the watcher keeps one connection that never writes
+            if self._connection is None:
+                self._connection = self.engine.raw_connection()
+            cursor = self._connection.cursor()
+            try:
+                cursor.execute("PRAGMA data_version")
+                return cursor.fetchone()[0]  # type: ignore[index]
+            finally:
+                cursor.close()
+
+        with self.engine.connect() as conn:
+            return conn.execute(select(col(ChangeSequence.value)).where(col(ChangeSequence.id) == 1)).scalar()
+
+    def close(self) -> None:
+        """Release the dedicated connection."""
+        listeners = (
+            ("after_cursor_execute", self._mark_write),
+            ("commit", self._on_commit),
+            ("commit", self._before_local_commit),
+            ("checkin", self._after_local_commit),
+        )
+        for name, listener in listeners:
+            if event.contains(self.engine, name, listener):
+                event.remove(self.engine, name, listener)
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+_watchers: dict[str, DataVersionWatcher] = {}
+_watchers_lock = threading.Lock()
+
+
+def get_watcher(engine: Engine) -> DataVersionWatcher:
+    """
+    Get the process-wide watcher for an engine's database.
+
+    Args:
+        engine: Database engine
+
+    Returns:
+        DataVersionWatcher: Watcher shared by all caches of this database
+    """
+    key = str(engine.url)
+    with _watchers_lock:
+        watcher = _watchers.get(key)
+        if watcher is None or watcher.engine is not engine:
+            if watcher is not None:
+                watcher.close()
+            watcher = DataVersionWatcher(engine)
+            _watchers[key] = watcher
+        return watcher
+
+
+def get_data_generation(engine: Engine) -> int:
+    """
+    Get the cache generation for an engine's database, polling for external writes.
+
+    Caches should include this number in their key, or compare it with the
+    generation they were filled at.
+
+    Args:
+        engine: Database engine
+
+    Returns:
+        int: Current cache generation
+    """
+    return get_watcher(engine).poll()
+
+
+def close_watcher(engine: Engine) -> None:
+    """
+    Close and forget the watcher for an engine, e.g. when the engine is disposed.
+
+    Args:
+        engine: Database engine
+    """
+    with _watchers_lock:
+        watcher = _watchers.get(str(engine.url))
+        if watcher is not None and watcher.engine is engine:
+            del _watchers[str(engine.url)]
+        else:
+            watcher = None
+    if watcher is not None:
+        watcher.close()
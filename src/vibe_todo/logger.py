@@ -7,6 +7,9 @@ from typing import Literal
 
 from loguru import logger
 
+# set once configure_logger has run, so setup_logger is cheap to call repeatedly
+_configured = False
+
 
 def configure_logger(
     environment: Literal["dev", "prod"] = "dev",
@@ -23,6 +26,9 @@ def configure_logger(
         log_to_file: Whether to log to a file
         log_file_path: Path to log file (defaults to logs/app.log)
     """
+    global _configured
+    _configured = True
+
     # remove default handler
     logger.remove()
 
@@ -78,14 +84,23 @@ def configure_logger(
         )
 
 
-def setup_logger() -> None:
+def setup_logger(force: bool = False) -> None:
     """
     Setup logger based on environment variables or defaults.
 
     Reads LOG_ENV environment variable (defaults to 'dev').
     Reads LOG_LEVEL environment variable (defaults to 'INFO').
     Reads LOG_TO_FILE environment variable (defaults to False).
+
+    Importing this module no longer configures handlers; entry points call
+    this once at startup. Later calls are no-ops unless force is set.
+
+    Args:
+        force: Reconfigure even if the logger was already configured
     """
+    if _configured and not force:
+        return
+
     environment = os.getenv("LOG_ENV", "dev")
     log_level = os.getenv("LOG_LEVEL", "INFO")
     log_to_file = os.getenv("LOG_TO_FILE", "false").lower() == "true"
@@ -101,8 +116,5 @@ def setup_logger() -> None:
     )
 
 
-# setup logger on module import
-setup_logger()
-
 # export logger instance for easy import
 __all__ = ["logger", "configure_logger", "setup_logger"]
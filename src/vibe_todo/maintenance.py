@@ -0,0 +1,452 @@
+"""Background database maintenance.
+
+A ``MaintenanceScheduler`` runs housekeeping jobs for one database on a
+daemon thread:
+
+- ``wal_checkpoint`` on every tick, so the ``-wal`` file stays bounded
+  even under constant writes. It is skipped while the WAL is small, runs a
+  PASSIVE checkpoint once it passes WAL_CHECKPOINT_BYTES and a TRUNCATE
+  checkpoint once it passes WAL_TRUNCATE_BYTES.
+- ``optimize`` (``PRAGMA optimize``) and ``analyze`` (``ANALYZE``), both
+  limited by ``PRAGMA analysis_limit``, to keep the planner's statistics
+  current for the partial and composite indexes.
+- ``integrity_check`` (``PRAGMA quick_check``).
+- ``compact_my_day``, ``archive_completed``, ``purge_trash`` and
+  ``rebalance_ranks``, which also run on server databases.
+
+Apart from checkpoints, jobs only start once the database has seen no
+writes for MAINTENANCE_IDLE_SECONDS. SQLite statements run under a time
+budget enforced by a progress handler, which interrupts them when the
+budget is spent; the batched jobs start no new batch once it is spent and
+leave the rest to their next run. Each run's duration and outcome is
+logged and kept in ``MaintenanceScheduler.stats``.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Iterator, NamedTuple, cast
+
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+from vibe_todo.database import is_sqlite
+from vibe_todo.events import ChangeEvent, get_event_bus
+from vibe_todo.logger import logger
+from vibe_todo.metrics import REGISTRY, MetricFamily
+from vibe_todo.purger import TrashPurger
+from vibe_todo.services import archive_completed_tasks, compact_my_day, rebalance_ranks
+
+# Set to "false" to run no background maintenance
+MAINTENANCE_ENABLED = os.getenv("MAINTENANCE_ENABLED", "true").lower() == "true"
+
+# Seconds between maintenance ticks
+MAINTENANCE_TICK_SECONDS = float(os.getenv("MAINTENANCE_TICK_SECONDS", "30"))
+
+# Seconds without writes after which the database counts as idle
+MAINTENANCE_IDLE_SECONDS = float(os.getenv("MAINTENANCE_IDLE_SECONDS", "10"))
+
+# Longest a single job may run before it is interrupted
+MAINTENANCE_TIME_BUDGET_SECONDS = float(os.getenv("MAINTENANCE_TIME_BUDGET_SECONDS", "2"))
+
+# Rows sampled per index by ANALYZE and PRAGMA optimize (0 = no limit)
+ANALYSIS_LIMIT = int(os.getenv("ANALYSIS_LIMIT", "1000"))
+
+# WAL size that triggers a PASSIVE checkpoint
+WAL_CHECKPOINT_BYTES = int(os.getenv("WAL_CHECKPOINT_BYTES", str(4 * 1024 * 1024)))
+
+# WAL size that triggers a TRUNCATE checkpoint, which also shrinks the file
+WAL_TRUNCATE_BYTES = int(os.getenv("WAL_TRUNCATE_BYTES", str(64 * 1024 * 1024)))
+
+# Days after completion when a task moves to the archive tables
+ARCHIVE_AFTER_DAYS = float(os.getenv("ARCHIVE_AFTER_DAYS", "30"))
+
+# Tasks archived per transaction
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+
+# Days of raw My Day entries kept before they are compacted into per-day summaries.
+# Completed tasks are only archived once their entries are compacted.
+MY_DAY_RETENTION_DAYS = int(os.getenv("MY_DAY_RETENTION_DAYS", "30"))
+
+# Days of My Day entries compacted per transaction
+MY_DAY_COMPACT_BATCH_DAYS = int(os.getenv("MY_DAY_COMPACT_BATCH_DAYS", "30"))
+
+# SQLite virtual machine steps between budget checks
+_PROGRESS_STEPS = 10_000
+
+
+class MaintenanceJob(NamedTuple):
+    """A maintenance job and when it may run."""
+
+    name: str
+    run: Callable[[Engine, float], str]
+    interval: float
+    idle_only: bool = True
+    sqlite_only: bool = True
+
+
+class JobStats(NamedTuple):
+    """Outcome of a job's runs so far."""
+
+    runs: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    last_outcome: str | None = None
+    last_detail: str | None = None
+    last_duration: float = 0.0
+    last_run: datetime | None = None
+
+
+class BudgetExceeded(Exception):
+    """Raised when a job was interrupted because its time budget was spent."""
+
+
+@contextmanager
+def budgeted_connection(engine: Engine, deadline: float) -> Iterator[sqlite3.Connection]:
+    """
+    Borrow a raw SQLite connection whose statements are interrupted at a deadline.
+
+    Args:
+        engine: SQLite engine
+        deadline: time.monotonic() value after which statements are interrupted
+
+    Yields:
+        sqlite3.Connection: The DBAPI connection
+
+    Raises:
+        BudgetExceeded: If a statement was interrupted by the deadline
+    """
+    connection = engine.raw_connection()
+    dbapi_connection = cast(sqlite3.Connection, connection.dbapi_connection)
+    dbapi_connection.set_progress_handler(lambda: time.monotonic() > deadline, _PROGRESS_STEPS)
+    try:
+        yield dbapi_connection
+    except sqlite3.OperationalError as e:
+        if "interrupted" in str(e):
+            raise BudgetExceeded(str(e)) from e
+        raise
+    finally:
+        dbapi_connection.set_progress_handler(None, _PROGRESS_STEPS)
+        connection.close()
+
+
+def wal_size(engine: Engine) -> int:
+    """
+    Get the size of a SQLite database's write-ahead log.
+
+    Returns:
+        int: WAL size in bytes, 0 if there is none
+    """
+    database = engine.url.database
+    if not database or database == ":memory:":
+        return 0
+    wal = Path(f"{database}-wal")
+    return wal.stat().st_size if wal.exists() else 0
+
+
+def checkpoint_wal(engine: Engine, deadline: float) -> str:
+    """Checkpoint the WAL with a mode chosen from its current size."""
+    size = wal_size(engine)
+    if size < WAL_CHECKPOINT_BYTES:
+        return f"skipped, wal {size} bytes"
+    mode = "TRUNCATE" if size >= WAL_TRUNCATE_BYTES else "PASSIVE"
+    with budgeted_connection(engine, deadline) as connection:
+        busy, log_frames, checkpointed = connection.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+    return f"{mode.lower()}, wal {size} bytes, {checkpointed}/{log_frames} frames, busy={busy}"
+
+
+def optimize(engine: Engine, deadline: float) -> str:
+    """Run PRAGMA optimize, which re-analyzes only tables whose statistics drifted."""
+    with budgeted_connection(engine, deadline) as connection:
+        connection.execute(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+        connection.execute("PRAGMA optimize")
+    return "ok"
+
+
+def analyze(engine: Engine, deadline: float) -> str:
+    """Run a sampled ANALYZE over the whole database."""
+    with budgeted_connection(engine, deadline) as connection:
+        connection.execute(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+        connection.execute("ANALYZE")
+    return "ok"
+
+
+def integrity_check(engine: Engine, deadline: float) -> str:
+    """
+    Run PRAGMA quick_check.
+
+    Raises:
+        RuntimeError: If the check reports problems
+    """
+    with budgeted_connection(engine, deadline) as connection:
+        problems = [row[0] for row in connection.execute("PRAGMA quick_check").fetchall()]
+    if problems != ["ok"]:
+        raise RuntimeError(f"quick_check reported {len(problems)} problems: {problems[:5]}")
+    return "ok"
+
+
+def _stopped_early(deadline: float) -> str:
+    """Detail suffix for a batched job whose deadline passed, leaving the rest to its next run."""
+    return ", stopped at the time budget" if time.monotonic() >= deadline else ""
+
+
+def purge_trash(engine: Engine, deadline: float) -> str:
+    """Hard-delete expired Trash rows in batches and shrink the file."""
+    purged = TrashPurger(engine).run_once(deadline=deadline)
+    return f"{purged['list']} lists, {purged['task']} tasks{_stopped_early(deadline)}"
+
+
+def compact_history(engine: Engine, deadline: float) -> str:
+    """Fold My Day entries older than MY_DAY_RETENTION_DAYS into per-day summaries."""
+    before = date.today() - timedelta(days=max(MY_DAY_RETENTION_DAYS, 1))
+    with Session(engine) as session:
+        compacted = compact_my_day(before, session, batch_days=MY_DAY_COMPACT_BATCH_DAYS, deadline=deadline)
+    return f"{compacted} entries{_stopped_early(deadline)}"
+
+
+def archive_completed(engine: Engine, deadline: float) -> str:
+    """Move tasks completed more than ARCHIVE_AFTER_DAYS ago out of the hot table."""
+    cutoff = datetime.now() - timedelta(days=ARCHIVE_AFTER_DAYS)
+    with Session(engine) as session:
+        archived = archive_completed_tasks(cutoff, session, batch_size=ARCHIVE_BATCH_SIZE, deadline=deadline)
+    return f"{archived} tasks{_stopped_early(deadline)}"
+
+
+def rebalance(engine: Engine, deadline: float) -> str:
+    """Respace lists and My Day dates whose rank keys grew too long."""
+    with Session(engine) as session:
+        rewritten = rebalance_ranks(session, deadline=deadline)
+    return f"{rewritten} rows{_stopped_early(deadline)}"
+
+
+# Jobs run by every scheduler, in order of priority
+DEFAULT_JOBS = [
+    MaintenanceJob("wal_checkpoint", checkpoint_wal, interval=0, idle_only=False),
+    MaintenanceJob("integrity_check", integrity_check, interval=24 * 3600),
+    MaintenanceJob("analyze", analyze, interval=24 * 3600),
+    MaintenanceJob("optimize", optimize, interval=3600),
+    MaintenanceJob("compact_my_day", compact_history, interval=3600, sqlite_only=False),
+    MaintenanceJob("archive_completed", archive_completed, interval=3600, sqlite_only=False),
+    MaintenanceJob("purge_trash", purge_trash, interval=3600, sqlite_only=False),
+    MaintenanceJob("rebalance_ranks", rebalance, interval=24 * 3600, sqlite_only=False),
+]
+
+
+class MaintenanceScheduler:
+    """
+    Run maintenance jobs for one database on a background thread.
+
+    Example:
+        scheduler = MaintenanceScheduler(engine)
+        scheduler.start()
+        ...
+        scheduler.stop()
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        jobs: list[MaintenanceJob] | None = None,
+        idle_seconds: float = MAINTENANCE_IDLE_SECONDS,
+        time_budget: float = MAINTENANCE_TIME_BUDGET_SECONDS,
+    ):
+        self.engine = engine
+        self.database = str(engine.url)
+        sqlite = is_sqlite(engine)
+        self.jobs = [job for job in (jobs if jobs is not None else DEFAULT_JOBS) if sqlite or not job.sqlite_only]
+        self.idle_seconds = idle_seconds
+        self.time_budget = time_budget
+        self.stats: dict[str, JobStats] = {job.name: JobStats() for job in self.jobs}
+        self._next_run: dict[str, float] = {}
+        self._last_write = time.monotonic()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._unsubscribe = get_event_bus().subscribe(self._on_event)
+
+    def _on_event(self, event: ChangeEvent) -> None:
+        """Remember when this database was last written."""
+        if event.database == self.database:
+            self._last_write = time.monotonic()
+
+    def is_idle(self, now: float | None = None) -> bool:
+        """Whether the database has seen no writes for idle_seconds."""
+        if now is None:
+            now = time.monotonic()
+        return now - self._last_write >= self.idle_seconds
+
+    def tick(self, now: float | None = None) -> list[str]:
+        """
+        Run the jobs that are due, while the database stays idle.
+
+        Args:
+            now: Current time.monotonic() value (defaults to now)
+
+        Returns:
+            list[str]: Names of the jobs that ran
+        """
+        if now is None:
+            now = time.monotonic()
+        ran = []
+        for job in self.jobs:
+            if self._stopping.is_set():
+                break
+            if self._next_run.get(job.name, 0.0) > now:
+                continue
+            if job.idle_only and not self.is_idle(now):
+                continue
+            self.run_job(job)
+            self._next_run[job.name] = now + job.interval
+            ran.append(job.name)
+        return ran
+
+    def run_job(self, job: MaintenanceJob) -> JobStats:
+        """
+        Run one job under the time budget and record its outcome.
+
+        Args:
+            job: Job to run
+
+        Returns:
+            JobStats: Updated statistics of the job
+        """
+        started = time.monotonic()
+        try:
+            detail = job.run(self.engine, started + self.time_budget)
+            outcome = "ok"
+        except BudgetExceeded:
+            detail, outcome = f"interrupted after {self.time_budget}s budget", "timeout"
+        except Exception as e:
+            detail, outcome = str(e), "error"
+        duration = time.monotonic() - started
+
+        previous = self.stats.get(job.name, JobStats())
+        stats = JobStats(
+            runs=previous.runs + 1,
+            failures=previous.failures + (outcome != "ok"),
+            timeouts=previous.timeouts + (outcome == "timeout"),
+            errors=previous.errors + (outcome == "error"),
+            last_outcome=outcome,
+            last_detail=detail,
+            last_duration=duration,
+            last_run=datetime.now(),
+        )
+        self.stats[job.name] = stats
+
+        message = f"Maintenance job {job.name} on {self.database}: {outcome} in {duration:.3f}s ({detail})"
+        if outcome == "error":
+            logger.error(message)
+        elif outcome == "timeout":
+            logger.warning(message)
+        elif not detail.startswith("skipped"):
+            logger.info(message)
+        return stats
+
+    def start(self, tick_seconds: float = MAINTENANCE_TICK_SECONDS) -> None:
+        """
+        Run ticks on a daemon thread, the first one after tick_seconds.
+
+        Args:
+            tick_seconds: Seconds between ticks
+        """
+        if self._thread is not None:
+            return
+
+        def run() -> None:
+            while not self._stopping.wait(tick_seconds):
+                try:
+                    self.tick()
+                except Exception as e:
+                    logger.error(f"Maintenance tick failed: {e}")
+
+        self._thread = threading.Thread(target=run, name="db-maintenance", daemon=True)
+        self._thread.start()
+        logger.info(f"Database maintenance started for {self.database}")
+
+    def stop(self) -> None:
+        """Stop the background thread and the event subscription."""
+        self._unsubscribe()
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+_schedulers: dict[str, MaintenanceScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def start_maintenance(engine: Engine) -> MaintenanceScheduler | None:
+    """
+    Start background maintenance for an engine's database, once per process.
+
+    Args:
+        engine: Bootstrapped database engine
+
+    Returns:
+        MaintenanceScheduler | None: The running scheduler, or None if MAINTENANCE_ENABLED is off
+    """
+    if not MAINTENANCE_ENABLED:
+        return None
+    key = str(engine.url)
+    with _schedulers_lock:
+        scheduler = _schedulers.get(key)
+        if scheduler is None or scheduler.engine is not engine:
+            if scheduler is not None:
+                scheduler.stop()
+            scheduler = MaintenanceScheduler(engine)
+            scheduler.start()
+            _schedulers[key] = scheduler
+        return scheduler
+
+
+def get_maintenance(engine: Engine) -> MaintenanceScheduler | None:
+    """Get the running scheduler for an engine's database, if any."""
+    scheduler = _schedulers.get(str(engine.url))
+    return scheduler if scheduler is not None and scheduler.engine is engine else None
+
+
+def stop_maintenance(engine: Engine) -> None:
+    """
+    Stop background maintenance for an engine, e.g. when the engine is disposed.
+
+    Args:
+        engine: Database engine
+    """
+    with _schedulers_lock:
+        scheduler = _schedulers.get(str(engine.url))
+        if scheduler is not None and scheduler.engine is engine:
+            del _schedulers[str(engine.url)]
+        else:
+            scheduler = None
+    if scheduler is not None:
+        scheduler.stop()
+
+
+def _collect_job_stats() -> list[MetricFamily]:
+    """Runs, outcomes and last durations of every running scheduler's jobs, for vibe_todo.metrics."""
+    runs, failures, outcomes, durations = [], [], [], []
+    with _schedulers_lock:
+        schedulers = list(_schedulers.values())
+    for scheduler in schedulers:
+        for name, stats in list(scheduler.stats.items()):
+            labels = {"database": scheduler.engine.url.render_as_string(hide_password=True), "job": name}
+            runs.append((labels, stats.runs))
+            failures.append((labels, stats.failures))
+            for outcome, count in (("ok", stats.runs - stats.failures), ("timeout", stats.timeouts), ("error", stats.errors)):
+                outcomes.append(({**labels, "outcome": outcome}, count))
+            if stats.runs:
+                durations.append((labels, stats.last_duration))
+    return [
+        MetricFamily("vibe_todo_maintenance_runs_total", "counter", "Maintenance job runs", runs),
+        MetricFamily("vibe_todo_maintenance_failures_total", "counter", "Maintenance job runs that failed or timed out", failures),
+        MetricFamily("vibe_todo_maintenance_outcomes_total", "counter", "Maintenance job runs by outcome", outcomes),
+        MetricFamily("vibe_todo_maintenance_last_duration_seconds", "gauge", "Duration of each job's latest run", durations),
+    ]
+
+
+REGISTRY.register_collector(_collect_job_stats)
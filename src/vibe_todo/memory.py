@@ -0,0 +1,422 @@
+"""Process and session memory accounting.
+
+Three independent instruments, all cheap while unused:
+
+- ``RssSampler`` samples the process resident set size on a daemon thread
+  every MEMORY_SAMPLE_SECONDS, keeps a bounded history and logs a warning
+  when it passes MEMORY_RSS_WARN_MB.
+- ``RerunCapture`` and ``traced`` take ``tracemalloc`` snapshots around a
+  rerun and around blocks inside it (such as a ``render_*_view`` call) and
+  record the top allocators of the difference as a ``MemoryReport``.
+  Tracing only runs while at least one capture is open, so its overhead
+  is limited to the captured reruns. tracemalloc is process-wide: a
+  capture also sees allocations made by other sessions' threads meanwhile.
+- ``estimate_size`` walks containers and vibe_todo objects to estimate
+  how much memory a session's ``st.session_state`` holds; the app records
+  the result per session with ``record_session_size``.
+
+Nothing here imports Streamlit; app.py wires it into reruns and
+vibe_todo.ui_admin shows it.
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Iterator, Mapping, NamedTuple
+
+from vibe_todo.logger import logger
+
+# Set to "true" to capture every rerun instead of only those requested on the admin page
+MEMORY_TRACE_RERUNS = os.getenv("MEMORY_TRACE_RERUNS", "false").lower() == "true"
+
+# Stack frames kept per traced allocation (more frames cost more memory and time)
+MEMORY_TRACE_FRAMES = int(os.getenv("MEMORY_TRACE_FRAMES", "1"))
+
+# Allocation sites kept per memory report
+MEMORY_TOP_ALLOCATORS = int(os.getenv("MEMORY_TOP_ALLOCATORS", "10"))
+
+# Memory reports kept for the admin page
+MEMORY_REPORTS_KEPT = int(os.getenv("MEMORY_REPORTS_KEPT", "50"))
+
+# Seconds between process RSS samples
+MEMORY_SAMPLE_SECONDS = float(os.getenv("MEMORY_SAMPLE_SECONDS", "30"))
+
+# RSS samples kept for the admin page
+MEMORY_SAMPLES_KEPT = int(os.getenv("MEMORY_SAMPLES_KEPT", "240"))
+
+# RSS in MiB above which each sample logs a warning (0 = never)
+MEMORY_RSS_WARN_MB = float(os.getenv("MEMORY_RSS_WARN_MB", "0"))
+
+# Reruns between session_state size estimates of a session
+MEMORY_SESSION_SAMPLE_RERUNS = int(os.getenv("MEMORY_SESSION_SAMPLE_RERUNS", "20"))
+
+# Sessions whose latest session_state size is kept
+MEMORY_SESSIONS_KEPT = int(os.getenv("MEMORY_SESSIONS_KEPT", "500"))
+
+# Objects visited at most by one estimate_size call
+_SIZE_NODE_LIMIT = 200_000
+
+# Allocations of the tracing machinery itself, left out of reports
+_TRACE_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+# ============================================================================
+# Process RSS
+# ============================================================================
+
+
+def process_rss() -> int:
+    """
+    Get the resident set size of this process in bytes.
+
+    Reads /proc/self/statm where available; elsewhere falls back to the peak
+    RSS reported by getrusage, and to 0 on platforms without either.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RssSample(NamedTuple):
+    """One process RSS measurement."""
+
+    at: datetime
+    rss: int
+
+
+class RssSampler:
+    """
+    Sample the process RSS on a daemon thread.
+
+    Example:
+        sampler = RssSampler()
+        sampler.start()
+        sampler.latest().rss
+    """
+
+    def __init__(self, interval: float = MEMORY_SAMPLE_SECONDS, kept: int = MEMORY_SAMPLES_KEPT):
+        self.interval = interval
+        self.samples: deque[RssSample] = deque(maxlen=kept)
+        self.peak = 0
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def sample(self) -> RssSample:
+        """Take one sample, record it and log it."""
+        sample = RssSample(datetime.now(), process_rss())
+        self.samples.append(sample)
+        self.peak = max(self.peak, sample.rss)
+        mib = sample.rss / 2**20
+        if MEMORY_RSS_WARN_MB and mib > MEMORY_RSS_WARN_MB:
+            logger.warning(f"Process RSS {mib:.1f} MiB exceeds {MEMORY_RSS_WARN_MB:.0f} MiB")
+        else:
+            logger.debug(f"Process RSS {mib:.1f} MiB")
+        return sample
+
+    def latest(self) -> RssSample:
+        """The most recent sample, taking one if there is none yet."""
+        return self.samples[-1] if self.samples else self.sample()
+
+    def start(self) -> None:
+        """Sample now and then every interval seconds, until stopped."""
+        if self._thread is not None:
+            return
+        self.sample()
+
+        def run() -> None:
+            while not self._stopping.wait(self.interval):
+                try:
+                    self.sample()
+                except Exception as e:
+                    logger.error(f"RSS sampling failed: {e}")
+
+        self._thread = threading.Thread(target=run, name="rss-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+_sampler: RssSampler | None = None
+_sampler_lock = threading.Lock()
+
+
+def start_rss_sampler() -> RssSampler:
+    """Start the process-wide RSS sampler, once per process, and return it."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = RssSampler()
+            _sampler.start()
+        return _sampler
+
+
+# ============================================================================
+# tracemalloc captures
+# ============================================================================
+
+
+class Allocation(NamedTuple):
+    """Memory allocated by one source line between two snapshots."""
+
+    location: str
+    size_diff: int
+    count_diff: int
+    size: int
+
+
+class MemoryReport(NamedTuple):
+    """Top allocators of a traced block."""
+
+    label: str
+    at: datetime
+    duration: float
+    net_bytes: int
+    peak_bytes: int
+    top: list[Allocation]
+
+
+_reports: deque[MemoryReport] = deque(maxlen=MEMORY_REPORTS_KEPT)
+_tracing_users = 0
+_tracing_owned = False
+_tracing_lock = threading.Lock()
+
+
+def recent_reports() -> list[MemoryReport]:
+    """Memory reports recorded so far, newest first."""
+    return list(reversed(_reports))
+
+
+def _acquire_tracing() -> None:
+    """Start tracemalloc for the first open capture."""
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(MEMORY_TRACE_FRAMES)
+            _tracing_owned = True
+        _tracing_users += 1
+
+
+def _release_tracing() -> None:
+    """Stop tracemalloc once the last open capture finished, unless it was started elsewhere."""
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        _tracing_users = max(_tracing_users - 1, 0)
+        if _tracing_users == 0 and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+
+
+def _report(label: str, before: tracemalloc.Snapshot, started: float) -> MemoryReport:
+    """Diff a snapshot against now, record the report and log it."""
+    stats = _snapshot().compare_to(before, "lineno")
+    top = [
+        Allocation(str(stat.traceback[0]), stat.size_diff, stat.count_diff, stat.size)
+        for stat in stats[:MEMORY_TOP_ALLOCATORS]
+    ]
+    report = MemoryReport(
+        label=label,
+        at=datetime.now(),
+        duration=time.perf_counter() - started,
+        net_bytes=sum(stat.size_diff for stat in stats),
+        peak_bytes=tracemalloc.get_traced_memory()[1],
+        top=top,
+    )
+    _reports.append(report)
+    lines = "".join(f"\n  {a.size_diff / 1024:+10.1f} KiB {a.count_diff:+7d} blocks  {a.location}" for a in top[:5])
+    logger.info(f"Memory {label}: {report.net_bytes / 1024:+.1f} KiB in {report.duration:.3f}s{lines}")
+    return report
+
+
+class RerunCapture:
+    """
+    Trace allocations from creation until finish().
+
+    Example:
+        capture = RerunCapture("rerun My Day")
+        ...
+        capture.finish()
+    """
+
+    def __init__(self, label: str):
+        self.label = label
+        _acquire_tracing()
+        self._started = time.perf_counter()
+        self._before = _snapshot()
+        self._finished = False
+
+    def finish(self, interrupted: bool = False) -> MemoryReport | None:
+        """
+        Record the report and stop tracing if no other capture is open.
+
+        Args:
+            interrupted: The rerun was cut short (e.g. by st.rerun()) and is finished late
+
+        Returns:
+            MemoryReport | None: The report, or None if already finished
+        """
+        if self._finished or self._before is None:
+            return None
+        self._finished = True
+        try:
+            label = f"{self.label} (interrupted)" if interrupted else self.label
+            return _report(label, self._before, self._started)
+        finally:
+            self._before = None
+            _release_tracing()
+
+
+@contextmanager
+def traced(label: str, enabled: bool = True) -> Iterator[None]:
+    """
+    Record the allocations of a block while tracing is running.
+
+    A no-op when disabled or when no capture is open, so it can stay in
+    hot paths.
+
+    Args:
+        label: Report label, e.g. "render My Day"
+        enabled: Whether this caller wants a report at all
+    """
+    if not enabled or not tracemalloc.is_tracing():
+        yield
+        return
+    started = time.perf_counter()
+    before = _snapshot()
+    try:
+        yield
+    finally:
+        if tracemalloc.is_tracing():
+            _report(label, before, started)
+
+
+# ============================================================================
+# Session state size
+# ============================================================================
+
+
+def estimate_size(obj: Any, seen: set[int] | None = None) -> int:
+    """
+    Estimate the memory held by an object graph, in bytes.
+
+    Follows builtin containers and the attributes of vibe_todo objects;
+    other objects (engines, locks, Streamlit internals) count their shallow
+    size only, so shared resources are not charged to every session.
+    Objects already in seen are not counted again.
+
+    Args:
+        obj: Root object
+        seen: ids of objects already counted, shared between calls to avoid double counting
+
+    Returns:
+        int: Estimated size in bytes
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack and len(seen) < _SIZE_NODE_LIMIT:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        try:
+            total += sys.getsizeof(item)
+        except TypeError:
+            continue
+        if isinstance(item, (str, bytes, int, float, bool, type(None))):
+            continue
+        if isinstance(item, Mapping):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        elif type(item).__module__.startswith("vibe_todo"):
+            if hasattr(item, "__dict__"):
+                stack.append(vars(item))
+            for slot in getattr(type(item), "__slots__", ()):
+                if hasattr(item, slot):
+                    stack.append(getattr(item, slot))
+    return total
+
+
+def session_state_sizes(state: Mapping[Any, Any]) -> dict[str, int]:
+    """
+    Estimate the size of each session_state entry, largest first.
+
+    Objects shared between entries are charged to the first entry reaching them.
+
+    Args:
+        state: A session's state, e.g. st.session_state
+
+    Returns:
+        dict[str, int]: Key -> estimated bytes
+    """
+    seen: set[int] = set()
+    sizes = {str(key): estimate_size(value, seen) for key, value in list(state.items())}
+    return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+
+
+class SessionSize(NamedTuple):
+    """Latest session_state estimate of one session."""
+
+    at: datetime
+    total: int
+    keys: int
+    largest: str | None
+
+
+_sessions: OrderedDict[str, SessionSize] = OrderedDict()
+_sessions_lock = threading.Lock()
+
+
+def record_session_size(session_id: str, sizes: dict[str, int]) -> SessionSize:
+    """
+    Record a session's latest session_state estimate and log it.
+
+    Args:
+        session_id: Opaque session identifier
+        sizes: Output of session_state_sizes
+
+    Returns:
+        SessionSize: The recorded entry
+    """
+    entry = SessionSize(datetime.now(), sum(sizes.values()), len(sizes), next(iter(sizes), None))
+    with _sessions_lock:
+        _sessions[session_id] = entry
+        _sessions.move_to_end(session_id)
+        while len(_sessions) > MEMORY_SESSIONS_KEPT:
+            _sessions.popitem(last=False)
+    logger.debug(f"Session {session_id[:8]} state ~{entry.total / 1024:.1f} KiB in {entry.keys} keys (largest: {entry.largest})")
+    return entry
+
+
+def session_sizes() -> dict[str, SessionSize]:
+    """Latest session_state estimates by session, most recently updated first."""
+    with _sessions_lock:
+        return dict(reversed(_sessions.items()))
@@ -0,0 +1,458 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+Counters and histograms are plain Python objects guarded by a lock, so
+recording a sample costs a few microseconds and needs no extra service or
+dependency. What is collected:
+
+- every public function of vibe_todo.services that takes a session:
+  calls, errors, latency and, for list results, rows returned
+  (``instrument_module``, applied at the end of services.py)
+- database pool checkouts and connections in use, and statements failing
+  because a lock could not be obtained in time (SQLite's busy timeout,
+  PostgreSQL lock timeouts and deadlocks). Waits that end in success are
+  not visible to SQLAlchemy, so only the failures are counted
+- cache lookups and misses per cache (sidebar data, API ETags, tenant
+  engines, reminder feeds, stats snapshots), from which scrapers derive
+  hit ratios
+- Streamlit rerun durations per view
+- process RSS and anything added with ``REGISTRY.register_collector``
+
+``start_metrics_exporter`` publishes ``REGISTRY.render()`` on a local HTTP
+endpoint (METRICS_PORT) and/or as a file rewritten every
+METRICS_TEXTFILE_SECONDS (METRICS_TEXTFILE), for node_exporter's textfile
+collector. Both are off by default.
+"""
+
+import bisect
+import functools
+import inspect
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Iterable, NamedTuple
+
+from sqlalchemy import Engine, event
+from sqlalchemy.pool import Pool
+
+from vibe_todo.logger import logger
+from vibe_todo.memory import process_rss
+
+# Set to "false" to leave service functions uninstrumented
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# Port of the local /metrics endpoint (0 = no endpoint)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+# Interface the /metrics endpoint binds to
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+
+# File the metrics are written to for a textfile collector ("{pid}" is replaced; empty = no file)
+METRICS_TEXTFILE = os.getenv("METRICS_TEXTFILE", "")
+
+# Seconds between rewrites of METRICS_TEXTFILE
+METRICS_TEXTFILE_SECONDS = float(os.getenv("METRICS_TEXTFILE_SECONDS", "15"))
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Upper bounds of the returned-rows histogram buckets
+ROW_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000)
+
+# Driver messages of statements that gave up waiting for a lock
+_LOCK_ERROR = re.compile(r"database is locked|database table is locked|deadlock detected|lock timeout|could not obtain lock")
+
+
+class MetricFamily(NamedTuple):
+    """Samples of one metric produced by a collector at scrape time."""
+
+    name: str
+    type: str
+    help: str
+    samples: list[tuple[dict[str, str], float]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """A named metric with one child per combination of label values."""
+
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        self._children: dict[tuple[str, ...], Any] = {}
+
+    def labels(self, *values) -> Any:
+        """Get the child for a combination of label values, creating it on first use."""
+        key = tuple(str(value) for value in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        """Exposition lines of this metric, HELP and TYPE first."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(child.render(self.name, dict(zip(self.labelnames, key))))
+        return lines
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def render(self, name: str, labels: dict[str, str]) -> list[str]:
+        return [f"{name}{_format_labels(labels)} {_format_value(self.value)}"]
+
+
+class Counter(_Metric):
+    """A monotonically increasing count; names end in _total by convention."""
+
+    type = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the counter of a metric without labels."""
+        self.labels().inc(amount)
+
+
+class _HistogramChild:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def render(self, name: str, labels: dict[str, str]) -> list[str]:
+        with self._lock:
+            counts, total = list(self.counts), self.sum
+        lines, cumulative = [], 0
+        for bound, count in zip((*self.buckets, float("inf")), counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Observations counted into fixed buckets, with their sum and count."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record an observation of a metric without labels."""
+        self.labels().observe(value)
+
+
+class MetricsRegistry:
+    """
+    The metrics of a process and the collectors that add samples at scrape time.
+
+    Example:
+        requests = REGISTRY.counter("app_requests_total", "Requests served", ("path",))
+        requests.labels("/").inc()
+        text = REGISTRY.render()
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], Iterable[MetricFamily]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        """
+        Add a function called on every render, for values that are read rather than counted.
+
+        Args:
+            collector: Function returning MetricFamily entries
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        for collector in list(self._collectors):
+            try:
+                families = list(collector())
+            except Exception as e:
+                logger.error(f"Metrics collector {collector.__name__} failed: {e}")
+                continue
+            for family in families:
+                lines.append(f"# HELP {family.name} {family.help}")
+                lines.append(f"# TYPE {family.name} {family.type}")
+                lines.extend(f"{family.name}{_format_labels(labels)} {_format_value(value)}" for labels, value in family.samples)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+SERVICE_CALLS = REGISTRY.counter("vibe_todo_service_calls_total", "Calls of service functions", ("function",))
+SERVICE_ERRORS = REGISTRY.counter("vibe_todo_service_errors_total", "Service calls that raised", ("function",))
+SERVICE_DURATION = REGISTRY.histogram("vibe_todo_service_duration_seconds", "Service call latency", ("function",))
+SERVICE_ROWS = REGISTRY.histogram("vibe_todo_service_rows", "Rows returned by service calls returning lists", ("function",), ROW_BUCKETS)
+DB_CHECKOUTS = REGISTRY.counter("vibe_todo_db_pool_checkouts_total", "Connections checked out of the pools")
+DB_CHECKINS = REGISTRY.counter("vibe_todo_db_pool_checkins_total", "Connections returned to the pools")
+DB_LOCK_ERRORS = REGISTRY.counter("vibe_todo_db_lock_errors_total", "Statements that failed waiting for a database lock")
+CACHE_LOOKUPS = REGISTRY.counter("vibe_todo_cache_lookups_total", "Cache lookups", ("cache",))
+CACHE_MISSES = REGISTRY.counter("vibe_todo_cache_misses_total", "Cache lookups that had to compute the value", ("cache",))
+RERUN_DURATION = REGISTRY.histogram("vibe_todo_rerun_duration_seconds", "Duration of completed Streamlit reruns", ("view",))
+
+
+def _collect_process() -> list[MetricFamily]:
+    return [
+        MetricFamily("process_resident_memory_bytes", "gauge", "Resident memory size in bytes", [({}, process_rss())]),
+        MetricFamily(
+            "vibe_todo_db_pool_connections_in_use",
+            "gauge",
+            "Connections currently checked out of the pools",
+            [({}, DB_CHECKOUTS.labels().value - DB_CHECKINS.labels().value)],
+        ),
+    ]
+
+
+REGISTRY.register_collector(_collect_process)
+
+
+@event.listens_for(Pool, "checkout")
+def _count_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    DB_CHECKOUTS.inc()
+
+
+@event.listens_for(Pool, "checkin")
+def _count_checkin(dbapi_connection, connection_record) -> None:
+    DB_CHECKINS.inc()
+
+
+@event.listens_for(Engine, "handle_error")
+def _count_lock_error(context) -> None:
+    if _LOCK_ERROR.search(str(context.original_exception)):
+        DB_LOCK_ERRORS.inc()
+
+
+# ============================================================================
+# Service instrumentation
+# ============================================================================
+
+
+def instrument(function: Callable, name: str | None = None) -> Callable:
+    """
+    Wrap a function to record its calls, errors, latency and returned rows.
+
+    Args:
+        function: Function to wrap
+        name: Value of the function label (defaults to the function's name)
+
+    Returns:
+        Callable: The wrapper
+    """
+    name = name or function.__name__
+    calls, errors = SERVICE_CALLS.labels(name), SERVICE_ERRORS.labels(name)
+    duration, rows = SERVICE_DURATION.labels(name), SERVICE_ROWS.labels(name)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        except Exception:
+            errors.inc()
+            raise
+        finally:
+            calls.inc()
+            duration.observe(time.perf_counter() - started)
+        if isinstance(result, (list, tuple)):
+            rows.observe(len(result))
+        return result
+
+    return wrapper
+
+
+def instrument_module(namespace: dict[str, Any]) -> list[str]:
+    """
+    Instrument the public functions of a module that take a session.
+
+    Call it at the end of the module with globals(), so later imports of the
+    module get the wrappers. Does nothing unless METRICS_ENABLED.
+
+    Args:
+        namespace: The module's globals()
+
+    Returns:
+        list[str]: Names of the wrapped functions
+    """
+    if not METRICS_ENABLED:
+        return []
+    wrapped = []
+    for name, value in list(namespace.items()):
+        if name.startswith("_") or not inspect.isfunction(value) or value.__module__ != namespace["__name__"]:
+            continue
+        if "session" not in inspect.signature(value).parameters:
+            continue
+        namespace[name] = instrument(value)
+        wrapped.append(name)
+    return wrapped
+
+
+# ============================================================================
+# Exporters
+# ============================================================================
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        payload = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def start_metrics_server(host: str = METRICS_HOST, port: int = METRICS_PORT) -> ThreadingHTTPServer:
+    """
+    Serve GET /metrics on a daemon thread.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free one)
+
+    Returns:
+        ThreadingHTTPServer: The running server
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info(f"Metrics served on http://{host}:{server.server_port}/metrics")
+    return server
+
+
+def write_textfile(path: str | Path) -> None:
+    """Write the current metrics to path atomically, so a collector never reads a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temporary.write_text(REGISTRY.render(), encoding="utf-8")
+    os.replace(temporary, path)
+
+
+def start_textfile_writer(path: str, interval: float = METRICS_TEXTFILE_SECONDS) -> threading.Thread:
+    """
+    Rewrite a metrics file every interval seconds on a daemon thread.
+
+    Args:
+        path: File to write; "{pid}" is replaced with the process id
+        interval: Seconds between writes
+
+    Returns:
+        threading.Thread: The writer thread
+    """
+    path = path.replace("{pid}", str(os.getpid()))
+
+    def run() -> None:
+        while True:
+            try:
+                write_textfile(path)
+            except OSError as e:
+                logger.error(f"Failed to write metrics to {path}: {e}")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name="metrics-textfile", daemon=True)
+    thread.start()
+    logger.info(f"Metrics written to {path} every {interval:.0f}s")
+    return thread
+
+
+_exporter_started = False
+_exporter_lock = threading.Lock()
+
+
+def start_metrics_exporter() -> None:
+    """Start the configured exporters (METRICS_PORT, METRICS_TEXTFILE), once per process."""
+    global _exporter_started
+    with _exporter_lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+        if METRICS_PORT:
+            try:
+                start_metrics_server()
+            except OSError as e:
+                # e.g. a second app process on the same host
+                logger.warning(f"Metrics endpoint not started on port {METRICS_PORT}: {e}")
+        if METRICS_TEXTFILE:
+            start_textfile_writer(METRICS_TEXTFILE)
@@ -1,8 +1,9 @@
 """SQLModel data models for the todo application."""
 
 from datetime import date, datetime
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, NamedTuple, Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -13,32 +14,91 @@ class TodoList(SQLModel, table=True):
     """TodoList model representing a task list."""
 
     __tablename__ = "todo_list"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index(
+            "ix_todo_list_trash",
+            "deleted_at",
+            sqlite_where=text("deleted_at IS NOT NULL"),
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+        {"extend_existing": True},
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(unique=True, index=True)
     created_at: datetime = Field(default_factory=datetime.now)
     is_system: bool = Field(default=False)
-    tasks: list["vibe_todo.models.Task"] = Relationship(back_populates="task_list")
+    # Set while the list is in the Trash
+    deleted_at: Optional[datetime] = None
+    tasks: list["vibe_todo.models.Task"] = Relationship(back_populates="task_list", passive_deletes="all")
 
 
 class Task(SQLModel, table=True):
     """Task model representing a todo task."""
 
-    __table_args__ = {"extend_existing": True}
+    # Partial indexes: live queries only walk live rows, the Trash and the purger only trashed ones
+    __table_args__ = (
+        Index(
+            "ix_task_live_list_id_rank",
+            "list_id",
+            "rank",
+            sqlite_where=text("deleted_at IS NULL"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_task_trash",
+            "deleted_at",
+            sqlite_where=text("deleted_at IS NOT NULL"),
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+        # Important and planned views, searched by their filter column and already in view order
+        Index(
+            "ix_task_live_important",
+            "is_important",
+            "list_id",
+            "rank",
+            sqlite_where=text("deleted_at IS NULL"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_task_live_due_date",
+            "due_date",
+            "rank",
+            sqlite_where=text("deleted_at IS NULL"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Completed live tasks by age, for the archiver
+        Index(
+            "ix_task_archivable",
+            "updated_at",
+            sqlite_where=text("is_completed = 1 AND deleted_at IS NULL"),
+            postgresql_where=text("is_completed AND deleted_at IS NULL"),
+        ),
+        {"extend_existing": True},
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    list_id: int = Field(foreign_key="todo_list.id")
+    list_id: int = Field(foreign_key="todo_list.id", ondelete="CASCADE", index=True)
     title: str
     description: Optional[str] = None
     due_date: Optional[date] = None
     is_completed: bool = Field(default=False)
     is_important: bool = Field(default=False)
+    # RFC 5545 RRULE; due_date is the current occurrence (see vibe_todo.recurrence)
+    recurrence: Optional[str] = None
+    # When to notify about the task (see vibe_todo.scheduler)
+    remind_at: Optional[datetime] = Field(default=None, index=True)
+    # My Day suggestion score; NULL when the task is not worth suggesting
+    suggestion_score: Optional[float] = Field(default=None, index=True)
+    # Manual order within the list (see vibe_todo.ranking)
+    rank: Optional[str] = None
+    # Set while the task is in the Trash
+    deleted_at: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
     task_list: Optional["vibe_todo.models.TodoList"] = Relationship(back_populates="tasks")
-    subtasks: list["vibe_todo.models.Subtask"] = Relationship(back_populates="task")
-    my_day_entries: list["vibe_todo.models.MyDayTask"] = Relationship(back_populates="task")
+    subtasks: list["vibe_todo.models.Subtask"] = Relationship(back_populates="task", passive_deletes="all")
+    my_day_entries: list["vibe_todo.models.MyDayTask"] = Relationship(back_populates="task", passive_deletes="all")
 
 
 class Subtask(SQLModel, table=True):
@@ -47,7 +107,7 @@ class Subtask(SQLModel, table=True):
     __table_args__ = {"extend_existing": True}
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    task_id: int = Field(foreign_key="task.id")
+    task_id: int = Field(foreign_key="task.id", ondelete="CASCADE", index=True)
     title: str
     is_completed: bool = Field(default=False)
     created_at: datetime = Field(default_factory=datetime.now)
@@ -57,8 +117,146 @@ class Subtask(SQLModel, table=True):
 class MyDayTask(SQLModel, table=True):
     """MyDayTask model representing a many-to-many relationship between tasks and dates."""
 
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_mydaytask_task_date_rank", "task_date", "rank"),
+        # Keeps a day's lookup proportional to that day's entries, however long the history
+        Index("ix_mydaytask_task_date_task_id", "task_date", "task_id"),
+        {"extend_existing": True},
+    )
 
-    task_id: int = Field(foreign_key="task.id", primary_key=True)
+    task_id: int = Field(foreign_key="task.id", primary_key=True, ondelete="CASCADE")
     task_date: date = Field(primary_key=True)
+    # Manual order within the day (see vibe_todo.ranking)
+    rank: Optional[str] = None
     task: Optional["vibe_todo.models.Task"] = Relationship(back_populates="my_day_entries")
+
+
+class MyDaySummary(SQLModel, table=True):
+    """Per-day My Day totals kept after the day's entries were compacted (see services.compact_my_day).
+
+    ``completed`` counts the tasks that were complete when the day was compacted.
+    """
+
+    __tablename__ = "my_day_summary"  # type: ignore[assignment]
+    __table_args__ = {"extend_existing": True}
+
+    task_date: date = Field(primary_key=True)
+    planned: int = Field(default=0)
+    completed: int = Field(default=0)
+
+
+class ArchivedTask(SQLModel, table=True):
+    """Completed task moved out of the hot ``task`` table (see services.archive_completed_tasks).
+
+    Archived rows get their own ids, because SQLite may hand the id of an
+    archived task to a new one; ``task_id`` keeps the original for reference.
+    """
+
+    __tablename__ = "archived_task"  # type: ignore[assignment]
+    __table_args__ = {"extend_existing": True}
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    task_id: int
+    list_id: int = Field(foreign_key="todo_list.id", ondelete="CASCADE", index=True)
+    title: str
+    description: Optional[str] = None
+    due_date: Optional[date] = None
+    is_completed: bool = Field(default=True)
+    is_important: bool = Field(default=False)
+    recurrence: Optional[str] = None
+    rank: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    archived_at: datetime = Field(default_factory=datetime.now)
+
+
+class ArchivedSubtask(SQLModel, table=True):
+    """Subtask of an archived task."""
+
+    __tablename__ = "archived_subtask"  # type: ignore[assignment]
+    __table_args__ = {"extend_existing": True}
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    task_id: int = Field(foreign_key="archived_task.id", ondelete="CASCADE", index=True)
+    title: str
+    is_completed: bool = Field(default=False)
+    created_at: datetime
+
+
+class TaskCounter(SQLModel, table=True):
+    """Open-task counters per list and due date, maintained by SQLite triggers.
+
+    ``due_key`` is the ISO due date, or an empty string for tasks without one.
+    """
+
+    __tablename__ = "task_counter"  # type: ignore[assignment]
+    __table_args__ = {"extend_existing": True}
+
+    list_id: int = Field(primary_key=True)
+    due_key: str = Field(default="", primary_key=True)
+    open_count: int = Field(default=0)
+    important_count: int = Field(default=0)
+
+
+class MyDayCounter(SQLModel, table=True):
+    """Open-task counter per My Day date, maintained by SQLite triggers."""
+
+    __tablename__ = "my_day_counter"  # type: ignore[assignment]
+    __table_args__ = {"extend_existing": True}
+
+    task_date: date = Field(primary_key=True)
+    open_count: int = Field(default=0)
+
+
+class SuggestionState(SQLModel, table=True):
+    """Single-row table recording the day the suggestion scores were computed for."""
+
+    __tablename__ = "suggestion_state"  # type: ignore[assignment]
+    __table_args__ = {"extend_existing": True}
+
+    id: int = Field(default=1, primary_key=True)
+    scored_on: date
+
+
+class ChangeSequence(SQLModel, table=True):
+    """Single-row counter bumped by every writing commit on server databases (see vibe_todo.invalidation).
+
+    SQLite needs no counter: ``PRAGMA data_version`` already detects commits
+    of other connections.
+    """
+
+    __tablename__ = "change_sequence"  # type: ignore[assignment]
+    __table_args__ = {"extend_existing": True}
+
+    id: int = Field(default=1, primary_key=True)
+    value: int = Field(default=0)
+
+
+class SchemaVersion(SQLModel, table=True):
+    """Single-row table recording the schema version the database was bootstrapped to."""
+
+    __tablename__ = "schema_version"  # type: ignore[assignment]
+    __table_args__ = {"extend_existing": True}
+
+    id: int = Field(default=1, primary_key=True)
+    version: int
+    applied_at: datetime = Field(default_factory=datetime.now)
+
+
+class TaskRow(NamedTuple):
+    """Read-only projection of a task used for rendering views.
+
+    Rows are plain tuples: no identity map, change tracking or relationship
+    loading, which keeps large view queries cheap. Use ``Task`` for writes.
+    """
+
+    id: int
+    list_id: int
+    title: str
+    description: Optional[str]
+    due_date: Optional[date]
+    is_completed: bool
+    is_important: bool
+    recurrence: Optional[str] = None
+    # True for rows read from archived_task, which are read-only
+    is_archived: bool = False
@@ -0,0 +1,69 @@
+"""Background purge of expired Trash rows.
+
+Deleting a list or task only stamps ``deleted_at`` (see
+vibe_todo.services.delete_list and delete_task). A ``TrashPurger`` later
+removes rows that stayed in the Trash longer than the retention period, in
+small batches, and then hands the freed pages back to the file system with
+``PRAGMA incremental_vacuum`` so the database file shrinks without a full
+VACUUM holding the write lock. In WAL mode the file shrinks at the next
+checkpoint. The purge runs as a vibe_todo.maintenance job.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+from vibe_todo.database import incremental_vacuum
+from vibe_todo.services import purge_trash
+
+# Days a deleted list or task stays restorable
+TRASH_RETENTION_DAYS = float(os.getenv("TRASH_RETENTION_DAYS", "30"))
+
+# Tasks hard-deleted per transaction
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "500"))
+
+# Pages released per incremental_vacuum call; 0 releases all free pages
+PURGE_VACUUM_PAGES = int(os.getenv("PURGE_VACUUM_PAGES", "1000"))
+
+
+class TrashPurger:
+    """
+    Hard-delete expired Trash rows of one database.
+
+    Scheduled by vibe_todo.maintenance, which calls run_once.
+
+    Example:
+        purged = TrashPurger(engine).run_once()
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        retention: timedelta = timedelta(days=TRASH_RETENTION_DAYS),
+        batch_size: int = PURGE_BATCH_SIZE,
+        vacuum_pages: int = PURGE_VACUUM_PAGES,
+    ):
+        self.engine = engine
+        self.retention = retention
+        self.batch_size = batch_size
+        self.vacuum_pages = vacuum_pages
+
+    def run_once(self, now: datetime | None = None, deadline: float | None = None) -> dict[str, int]:
+        """
+        Purge rows trashed before now - retention, then shrink the file.
+
+        Args:
+            now: Current time (defaults to datetime.now())
+            deadline: time.monotonic() value after which no further batch is started
+
+        Returns:
+            dict[str, int]: Number of purged lists and tasks
+        """
+        cutoff = (now or datetime.now()) - self.retention
+        with Session(self.engine) as session:
+            purged = purge_trash(cutoff, session, batch_size=self.batch_size, deadline=deadline)
+        if any(purged.values()):
+            incremental_vacuum(self.engine, self.vacuum_pages)
+        return purged
@@ -0,0 +1,122 @@
+"""Lexicographic rank keys for user-defined ordering.
+
+Ranks are strings over ``0-9a-z`` read as base-36 fractions: sorting them as
+plain strings gives the manual order, and a key strictly between any two
+keys always exists. Moving an item therefore rewrites only that item's key.
+Repeated inserts at the same spot make keys longer, which a rebalancing pass
+fixes by respacing a whole list.
+
+Keys never end in "0", so there is always room before any key.
+"""
+
+import math
+import os
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# Keys longer than this trigger a rebalance of their list
+RANK_REBALANCE_LENGTH = int(os.getenv("RANK_REBALANCE_LENGTH", "12"))
+
+
+def _midpoint(a: str, b: str | None) -> str:
+    """Key strictly between a and b, where b=None means the end of the range."""
+    if b is not None:
+        # keep the shared prefix; a is padded with zeros
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else "0") == b[n]:
+            n += 1
+        if n:
+            return b[:n] + _midpoint(a[n:], b[n:])
+
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b) // 2]
+    if b is not None and len(b) > 1:
+        return b[0]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def rank_between(before: str | None, after: str | None) -> str:
+    """
+    Create a rank key that sorts between two keys.
+
+    Args:
+        before: Key of the item above, or None for the start
+        after: Key of the item below, or None for the end
+
+    Returns:
+        str: New key with before < key < after
+
+    Raises:
+        ValueError: If before does not sort below after
+    """
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"Rank {before!r} does not sort before {after!r}")
+    return _midpoint(before or "", after)
+
+
+def _to_int(key: str, width: int) -> int:
+    """Read a key as an integer of width base-36 digits (the key padded with zeros)."""
+    value = 0
+    for i in range(width):
+        value = value * BASE + (DIGITS.index(key[i]) if i < len(key) else 0)
+    return value
+
+
+def _to_key(value: int, width: int) -> str:
+    """Write an integer as a key of at most width digits, without trailing zeros."""
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits)).rstrip("0")
+
+
+def ranks_between(before: str | None, after: str | None, count: int) -> list[str]:
+    """
+    Create count ascending keys between two keys, spread evenly.
+
+    Unlike repeated rank_between calls, which add a digit every few keys,
+    the keys only get as long as count requires.
+
+    Args:
+        before: Key of the item above, or None for the start
+        after: Key of the item below, or None for the end
+        count: Number of keys
+
+    Returns:
+        list[str]: Ascending keys with before < key < after
+
+    Raises:
+        ValueError: If before does not sort below after
+    """
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"Rank {before!r} does not sort before {after!r}")
+    if count <= 0:
+        return []
+    width = max(len(before or ""), len(after or ""), 1)
+    while True:
+        low = _to_int(before or "", width)
+        high = _to_int(after, width) if after is not None else BASE**width
+        if high - low > count:
+            break
+        width += 1
+    step = (high - low) // (count + 1)
+    return [_to_key(low + step * i, width) for i in range(1, count + 1)]
+
+
+def evenly_spaced_ranks(count: int) -> list[str]:
+    """
+    Create count ascending keys of minimal equal length, spread across the key space.
+
+    Args:
+        count: Number of keys
+
+    Returns:
+        list[str]: Ascending keys
+    """
+    width = max(1, math.ceil(math.log(count + 1, BASE)) + 1)
+    step = BASE**width // (count + 1)
+    return [_to_key(step * i, width) for i in range(1, count + 1)]
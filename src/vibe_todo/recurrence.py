@@ -0,0 +1,119 @@
+"""Recurrence rules for repeating tasks, built on dateutil's rrule.
+
+A recurring task stores an RFC 5545 ``RRULE`` (e.g. ``FREQ=WEEKLY;BYDAY=MO``)
+and its ``due_date`` is the current occurrence. Only that occurrence exists as
+a row; completing it materializes the next one. Later occurrences are
+computed on demand for the visible date window and are never stored.
+"""
+
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+from dateutil.rrule import rrule, rrulestr
+
+from vibe_todo.models import TaskRow
+
+# Rules offered by name, e.g. for a "Repeat" picker
+RECURRENCE_PRESETS: dict[str, str] = {
+    "Daily": "FREQ=DAILY",
+    "Every weekday": "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR",
+    "Weekly": "FREQ=WEEKLY",
+    "Monthly": "FREQ=MONTHLY",
+    "Yearly": "FREQ=YEARLY",
+}
+
+# Fixed anchor used to parse a rule once; the real start is set with replace()
+_PARSE_ANCHOR = datetime(2000, 1, 1)
+
+
+@lru_cache(maxsize=1024)
+def _parse(rule: str) -> rrule:
+    """Parse a rule string once; tasks sharing a rule share the parsed object."""
+    parsed = rrulestr(rule, dtstart=_PARSE_ANCHOR)
+    if not isinstance(parsed, rrule):
+        raise ValueError(f"Unsupported recurrence rule: {rule!r}")
+    return parsed
+
+
+def validate_rule(rule: str) -> str:
+    """
+    Validate and normalize a recurrence rule.
+
+    Args:
+        rule: RRULE string, with or without the "RRULE:" prefix, or a preset name
+
+    Returns:
+        str: The normalized rule
+
+    Raises:
+        ValueError: If the rule cannot be parsed
+    """
+    rule = RECURRENCE_PRESETS.get(rule, rule or "").strip().removeprefix("RRULE:")
+    if not rule:
+        raise ValueError("Recurrence rule cannot be empty")
+    try:
+        _parse(rule)
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Invalid recurrence rule {rule!r}: {e}") from e
+    return rule
+
+
+def _rule_from(rule: str, start: date) -> rrule:
+    """Bind a parsed rule to its first occurrence."""
+    return _parse(rule).replace(dtstart=datetime.combine(start, time()))
+
+
+def next_occurrence(rule: str, current: date) -> tuple[date, str] | None:
+    """
+    Compute the occurrence following the current one.
+
+    A COUNT limit is carried over by decrementing it, because each
+    occurrence restarts the rule from its own date.
+
+    Args:
+        rule: Validated RRULE string
+        current: Date of the current occurrence
+
+    Returns:
+        tuple[date, str] | None: Next date and the rule to store on it, or None when the series ended
+    """
+    bound = _rule_from(rule, current)
+    count = bound._count  # type: ignore[attr-defined]
+    if count is not None:
+        if count <= 1:
+            return None
+        rule = str(bound.replace(count=count - 1)).split("RRULE:", 1)[1]
+    following = bound.after(datetime.combine(current, time()))
+    if following is None:
+        return None
+    return following.date(), rule
+
+
+def expand_occurrences(tasks: Iterable[TaskRow], start: date, end: date) -> Iterator[tuple[date, TaskRow]]:
+    """
+    Lazily yield the future occurrences of open recurring tasks within a window.
+
+    Occurrences are those after each task's current due date; the current one
+    is the task row itself. Plain and completed tasks are skipped without any
+    rule parsing.
+
+    Args:
+        tasks: Task rows, typically the ones a view already loaded
+        start: First date of the window
+        end: Last date of the window (inclusive)
+
+    Yields:
+        tuple[date, TaskRow]: Occurrence date and the task it repeats
+    """
+    window_start = datetime.combine(start, time())
+    window_end = datetime.combine(end, time())
+    for task in tasks:
+        if not task.recurrence or task.is_completed or task.due_date is None or task.due_date >= end:
+            continue
+        bound = _rule_from(task.recurrence, task.due_date)
+        for occurrence in bound.between(window_start, window_end, inc=True):
+            if occurrence.date() > task.due_date:
+                yield occurrence.date(), task
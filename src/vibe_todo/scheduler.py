@@ -0,0 +1,353 @@
+"""Reminder scheduler backed by a min-heap of upcoming reminder times.
+
+Only reminders inside a lookahead window are held in memory. They are
+loaded with an indexed range query on ``task.remind_at`` and the window
+slides forward as time passes. Task changes arrive through the event bus
+(see vibe_todo.events): changed task ids are marked dirty and re-read by
+primary key on the next tick, and a trashed or restored list reloads the
+reminders of its tasks. Writes the bus never sees - from the CLI or
+another process - move the database's data generation (see
+vibe_todo.invalidation), upon which the current window is loaded again;
+commits through the scheduler's own engine are left to the bus and do not
+move it. The task table is never scanned.
+"""
+
+import heapq
+import os
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, NamedTuple, Sequence, cast
+
+from sqlalchemy import Engine
+from sqlmodel import Session, col, select
+
+from vibe_todo.events import ChangeEvent, get_event_bus
+from vibe_todo.invalidation import DataVersionWatcher
+from vibe_todo.logger import logger
+from vibe_todo.models import Task
+
+# How far ahead reminders are loaded into memory
+REMINDER_LOOKAHEAD_MINUTES = int(os.getenv("REMINDER_LOOKAHEAD_MINUTES", "60"))
+
+# Longest sleep of the background thread between ticks
+REMINDER_MAX_SLEEP_SECONDS = float(os.getenv("REMINDER_MAX_SLEEP_SECONDS", "30"))
+
+
+class Reminder(NamedTuple):
+    """A reminder that is due."""
+
+    task_id: int
+    title: str
+    remind_at: datetime
+
+
+Notifier = Callable[[Reminder], None]
+
+# (task_id, title, remind_at, list_id) of a task with a reminder; the queries filter out NULLs
+_ReminderRow = tuple[int, str, datetime, int]
+
+
+def log_notifier(reminder: Reminder) -> None:
+    """Default notifier: write the reminder to the log."""
+    logger.info(f"Reminder for task {reminder.task_id} '{reminder.title}' at {reminder.remind_at}")
+
+
+class ReminderFeed:
+    """
+    Notifier that keeps the latest reminders for UI sessions to poll.
+
+    Each reminder gets a sequence number; a session remembers the last one it
+    showed and asks for newer ones.
+    """
+
+    def __init__(self, max_reminders: int = 100):
+        self._reminders: deque[tuple[int, Reminder]] = deque(maxlen=max_reminders)
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, reminder: Reminder) -> None:
+        with self._lock:
+            self._sequence += 1
+            self._reminders.append((self._sequence, reminder))
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the latest reminder."""
+        return self._sequence
+
+    def since(self, sequence: int) -> list[tuple[int, Reminder]]:
+        """
+        Get reminders newer than a sequence number.
+
+        Args:
+            sequence: Last sequence number already seen
+
+        Returns:
+            list[tuple[int, Reminder]]: (sequence, reminder) pairs, oldest first
+        """
+        with self._lock:
+            return [item for item in self._reminders if item[0] > sequence]
+
+
+class ReminderScheduler:
+    """
+    Fire reminders for one database through pluggable notifiers.
+
+    Example:
+        scheduler = ReminderScheduler(engine, notifiers=[log_notifier])
+        scheduler.start()
+        ...
+        scheduler.stop()
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        notifiers: list[Notifier] | None = None,
+        lookahead: timedelta = timedelta(minutes=REMINDER_LOOKAHEAD_MINUTES),
+    ):
+        self.engine = engine
+        self.database = str(engine.url)
+        self.notifiers = list(notifiers) if notifiers is not None else [log_notifier]
+        self.lookahead = lookahead
+        # (remind_at, task_id); entries not matching _scheduled are stale and skipped
+        self._heap: list[tuple[datetime, int]] = []
+        # task_id -> (remind_at, title, list_id)
+        self._scheduled: dict[int, tuple[datetime, str, int]] = {}
+        self._dirty: set[int] = set()
+        self._dirty_lists: set[int] = set()
+        # bounds of the loaded window; datetime.min until the first tick
+        self._horizon = datetime.min
+        self._last_tick = datetime.min
+        # local commits are published on the bus; only foreign writes force a full reload
+        self._watcher = DataVersionWatcher(engine, count_local_writes=False)
+        self._generation: int | None = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._unsubscribe = get_event_bus().subscribe(self._on_event)
+
+    def __len__(self) -> int:
+        return len(self._scheduled)
+
+    def _on_event(self, event: ChangeEvent) -> None:
+        """Mark tasks or lists touched by a committed change for a re-read on the next tick."""
+        if event.database != self.database:
+            return
+        if event.entity == "task":
+            with self._lock:
+                self._dirty.add(event.entity_id)
+        elif event.entity == "list" and event.action != "updated":
+            # trashing or restoring a list publishes no event for its tasks
+            with self._lock:
+                self._dirty_lists.add(event.entity_id)
+        else:
+            return
+        self._wakeup.set()
+
+    def tick(self, now: datetime | None = None) -> list[Reminder]:
+        """
+        Apply pending changes, slide the window forward and fire due reminders.
+
+        Args:
+            now: Current time (defaults to datetime.now())
+
+        Returns:
+            list[Reminder]: Reminders fired by this tick
+        """
+        now = now or datetime.now()
+        generation = self._watcher.poll()
+        with self._lock:
+            if self._horizon == datetime.min:
+                # first tick: also catch reminders missed within one window before startup
+                self._load_range(now - self.lookahead, now + self.lookahead)
+                self._last_tick = now - self.lookahead
+            elif generation != self._generation:
+                # another engine or process wrote behind the event bus; reload the whole window
+                self._scheduled.clear()
+                self._heap.clear()
+                self._load_range(self._last_tick, max(self._horizon, now + self.lookahead))
+                self._dirty.clear()
+                self._dirty_lists.clear()
+            elif now + self.lookahead > self._horizon:
+                self._load_range(self._horizon, now + self.lookahead)
+            self._horizon = max(self._horizon, now + self.lookahead)
+            self._generation = generation
+
+            for list_id in self._dirty_lists:
+                self._reload_list(list_id)
+            self._dirty_lists = set()
+            if self._dirty:
+                self._reload(self._dirty)
+                self._dirty = set()
+
+            fired = []
+            while self._heap and self._heap[0][0] <= now:
+                remind_at, task_id = heapq.heappop(self._heap)
+                entry = self._scheduled.get(task_id)
+                if entry is None or entry[0] != remind_at:
+                    continue
+                del self._scheduled[task_id]
+                fired.append(Reminder(task_id, entry[1], remind_at))
+            self._last_tick = now
+
+            if len(self._heap) > 2 * len(self._scheduled) + 64:
+                self._heap = [(entry[0], task_id) for task_id, entry in self._scheduled.items()]
+                heapq.heapify(self._heap)
+
+        for reminder in fired:
+            for notifier in self.notifiers:
+                try:
+                    notifier(reminder)
+                except Exception as e:
+                    logger.error(f"Reminder notifier failed for task {reminder.task_id}: {e}")
+        return fired
+
+    def next_reminder_at(self) -> datetime | None:
+        """Time of the earliest scheduled reminder, if any is inside the window."""
+        with self._lock:
+            while self._heap:
+                remind_at, task_id = self._heap[0]
+                entry = self._scheduled.get(task_id)
+                if entry is not None and entry[0] == remind_at:
+                    return remind_at
+                heapq.heappop(self._heap)
+            return None
+
+    def _load_range(self, start: datetime, end: datetime, list_id: int | None = None) -> None:
+        """
+        Schedule open tasks with start <= remind_at < end (caller holds the lock).
+
+        Reminders up to the previous tick were already handled and are skipped.
+
+        Args:
+            start: Inclusive lower bound of remind_at
+            end: Exclusive upper bound of remind_at
+            list_id: Only load the tasks of this list
+        """
+        statement = select(Task.id, Task.title, Task.remind_at, Task.list_id).where(
+            col(Task.remind_at) >= start,
+            col(Task.remind_at) < end,
+            col(Task.is_completed) == False,  # noqa: E712
+            col(Task.deleted_at).is_(None),
+        )
+        if list_id is not None:
+            statement = statement.where(col(Task.list_id) == list_id)
+        with Session(self.engine) as session:
+            rows = cast(Sequence[_ReminderRow], session.exec(statement).all())
+        for task_id, title, remind_at, task_list_id in rows:
+            if remind_at > self._last_tick:
+                self._schedule(task_id, title, remind_at, task_list_id)
+        logger.debug(f"Loaded {len(rows)} reminders up to {end}")
+
+    def _reload_list(self, list_id: int) -> None:
+        """Re-read the reminders of a trashed or restored list (caller holds the lock)."""
+        for task_id in [task_id for task_id, entry in self._scheduled.items() if entry[2] == list_id]:
+            del self._scheduled[task_id]
+        self._load_range(self._last_tick, self._horizon, list_id=list_id)
+
+    def _reload(self, task_ids: set[int]) -> None:
+        """Re-read changed tasks by primary key (caller holds the lock)."""
+        for task_id in task_ids:
+            self._scheduled.pop(task_id, None)
+        with Session(self.engine) as session:
+            statement = select(Task.id, Task.title, Task.remind_at, Task.list_id).where(
+                col(Task.id).in_(task_ids),
+                col(Task.remind_at).isnot(None),
+                col(Task.is_completed) == False,  # noqa: E712
+                col(Task.deleted_at).is_(None),
+            )
+            rows = cast(Sequence[_ReminderRow], session.exec(statement).all())
+        for task_id, title, remind_at, list_id in rows:
+            # times up to the previous tick were already handled, e.g. a fired reminder whose title changed
+            if self._last_tick < remind_at < self._horizon:
+                self._schedule(task_id, title, remind_at, list_id)
+
+    def _schedule(self, task_id: int, title: str, remind_at: datetime, list_id: int) -> None:
+        """Add or move a task's reminder (caller holds the lock)."""
+        self._scheduled[task_id] = (remind_at, title, list_id)
+        heapq.heappush(self._heap, (remind_at, task_id))
+
+    def start(self, max_sleep: float = REMINDER_MAX_SLEEP_SECONDS) -> None:
+        """
+        Run ticks on a daemon thread, sleeping until the next reminder or change.
+
+        Args:
+            max_sleep: Longest sleep between ticks, which also bounds how late the window slides
+        """
+        if self._thread is not None:
+            return
+
+        def run() -> None:
+            while not self._stopping.is_set():
+                try:
+                    self.tick()
+                except Exception as e:
+                    logger.error(f"Reminder scheduler tick failed: {e}")
+                next_at = self.next_reminder_at()
+                sleep = max_sleep if next_at is None else (next_at - datetime.now()).total_seconds()
+                self._wakeup.wait(min(max(sleep, 0.0), max_sleep))
+                self._wakeup.clear()
+
+        self._thread = threading.Thread(target=run, name="reminder-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"Reminder scheduler started for {self.database}")
+
+    def stop(self) -> None:
+        """Stop the background thread, the event subscription and the change watcher."""
+        self._unsubscribe()
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._watcher.close()
+
+
+_schedulers: dict[str, ReminderScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def start_reminders(engine: Engine, notifiers: list[Notifier] | None = None) -> ReminderScheduler:
+    """
+    Start the reminder scheduler for an engine's database, once per process.
+
+    A scheduler started for an earlier engine of the same database is
+    stopped and replaced.
+
+    Args:
+        engine: Bootstrapped database engine
+        notifiers: Notifiers of a newly started scheduler (defaults to log_notifier)
+
+    Returns:
+        ReminderScheduler: The running scheduler
+    """
+    key = str(engine.url)
+    with _schedulers_lock:
+        scheduler = _schedulers.get(key)
+        if scheduler is None or scheduler.engine is not engine:
+            if scheduler is not None:
+                scheduler.stop()
+            scheduler = ReminderScheduler(engine, notifiers=notifiers)
+            scheduler.start()
+            _schedulers[key] = scheduler
+        return scheduler
+
+
+def stop_reminders(engine: Engine) -> None:
+    """
+    Stop the reminder scheduler for an engine, e.g. when the engine is disposed.
+
+    Args:
+        engine: Database engine
+    """
+    with _schedulers_lock:
+        scheduler = _schedulers.get(str(engine.url))
+        if scheduler is not None and scheduler.engine is engine:
+            del _schedulers[str(engine.url)]
+        else:
+            scheduler = None
+    if scheduler is not None:
+        scheduler.stop()
@@ -2,14 +2,23 @@
 
 from __future__ import annotations
 
-from datetime import date, datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import partial
 
-from sqlalchemy import func
+from sqlalchemy import Boolean, String, and_, case, cast, delete, exists, func, insert, literal, null, or_, union_all, update
+from sqlalchemy import select as sa_select
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import Session, select
+from sqlmodel import Session, col, select
 
+from vibe_todo.database import is_sqlite
+from vibe_todo.events import ChangeEvent, get_event_bus
 from vibe_todo.logger import logger
-from vibe_todo.models import MyDayTask, Subtask, Task, TodoList
+from vibe_todo.metrics import instrument_module
+from vibe_todo.models import ArchivedSubtask, ArchivedTask, MyDayCounter, MyDaySummary, MyDayTask, Subtask, SuggestionState, Task, TaskCounter, TaskRow, TodoList
+from vibe_todo.ranking import RANK_REBALANCE_LENGTH, evenly_spaced_ranks, rank_between, ranks_between
+from vibe_todo.recurrence import next_occurrence, validate_rule
 
 
 # ============================================================================
@@ -17,6 +26,233 @@ from vibe_todo.models import MyDayTask, Subtask, Task, TodoList
 # ============================================================================
 
 
+# Weights of the My Day suggestion score
+SUGGESTION_WEIGHTS = {
+    "overdue": 4.0,
+    "due_today": 3.0,
+    "due_tomorrow": 2.0,
+    "important": 2.0,
+    "in_yesterdays_my_day": 1.5,
+    "updated_today": 1.0,
+    "updated_this_week": 0.5,
+}
+
+
+def _task_row_columns(model) -> tuple:
+    """Columns loaded for TaskRow projections of Task or ArchivedTask, in TaskRow field order."""
+    return (
+        model.id,
+        model.list_id,
+        model.title,
+        model.description,
+        model.due_date,
+        model.is_completed,
+        model.is_important,
+        model.recurrence,
+        literal(model is ArchivedTask, Boolean()).label("is_archived"),
+    )
+
+
+_TASK_ROW_COLUMNS = _task_row_columns(Task)
+
+
+def _select_task_rows():
+    """Build a select statement projecting task columns for TaskRow."""
+    return select(*_TASK_ROW_COLUMNS)
+
+
+def _select_view_rows(conditions, order_by: tuple[str, ...], include_archived: bool = False):
+    """
+    Build a TaskRow query over live tasks, optionally UNIONed with archived ones.
+
+    Without include_archived only the hot task table is read, so the cost
+    depends on active work alone.
+
+    Args:
+        conditions: Function taking Task or ArchivedTask and returning its WHERE clauses
+        order_by: Names of the columns to sort by (TaskRow fields or "rank")
+        include_archived: Also return archived tasks of live lists
+
+    Returns:
+        Select statement yielding TaskRow tuples
+    """
+    hot = _select_task_rows().where(col(Task.deleted_at).is_(None), *conditions(Task))
+    if not include_archived:
+        return hot.order_by(*(getattr(Task, name) for name in order_by))
+
+    archived = (
+        sa_select(*_task_row_columns(ArchivedTask), col(ArchivedTask.rank))
+        .join(TodoList, col(TodoList.id) == ArchivedTask.list_id)
+        .where(col(TodoList.deleted_at).is_(None), *conditions(ArchivedTask))
+    )
+    rows = union_all(hot.add_columns(Task.rank), archived).subquery()
+    return select(*(rows.c[name] for name in TaskRow._fields)).order_by(*(rows.c[name] for name in order_by))
+
+
+def _fetch_task_rows(statement, session: Session) -> list[TaskRow]:
+    """Execute a TaskRow projection and wrap each result row."""
+    return list(map(TaskRow._make, session.exec(statement)))
+
+
+def _publish(session: Session, entity: str, action: str, entity_id: int, list_id: int | None = None, task_id: int | None = None) -> None:
+    """Publish a change event for a committed write to the session's database."""
+    get_event_bus().publish(
+        ChangeEvent(entity, action, entity_id, list_id=list_id, task_id=task_id, database=str(session.get_bind().engine.url))
+    )
+
+
+def score_task(due_date: date | None, is_important: bool, updated_at: datetime, in_yesterdays_my_day: bool, today: date) -> float | None:
+    """
+    Compute the My Day suggestion score of an open task.
+
+    Returns:
+        float | None: Score, or None when nothing makes the task worth suggesting
+    """
+    score = 0.0
+    if due_date is not None:
+        if due_date < today:
+            score += SUGGESTION_WEIGHTS["overdue"]
+        elif due_date == today:
+            score += SUGGESTION_WEIGHTS["due_today"]
+        elif due_date == today + timedelta(days=1):
+            score += SUGGESTION_WEIGHTS["due_tomorrow"]
+    if is_important:
+        score += SUGGESTION_WEIGHTS["important"]
+    if in_yesterdays_my_day:
+        score += SUGGESTION_WEIGHTS["in_yesterdays_my_day"]
+    age = today - updated_at.date()
+    if age <= timedelta(days=1):
+        score += SUGGESTION_WEIGHTS["updated_today"]
+    elif age <= timedelta(days=7):
+        score += SUGGESTION_WEIGHTS["updated_this_week"]
+    return score or None
+
+
+def _refresh_task_score(task_instance: Task, session: Session) -> None:
+    """Recompute the suggestion score of a task being written (the caller commits)."""
+    if task_instance.is_completed:
+        task_instance.suggestion_score = None
+        return
+    today = date.today()
+    in_yesterdays_my_day = (
+        task_instance.id is not None
+        and session.get(MyDayTask, (task_instance.id, today - timedelta(days=1))) is not None
+    )
+    task_instance.suggestion_score = score_task(
+        task_instance.due_date,
+        task_instance.is_important,
+        task_instance.updated_at or datetime.now(),
+        in_yesterdays_my_day,
+        today,
+    )
+
+
+def _last_task_rank(list_id: int, session: Session) -> str | None:
+    """Highest rank in a list, read from the partial (list_id, rank) index of live tasks."""
+    return session.exec(select(func.max(Task.rank)).where(col(Task.list_id) == list_id, col(Task.deleted_at).is_(None))).one()
+
+
+def _last_my_day_rank(task_date: date, session: Session) -> str | None:
+    """Highest rank in a day's My Day, read from the (task_date, rank) index."""
+    return session.exec(select(func.max(MyDayTask.rank)).where(col(MyDayTask.task_date) == task_date)).one()
+
+
+# Single worker that respaces lists whose rank keys grew too long
+_rebalance_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rank-rebalance")
+
+
+def _schedule_rebalance(session: Session, list_id: int | None = None, task_date: date | None = None) -> None:
+    """Respace one list or My Day date on the background worker, in its own session."""
+    engine = session.get_bind()
+
+    def run() -> None:
+        try:
+            with Session(engine) as background_session:
+                if list_id is not None:
+                    _respace_list(list_id, background_session)
+                elif task_date is not None:
+                    _respace_my_day(task_date, background_session)
+                background_session.commit()
+        except Exception as e:
+            logger.error(f"Background rank rebalance failed: {e}")
+
+    _rebalance_executor.submit(run)
+
+
+def _respace_list(list_id: int, session: Session) -> int:
+    """Rewrite the ranks of one list evenly, keeping its order (the caller commits)."""
+    task_ids = session.exec(
+        select(Task.id).where(col(Task.list_id) == list_id, col(Task.deleted_at).is_(None)).order_by(col(Task.rank), col(Task.id))
+    ).all()
+    ranks = evenly_spaced_ranks(len(task_ids))
+    if task_ids:
+        session.exec(update(Task), params=[{"id": i, "rank": r} for i, r in zip(task_ids, ranks)])
+    logger.info(f"Respaced {len(task_ids)} ranks in list {list_id}")
+    return len(task_ids)
+
+
+def _respace_my_day(task_date: date, session: Session) -> int:
+    """Rewrite the ranks of one My Day date evenly, keeping its order (the caller commits)."""
+    task_ids = session.exec(
+        select(MyDayTask.task_id).where(col(MyDayTask.task_date) == task_date).order_by(col(MyDayTask.rank), col(MyDayTask.task_id))
+    ).all()
+    ranks = evenly_spaced_ranks(len(task_ids))
+    if task_ids:
+        session.exec(
+            update(MyDayTask),
+            params=[{"task_id": i, "task_date": task_date, "rank": r} for i, r in zip(task_ids, ranks)],
+        )
+    logger.info(f"Respaced {len(task_ids)} My Day ranks on {task_date}")
+    return len(task_ids)
+
+
+def _materialize_next_occurrence(task_instance: Task, session: Session) -> Task | None:
+    """
+    Create the next occurrence of a recurring task that is being completed.
+
+    The rule moves to the new row, so the completed occurrence no longer
+    repeats; its subtasks are copied as open steps. The caller commits.
+
+    Returns:
+        Task | None: The new occurrence, or None when the series has ended
+    """
+    rule, current = task_instance.recurrence, task_instance.due_date
+    task_instance.recurrence = None
+    upcoming = next_occurrence(rule, current) if rule and current else None
+    if upcoming is None or current is None:
+        logger.info(f"Recurring task {task_instance.id} reached the end of its series")
+        return None
+
+    due_date, rule = upcoming
+    remind_at = task_instance.remind_at
+    if remind_at is not None:
+        # keep the reminder at the same offset from the due date
+        remind_at += due_date - current
+    next_task = Task(
+        list_id=task_instance.list_id,
+        title=task_instance.title,
+        description=task_instance.description,
+        due_date=due_date,
+        is_important=task_instance.is_important,
+        recurrence=rule,
+        remind_at=remind_at,
+        rank=rank_between(_last_task_rank(task_instance.list_id, session), None),
+    )
+    _refresh_task_score(next_task, session)
+    session.add(next_task)
+    session.flush()
+    session.exec(
+        insert(Subtask).from_select(
+            ["task_id", "title", "is_completed", "created_at"],
+            select(literal(next_task.id), Subtask.title, literal(False), literal(datetime.now())).where(
+                Subtask.task_id == task_instance.id
+            ),
+        )
+    )
+    logger.info(f"Materialized next occurrence of task {task_instance.id} on {due_date} as task {next_task.id}")
+    return next_task
+
+
 def initialize_system_lists(session: Session) -> list[TodoList]:
     """
     Initialize default system lists if they don't exist.
@@ -52,6 +288,91 @@ def initialize_system_lists(session: Session) -> list[TodoList]:
     return created_lists
 
 
+def _delete_task_children(task_ids, session: Session) -> tuple[int, int]:
+    """
+    Delete subtasks and My Day entries for the tasks selected by a subquery.
+
+    Databases created before ON DELETE CASCADE was declared keep their old
+    foreign keys, so children are removed explicitly before their tasks.
+
+    Args:
+        task_ids: Select statement yielding the ids of the tasks being deleted
+        session: Database session
+
+    Returns:
+        tuple[int, int]: Number of deleted subtasks and My Day entries
+    """
+    my_day_result = session.exec(
+        delete(MyDayTask).where(col(MyDayTask.task_id).in_(task_ids)).execution_options(synchronize_session=False)
+    )
+    subtask_result = session.exec(
+        delete(Subtask).where(col(Subtask.task_id).in_(task_ids)).execution_options(synchronize_session=False)
+    )
+    return subtask_result.rowcount, my_day_result.rowcount
+
+
+def _deadline_passed(deadline: float | None) -> bool:
+    """Whether a batched job should stop before its next batch (deadline is a time.monotonic() value)."""
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def _touch_task(task_id: int, session: Session) -> None:
+    """
+    Bump a task's updated_at without loading it.
+
+    Subtask changes count as task changes so that consumers watching
+    updated_at (such as the analytics snapshot) pick them up.
+
+    Args:
+        task_id: ID of the task to touch
+        session: Database session
+    """
+    session.exec(
+        update(Task)
+        .where(col(Task.id) == task_id)
+        .values(updated_at=datetime.now())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_orphans(session: Session) -> dict[str, int]:
+    """
+    Remove rows whose parent no longer exists.
+
+    Earlier versions deleted lists and tasks without cascading, leaving
+    tasks, subtasks and My Day entries that point to missing parents.
+
+    Args:
+        session: Database session
+
+    Returns:
+        dict[str, int]: Number of orphan rows deleted per table
+    """
+    logger.info("Deleting orphan rows")
+
+    try:
+        orphan_task_ids = select(Task.id).where(col(Task.list_id).not_in(select(TodoList.id)))
+        subtasks, my_day_tasks = _delete_task_children(orphan_task_ids, session)
+        tasks = session.exec(
+            delete(Task).where(col(Task.id).in_(orphan_task_ids)).execution_options(synchronize_session=False)
+        ).rowcount
+        subtasks += session.exec(
+            delete(Subtask).where(col(Subtask.task_id).not_in(select(Task.id))).execution_options(synchronize_session=False)
+        ).rowcount
+        my_day_tasks += session.exec(
+            delete(MyDayTask).where(col(MyDayTask.task_id).not_in(select(Task.id))).execution_options(synchronize_session=False)
+        ).rowcount
+        session.commit()
+
+        counts = {"task": tasks, "subtask": subtasks, "mydaytask": my_day_tasks}
+        logger.info(f"Orphan cleanup complete: {counts}")
+        return counts
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to delete orphan rows: {e}")
+        raise
+
+
 # ============================================================================
 # List Service Functions
 # ============================================================================
@@ -85,27 +406,33 @@ def create_list(name: str, session: Session) -> TodoList:
         session.refresh(new_list)
 
         logger.info(f"Successfully created list with id: {new_list.id}, name: {name}")
+        _publish(session, "list", "created", new_list.id, list_id=new_list.id)  # type: ignore[arg-type]
         return new_list
     except IntegrityError as e:
         session.rollback()
         logger.error(f"Failed to create list '{name}': unique constraint violation - {e}")
+        trashed = session.exec(
+            select(TodoList.id).where(col(TodoList.name) == name.strip(), col(TodoList.deleted_at).isnot(None))
+        ).first()
+        if trashed is not None:
+            raise ValueError(f"List with name '{name}' is in the Trash") from e
         raise ValueError(f"List with name '{name}' already exists") from e
 
 
 def get_all_lists(session: Session) -> list[TodoList]:
     """
-    Get all lists from the database.
+    Get all lists from the database, except those in the Trash.
 
     Args:
         session: Database session
 
     Returns:
-        list[TodoList]: List of all TodoList instances
+        list[TodoList]: List of all live TodoList instances
     """
     logger.info("Fetching all lists")
 
     try:
-        statement = select(TodoList)
+        statement = select(TodoList).where(col(TodoList.deleted_at).is_(None))
         lists = session.exec(statement).all()
 
         logger.info(f"Found {len(lists)} lists")
@@ -124,12 +451,12 @@ def get_list_by_id(list_id: int, session: Session) -> TodoList | None:
         session: Database session
 
     Returns:
-        TodoList | None: The TodoList instance if found, None otherwise
+        TodoList | None: The TodoList instance if found, None if missing or in the Trash
     """
     logger.info(f"Fetching list with id: {list_id}")
 
     try:
-        statement = select(TodoList).where(TodoList.id == list_id)
+        statement = select(TodoList).where(col(TodoList.id) == list_id, col(TodoList.deleted_at).is_(None))
         list_instance = session.exec(statement).first()
 
         if list_instance:
@@ -177,6 +504,7 @@ def update_list(list_id: int, name: str, session: Session) -> TodoList:
         session.refresh(list_instance)
 
         logger.info(f"Successfully updated list with id: {list_id}, new name: {name}")
+        _publish(session, "list", "updated", list_id, list_id=list_id)
         return list_instance
     except IntegrityError as e:
         session.rollback()
@@ -186,35 +514,49 @@ def update_list(list_id: int, name: str, session: Session) -> TodoList:
 
 def delete_list(list_id: int, session: Session) -> bool:
     """
-    Delete a list by its ID.
+    Move a list and its tasks to the Trash.
+
+    The list and its live tasks are stamped with the same deleted_at, so
+    restore_list brings back exactly the tasks trashed with it. Rows are
+    only removed later by purge_trash, off the request path.
 
     Args:
         list_id: ID of the list to delete
         session: Database session
 
     Returns:
-        bool: True if list was deleted, False if list was not found
-
-    Raises:
-        IntegrityError: If list has associated tasks (foreign key constraint violation)
+        bool: True if list was trashed, False if list was not found
     """
-    logger.info(f"Deleting list with id: {list_id}")
-
-    list_instance = get_list_by_id(list_id, session)
-    if not list_instance:
-        logger.warning(f"Cannot delete list: list with id {list_id} not found")
-        return False
+    logger.info(f"Trashing list with id: {list_id}")
 
     try:
-        session.delete(list_instance)
+        now = datetime.now()
+        list_result = session.exec(
+            update(TodoList)
+            .where(col(TodoList.id) == list_id, col(TodoList.deleted_at).is_(None))
+            .values(deleted_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if not list_result.rowcount:
+            session.rollback()
+            logger.warning(f"Cannot delete list: list with id {list_id} not found")
+            return False
+
+        task_result = session.exec(
+            update(Task)
+            .where(col(Task.list_id) == list_id, col(Task.deleted_at).is_(None))
+            .values(deleted_at=now, updated_at=now, suggestion_score=None)
+            .execution_options(synchronize_session=False)
+        )
         session.commit()
 
-        logger.info(f"Successfully deleted list with id: {list_id}")
+        logger.info(f"Successfully trashed list with id: {list_id} and {task_result.rowcount} tasks")
+        _publish(session, "list", "deleted", list_id, list_id=list_id)
         return True
-    except IntegrityError as e:
+    except Exception as e:
         session.rollback()
-        logger.error(f"Failed to delete list with id {list_id}: foreign key constraint violation - {e}")
-        raise ValueError(f"Cannot delete list with id {list_id}: it has associated tasks") from e
+        logger.error(f"Failed to delete list with id {list_id}: {e}")
+        raise
 
 
 def get_system_lists(session: Session) -> list[TodoList]:
@@ -230,7 +572,7 @@ def get_system_lists(session: Session) -> list[TodoList]:
     logger.info("Fetching all system lists")
 
     try:
-        statement = select(TodoList).where(TodoList.is_system == True)  # noqa: E712
+        statement = select(TodoList).where(col(TodoList.is_system) == True, col(TodoList.deleted_at).is_(None))  # noqa: E712
         lists = session.exec(statement).all()
 
         logger.info(f"Found {len(lists)} system lists")
@@ -312,13 +654,14 @@ def create_task(list_id: int, title: str, session: Session, **kwargs) -> Task:
         list_id: ID of the list to associate the task with
         title: Title of the task
         session: Database session
-        **kwargs: Additional task fields (description, due_date, is_completed, is_important)
+        **kwargs: Additional task fields (description, due_date, is_completed, is_important,
+            recurrence, remind_at). A recurring task without a due date starts today.
 
     Returns:
         Task: The created task instance
 
     Raises:
-        ValueError: If list_id is invalid or title is empty
+        ValueError: If list_id is invalid, title is empty or recurrence is not a valid rule
         IntegrityError: If list_id doesn't exist (foreign key constraint violation)
     """
     logger.info(f"Creating task with list_id: {list_id}, title: {title}")
@@ -327,6 +670,12 @@ def create_task(list_id: int, title: str, session: Session, **kwargs) -> Task:
         logger.error("Cannot create task with empty title")
         raise ValueError("Task title cannot be empty")
 
+    recurrence = kwargs.get("recurrence")
+    due_date = kwargs.get("due_date")
+    if recurrence:
+        recurrence = validate_rule(recurrence)
+        due_date = due_date or date.today()
+
     # Verify list exists
     list_instance = get_list_by_id(list_id, session)
     if not list_instance:
@@ -338,15 +687,20 @@ def create_task(list_id: int, title: str, session: Session, **kwargs) -> Task:
             list_id=list_id,
             title=title.strip(),
             description=kwargs.get("description"),
-            due_date=kwargs.get("due_date"),
+            due_date=due_date,
             is_completed=kwargs.get("is_completed", False),
             is_important=kwargs.get("is_important", False),
+            recurrence=recurrence,
+            remind_at=kwargs.get("remind_at"),
+            rank=rank_between(_last_task_rank(list_id, session), None),
         )
+        _refresh_task_score(new_task, session)
         session.add(new_task)
         session.commit()
         session.refresh(new_task)
 
         logger.info(f"Successfully created task with id: {new_task.id}, title: {title}")
+        _publish(session, "task", "created", new_task.id, list_id=list_id)  # type: ignore[arg-type]
         return new_task
     except IntegrityError as e:
         session.rollback()
@@ -363,12 +717,12 @@ def get_task_by_id(task_id: int, session: Session) -> Task | None:
         session: Database session
 
     Returns:
-        Task | None: The Task instance if found, None otherwise
+        Task | None: The Task instance if found, None if missing or in the Trash
     """
     logger.info(f"Fetching task with id: {task_id}")
 
     try:
-        statement = select(Task).where(Task.id == task_id)
+        statement = select(Task).where(col(Task.id) == task_id, col(Task.deleted_at).is_(None))
         task_instance = session.exec(statement).first()
 
         if task_instance:
@@ -405,7 +759,9 @@ def get_tasks_by_list(list_id: int, session: Session) -> list[Task]:
         raise ValueError(f"List with id {list_id} not found")
 
     try:
-        statement = select(Task).where(Task.list_id == list_id)
+        statement = (
+            select(Task).where(col(Task.list_id) == list_id, col(Task.deleted_at).is_(None)).order_by(col(Task.rank), col(Task.id))
+        )
         tasks = session.exec(statement).all()
 
         logger.info(f"Found {len(tasks)} tasks for list_id: {list_id}")
@@ -422,7 +778,8 @@ def update_task(task_id: int, session: Session, **kwargs) -> Task:
     Args:
         task_id: ID of the task to update
         session: Database session
-        **kwargs: Task fields to update (title, description, due_date, is_completed, is_important, list_id)
+        **kwargs: Task fields to update (title, description, due_date, is_completed, is_important, list_id,
+            recurrence, remind_at). Completing a recurring task materializes its next occurrence.
 
     Returns:
         Task: The updated task instance
@@ -446,11 +803,14 @@ def update_task(task_id: int, session: Session, **kwargs) -> Task:
         task_instance.title = kwargs["title"].strip()
 
     # Validate list_id if provided
+    previous_list_id = task_instance.list_id
     if "list_id" in kwargs:
         list_instance = get_list_by_id(kwargs["list_id"], session)
         if not list_instance:
             logger.error(f"Cannot update task: list with id {kwargs['list_id']} not found")
             raise ValueError(f"List with id {kwargs['list_id']} not found")
+        if kwargs["list_id"] != task_instance.list_id:
+            task_instance.rank = rank_between(_last_task_rank(kwargs["list_id"], session), None)
         task_instance.list_id = kwargs["list_id"]
 
     # Update other fields if provided
@@ -458,20 +818,36 @@ def update_task(task_id: int, session: Session, **kwargs) -> Task:
         task_instance.description = kwargs["description"]
     if "due_date" in kwargs:
         task_instance.due_date = kwargs["due_date"]
-    if "is_completed" in kwargs:
-        task_instance.is_completed = kwargs["is_completed"]
     if "is_important" in kwargs:
         task_instance.is_important = kwargs["is_important"]
+    if "remind_at" in kwargs:
+        task_instance.remind_at = kwargs["remind_at"]
+    if "recurrence" in kwargs:
+        task_instance.recurrence = validate_rule(kwargs["recurrence"]) if kwargs["recurrence"] else None
+        if task_instance.recurrence and task_instance.due_date is None:
+            task_instance.due_date = date.today()
+
+    completing = kwargs.get("is_completed") and not task_instance.is_completed
+    if "is_completed" in kwargs:
+        task_instance.is_completed = kwargs["is_completed"]
 
     # Update timestamp
     task_instance.updated_at = datetime.now()
 
     try:
+        _refresh_task_score(task_instance, session)
         session.add(task_instance)
+        next_task = _materialize_next_occurrence(task_instance, session) if completing and task_instance.recurrence else None
         session.commit()
         session.refresh(task_instance)
 
         logger.info(f"Successfully updated task with id: {task_id}")
+        if next_task is not None:
+            _publish(session, "task", "created", next_task.id, list_id=next_task.list_id)  # type: ignore[arg-type]
+        if previous_list_id != task_instance.list_id:
+            # a move also changes the list it left
+            _publish(session, "task", "updated", task_id, list_id=previous_list_id)
+        _publish(session, "task", "updated", task_id, list_id=task_instance.list_id)
         return task_instance
     except IntegrityError as e:
         session.rollback()
@@ -485,27 +861,37 @@ def update_task(task_id: int, session: Session, **kwargs) -> Task:
 
 def delete_task(task_id: int, session: Session) -> bool:
     """
-    Delete a task by its ID.
+    Move a task to the Trash.
+
+    Its subtasks and My Day entries are kept for a restore and removed with
+    the task by purge_trash.
 
     Args:
         task_id: ID of the task to delete
         session: Database session
 
     Returns:
-        bool: True if task was deleted, False if task was not found
+        bool: True if task was trashed, False if task was not found
     """
-    logger.info(f"Deleting task with id: {task_id}")
-
-    task_instance = get_task_by_id(task_id, session)
-    if not task_instance:
-        logger.warning(f"Cannot delete task: task with id {task_id} not found")
-        return False
+    logger.info(f"Trashing task with id: {task_id}")
 
     try:
-        session.delete(task_instance)
+        list_id = session.exec(select(Task.list_id).where(col(Task.id) == task_id, col(Task.deleted_at).is_(None))).first()
+        if list_id is None:
+            logger.warning(f"Cannot delete task: task with id {task_id} not found")
+            return False
+
+        now = datetime.now()
+        session.exec(
+            update(Task)
+            .where(col(Task.id) == task_id)
+            .values(deleted_at=now, updated_at=now, suggestion_score=None)
+            .execution_options(synchronize_session=False)
+        )
         session.commit()
 
-        logger.info(f"Successfully deleted task with id: {task_id}")
+        logger.info(f"Successfully trashed task with id: {task_id}")
+        _publish(session, "task", "deleted", task_id, list_id=list_id)
         return True
     except Exception as e:
         session.rollback()
@@ -517,6 +903,8 @@ def toggle_complete(task_id: int, session: Session) -> Task:
     """
     Toggle the completion status of a task.
 
+    Completing a recurring task materializes its next occurrence.
+
     Args:
         task_id: ID of the task to toggle
         session: Database session
@@ -541,11 +929,16 @@ def toggle_complete(task_id: int, session: Session) -> Task:
     task_instance.updated_at = datetime.now()
 
     try:
+        _refresh_task_score(task_instance, session)
         session.add(task_instance)
+        next_task = _materialize_next_occurrence(task_instance, session) if task_instance.is_completed and task_instance.recurrence else None
         session.commit()
         session.refresh(task_instance)
 
         logger.info(f"Successfully toggled completion status for task with id: {task_id}, is_completed: {old_status} -> {task_instance.is_completed}")
+        if next_task is not None:
+            _publish(session, "task", "created", next_task.id, list_id=next_task.list_id)  # type: ignore[arg-type]
+        _publish(session, "task", "updated", task_id, list_id=task_instance.list_id)
         return task_instance
     except Exception as e:
         session.rollback()
@@ -581,11 +974,13 @@ def toggle_important(task_id: int, session: Session) -> Task:
     task_instance.updated_at = datetime.now()
 
     try:
+        _refresh_task_score(task_instance, session)
         session.add(task_instance)
         session.commit()
         session.refresh(task_instance)
 
         logger.info(f"Successfully toggled important status for task with id: {task_id}, is_important: {old_status} -> {task_instance.is_important}")
+        _publish(session, "task", "updated", task_id, list_id=task_instance.list_id)
         return task_instance
     except Exception as e:
         session.rollback()
@@ -593,53 +988,61 @@ def toggle_important(task_id: int, session: Session) -> Task:
         raise
 
 
-def get_important_tasks(session: Session) -> list[Task]:
+def get_important_tasks(session: Session, include_archived: bool = False) -> list[TaskRow]:
     """
     Get all tasks marked as important.
 
     Args:
         session: Database session
+        include_archived: Also return archived tasks
 
     Returns:
-        list[Task]: List of all Task instances marked as important
+        list[TaskRow]: Read-only rows for all tasks marked as important
     """
     logger.info("Fetching all important tasks")
 
     try:
-        statement = select(Task).where(Task.is_important == True)  # noqa: E712
-        tasks = session.exec(statement).all()
+        statement = _select_view_rows(
+            lambda model: [model.is_important == True],  # noqa: E712
+            ("list_id", "rank", "id"),
+            include_archived,
+        )
+        tasks = _fetch_task_rows(statement, session)
 
         logger.info(f"Found {len(tasks)} important tasks")
-        return list(tasks)
+        return tasks
     except Exception as e:
         logger.error(f"Failed to fetch important tasks: {e}")
         raise
 
 
-def get_planned_tasks(session: Session) -> list[Task]:
+def get_planned_tasks(session: Session, include_archived: bool = False) -> list[TaskRow]:
     """
     Get all tasks with a due date set (planned tasks).
 
     Args:
         session: Database session
+        include_archived: Also return archived tasks
 
     Returns:
-        list[Task]: List of all Task instances with due_date set
+        list[TaskRow]: Read-only rows for all tasks with due_date set
     """
     logger.info("Fetching all planned tasks")
 
     try:
-        statement = select(Task).where(Task.due_date.isnot(None))
-        tasks = session.exec(statement).all()
+        statement = _select_view_rows(
+            lambda model: [model.due_date.isnot(None)], ("due_date", "rank", "id"), include_archived
+        )
+        tasks = _fetch_task_rows(statement, session)
 
         logger.info(f"Found {len(tasks)} planned tasks")
-        return list(tasks)
+        return tasks
     except Exception as e:
         logger.error(f"Failed to fetch planned tasks: {e}")
         raise
 
 
-def get_all_tasks(session: Session, filters: dict | None = None) -> list[Task]:
+def get_all_tasks(session: Session, filters: dict | None = None, include_archived: bool = False) -> list[TaskRow]:
     """
     Get all tasks with optional filters.
 
@@ -651,9 +1054,10 @@ def get_all_tasks(session: Session, filters: dict | None = None) -> list[Task]:
             - is_important: Filter by important status (bool)
             - due_date: Filter by due date (date)
             - title: Filter by title (substring match, case-insensitive)
+        include_archived: Also return archived tasks
 
     Returns:
-        list[Task]: List of all Task instances matching the filters
+        list[TaskRow]: Read-only rows for all tasks matching the filters
 
     Raises:
         ValueError: If list_id in filters is invalid or list not found
@@ -667,28 +1071,30 @@ def get_all_tasks(session: Session, filters: dict | None = None) -> list[Task]:
             logger.error(f"Cannot fetch tasks: list with id {filters['list_id']} not found")
             raise ValueError(f"List with id {filters['list_id']} not found")
 
-    try:
-        statement = select(Task)
-
+    def conditions(model) -> list:
+        clauses = []
         if filters:
             if "list_id" in filters:
-                statement = statement.where(Task.list_id == filters["list_id"])
+                clauses.append(model.list_id == filters["list_id"])
             if "is_completed" in filters:
-                statement = statement.where(Task.is_completed == filters["is_completed"])
+                clauses.append(model.is_completed == filters["is_completed"])
             if "is_important" in filters:
-                statement = statement.where(Task.is_important == filters["is_important"])
+                clauses.append(model.is_important == filters["is_important"])
             if "due_date" in filters:
-                statement = statement.where(Task.due_date == filters["due_date"])
+                clauses.append(model.due_date == filters["due_date"])
             if "title" in filters:
                 # Case-insensitive substring match
                 title_filter = filters["title"].strip()
                 if title_filter:
-                    statement = statement.where(func.lower(Task.title).like(f"%{title_filter.lower()}%"))
+                    clauses.append(func.lower(model.title).like(f"%{title_filter.lower()}%"))
+        return clauses
 
-        tasks = session.exec(statement).all()
+    try:
+        statement = _select_view_rows(conditions, ("list_id", "rank", "id"), include_archived)
+        tasks = _fetch_task_rows(statement, session)
 
         logger.info(f"Found {len(tasks)} tasks" + (f" matching filters" if filters else ""))
-        return list(tasks)
+        return tasks
     except ValueError:
         # Re-raise ValueError (from list_id validation)
         raise
@@ -697,7 +1103,7 @@ def get_all_tasks(session: Session, filters: dict | None = None) -> list[Task]:
         raise
 
 
-def get_my_day_tasks(task_date: date, session: Session) -> list[Task]:
+def get_my_day_tasks(task_date: date, session: Session) -> list[TaskRow]:
     """
     Get all tasks added to My Day for a specific date.
 
@@ -706,20 +1112,21 @@ def get_my_day_tasks(task_date: date, session: Session) -> list[Task]:
         session: Database session
 
     Returns:
-        list[Task]: List of all Task instances for the specified date
+        list[TaskRow]: Read-only rows for all tasks in My Day for the specified date
     """
     logger.info(f"Fetching My Day tasks for date: {task_date}")
 
     try:
         statement = (
-            select(Task)
+            _select_task_rows()
             .join(MyDayTask, Task.id == MyDayTask.task_id)
-            .where(MyDayTask.task_date == task_date)
+            .where(col(MyDayTask.task_date) == task_date, col(Task.deleted_at).is_(None))
+            .order_by(MyDayTask.rank, Task.id)
         )
-        tasks = session.exec(statement).all()
+        tasks = _fetch_task_rows(statement, session)
 
         logger.info(f"Found {len(tasks)} My Day tasks for date: {task_date}")
-        return list(tasks)
+        return tasks
     except Exception as e:
         logger.error(f"Failed to fetch My Day tasks for date {task_date}: {e}")
         raise
@@ -759,13 +1166,17 @@ def add_to_my_day(task_id: int, task_date: date, session: Session) -> MyDayTask:
         logger.warning(f"Task {task_id} already in My Day for date {task_date}")
         return existing
 
+    list_id = task_instance.list_id
     try:
-        my_day_task = MyDayTask(task_id=task_id, task_date=task_date)
+        my_day_task = MyDayTask(
+            task_id=task_id, task_date=task_date, rank=rank_between(_last_my_day_rank(task_date, session), None)
+        )
         session.add(my_day_task)
         session.commit()
         session.refresh(my_day_task)
 
         logger.info(f"Successfully added task {task_id} to My Day for date: {task_date}")
+        _publish(session, "my_day", "created", task_id, list_id=list_id, task_id=task_id)
         return my_day_task
     except IntegrityError as e:
         session.rollback()
@@ -807,10 +1218,12 @@ def remove_from_my_day(task_id: int, task_date: date, session: Session) -> bool:
             logger.warning(f"Task {task_id} not found in My Day for date {task_date}")
             return False
 
+        list_id = task_instance.list_id
         session.delete(my_day_task)
         session.commit()
 
         logger.info(f"Successfully removed task {task_id} from My Day for date: {task_date}")
+        _publish(session, "my_day", "deleted", task_id, list_id=list_id, task_id=task_id)
         return True
     except ValueError:
         # Re-raise ValueError (from task_id validation)
@@ -821,6 +1234,205 @@ def remove_from_my_day(task_id: int, task_date: date, session: Session) -> bool:
         raise
 
 
+# ============================================================================
+# Bulk Task Service Functions
+# ============================================================================
+
+
+def create_tasks(tasks: list[dict], session: Session) -> list[int]:
+    """
+    Create many tasks in a single transaction.
+
+    Rows are written with one multi-row INSERT instead of one ORM object
+    per task. Either every task is created or none is; tasks are appended
+    to their lists in the given order.
+
+    Args:
+        tasks: Task fields per task: list_id and title, plus any keyword accepted by create_task
+        session: Database session
+
+    Returns:
+        list[int]: IDs of the created tasks, in input order
+
+    Raises:
+        ValueError: If a title is empty, a list is not found or a recurrence is not a valid rule
+    """
+    logger.info(f"Creating {len(tasks)} tasks")
+
+    if not tasks:
+        return []
+    list_ids = {fields.get("list_id") for fields in tasks}
+    found = set(session.exec(select(TodoList.id).where(col(TodoList.id).in_(list_ids), col(TodoList.deleted_at).is_(None))).all())
+
+    now = datetime.now()
+    today = now.date()
+    rows = []
+    for fields in tasks:
+        list_id, title = fields.get("list_id"), fields.get("title")
+        if not title or not title.strip():
+            logger.error("Cannot create task with empty title")
+            raise ValueError("Task title cannot be empty")
+        if list_id not in found:
+            logger.error(f"Cannot create tasks: list with id {list_id} not found")
+            raise ValueError(f"List with id {list_id} not found")
+        recurrence = fields.get("recurrence")
+        due_date = fields.get("due_date")
+        if recurrence:
+            recurrence = validate_rule(recurrence)
+            due_date = due_date or today
+        is_completed = fields.get("is_completed", False)
+        is_important = fields.get("is_important", False)
+        rows.append({
+            "list_id": list_id,
+            "title": title.strip(),
+            "description": fields.get("description"),
+            "due_date": due_date,
+            "is_completed": is_completed,
+            "is_important": is_important,
+            "recurrence": recurrence,
+            "remind_at": fields.get("remind_at"),
+            "suggestion_score": None if is_completed else score_task(due_date, is_important, now, False, today),
+            "created_at": now,
+            "updated_at": now,
+        })
+
+    try:
+        # new tasks go after the last task of their list, with keys only as long as the batch needs
+        for list_id in {row["list_id"] for row in rows}:
+            list_rows = [row for row in rows if row["list_id"] == list_id]
+            ranks = ranks_between(_last_task_rank(list_id, session), None, len(list_rows))
+            for row, rank in zip(list_rows, ranks):
+                row["rank"] = rank
+        if is_sqlite(session.get_bind()):
+            # Task.id aliases the rowid (no AUTOINCREMENT) and one INSERT holds the write
+            # lock, so the rows get consecutive ids max(id) + 1.. in VALUES order; only
+            # the RETURNING order is unspecified. Sorting the ids is cheaper than
+            # sort_by_parameter_order, which makes SQLite fall back to one INSERT per row
+            task_ids = sorted(session.exec(insert(Task).returning(col(Task.id)), params=rows).scalars().all())
+        else:
+            # server sequences guarantee neither the id order nor the RETURNING order
+            task_ids = list(
+                session.exec(insert(Task).returning(col(Task.id), sort_by_parameter_order=True), params=rows).scalars().all()
+            )
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to create tasks: {e}")
+        if isinstance(e, IntegrityError):
+            raise ValueError(f"Failed to create tasks: {e}") from e
+        raise
+
+    logger.info(f"Successfully created {len(task_ids)} tasks")
+    for task_id, row in zip(task_ids, rows):
+        _publish(session, "task", "created", task_id, list_id=row["list_id"])
+    return task_ids
+
+
+def complete_tasks(task_ids: list[int], session: Session) -> int:
+    """
+    Mark many tasks as completed in a single transaction.
+
+    Plain tasks are completed with one UPDATE; recurring tasks are completed
+    one by one so their next occurrences are materialized. Tasks that are
+    already completed, in the Trash or missing are skipped.
+
+    Args:
+        task_ids: IDs of the tasks to complete
+        session: Database session
+
+    Returns:
+        int: Number of tasks completed
+    """
+    logger.info(f"Completing {len(task_ids)} tasks")
+
+    open_tasks = and_(col(Task.id).in_(task_ids), col(Task.is_completed) == False, col(Task.deleted_at).is_(None))  # noqa: E712
+    now = datetime.now()
+    try:
+        recurring = session.exec(select(Task).where(open_tasks, col(Task.recurrence).is_not(None))).all()
+        completed: list[tuple[int | None, int]] = list(
+            session.exec(select(Task.id, Task.list_id).where(open_tasks, col(Task.recurrence).is_(None)))
+        )
+        session.exec(
+            update(Task)
+            .where(col(Task.id).in_([task_id for task_id, _ in completed]))
+            .values(is_completed=True, suggestion_score=None, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        next_tasks = []
+        for task_instance in recurring:
+            task_instance.is_completed = True
+            task_instance.suggestion_score = None
+            task_instance.updated_at = now
+            session.add(task_instance)
+            next_tasks.append(_materialize_next_occurrence(task_instance, session))
+            completed.append((task_instance.id, task_instance.list_id))
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to complete tasks: {e}")
+        raise
+
+    logger.info(f"Completed {len(completed)} tasks")
+    for next_task in next_tasks:
+        if next_task is not None:
+            _publish(session, "task", "created", next_task.id, list_id=next_task.list_id)  # type: ignore[arg-type]
+    for task_id, list_id in completed:
+        _publish(session, "task", "updated", task_id, list_id=list_id)  # type: ignore[arg-type]
+    return len(completed)
+
+
+def move_tasks(task_ids: list[int], list_id: int, session: Session) -> int:
+    """
+    Move many tasks to the end of another list in a single transaction.
+
+    Tasks keep their relative order. Tasks in the Trash or missing are skipped.
+
+    Args:
+        task_ids: IDs of the tasks to move, in their new order
+        list_id: ID of the target list
+        session: Database session
+
+    Returns:
+        int: Number of tasks moved
+
+    Raises:
+        ValueError: If the target list is not found
+    """
+    logger.info(f"Moving {len(task_ids)} tasks to list {list_id}")
+
+    if get_list_by_id(list_id, session) is None:
+        logger.error(f"Cannot move tasks: list with id {list_id} not found")
+        raise ValueError(f"List with id {list_id} not found")
+
+    try:
+        previous = dict(
+            session.exec(select(Task.id, Task.list_id).where(col(Task.id).in_(task_ids), col(Task.deleted_at).is_(None))).all()
+        )
+        moving = [task_id for task_id in dict.fromkeys(task_ids) if task_id in previous]
+        ranks = ranks_between(_last_task_rank(list_id, session), None, len(moving))
+        now = datetime.now()
+        if moving:
+            session.exec(
+                update(Task),
+                params=[
+                    {"id": task_id, "list_id": list_id, "rank": rank, "updated_at": now}
+                    for task_id, rank in zip(moving, ranks)
+                ],
+            )
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to move tasks to list {list_id}: {e}")
+        raise
+
+    logger.info(f"Moved {len(moving)} tasks to list {list_id}")
+    for task_id in moving:
+        if previous[task_id] != list_id:
+            _publish(session, "task", "updated", task_id, list_id=previous[task_id])
+        _publish(session, "task", "updated", task_id, list_id=list_id)
+    return len(moving)
+
+
 # ============================================================================
 # Subtask Service Functions
 # ============================================================================
@@ -889,10 +1501,12 @@ def create_subtask(task_id: int, title: str, session: Session) -> Subtask:
             is_completed=False,
         )
         session.add(new_subtask)
+        _touch_task(task_id, session)
         session.commit()
         session.refresh(new_subtask)
 
         logger.info(f"Successfully created subtask with id: {new_subtask.id}, title: {title}")
+        _publish(session, "subtask", "created", new_subtask.id, task_id=task_id)  # type: ignore[arg-type]
         return new_subtask
     except IntegrityError as e:
         session.rollback()
@@ -962,10 +1576,12 @@ def toggle_subtask_complete(subtask_id: int, session: Session) -> Subtask:
 
     try:
         session.add(subtask_instance)
+        _touch_task(subtask_instance.task_id, session)
         session.commit()
         session.refresh(subtask_instance)
 
         logger.info(f"Successfully toggled completion status for subtask with id: {subtask_id}, is_completed: {old_status} -> {subtask_instance.is_completed}")
+        _publish(session, "subtask", "updated", subtask_id, task_id=subtask_instance.task_id)
         return subtask_instance
     except Exception as e:
         session.rollback()
@@ -991,13 +1607,872 @@ def delete_subtask(subtask_id: int, session: Session) -> bool:
         logger.warning(f"Cannot delete subtask: subtask with id {subtask_id} not found")
         return False
 
+    task_id = subtask_instance.task_id
     try:
         session.delete(subtask_instance)
+        _touch_task(task_id, session)
         session.commit()
 
         logger.info(f"Successfully deleted subtask with id: {subtask_id}")
+        _publish(session, "subtask", "deleted", subtask_id, task_id=task_id)
         return True
     except Exception as e:
         session.rollback()
         logger.error(f"Failed to delete subtask with id {subtask_id}: {e}")
         raise
+
+
+# ============================================================================
+# Badge Counter Service Functions
+# ============================================================================
+
+
+def rebuild_counters(session: Session) -> None:
+    """
+    Recompute the badge counter tables from the task and mydaytask tables.
+
+    The counters are normally maintained incrementally by SQLite triggers;
+    this is the recovery path for databases created before the triggers
+    existed or edited with the triggers disabled.
+
+    Args:
+        session: Database session
+    """
+    logger.info("Rebuilding badge counters")
+
+    try:
+        due_key = func.coalesce(cast(col(Task.due_date), String), "")
+        session.exec(delete(TaskCounter))
+        session.exec(
+            insert(TaskCounter).from_select(
+                ["list_id", "due_key", "open_count", "important_count"],
+                select(
+                    col(Task.list_id),
+                    due_key,
+                    func.count(),
+                    func.sum(case((col(Task.is_important) == True, 1), else_=0)),  # noqa: E712
+                )
+                .where(col(Task.is_completed) == False, col(Task.deleted_at).is_(None))  # noqa: E712
+                .group_by(col(Task.list_id), due_key),
+            )
+        )
+        session.exec(delete(MyDayCounter))
+        session.exec(
+            insert(MyDayCounter).from_select(
+                ["task_date", "open_count"],
+                select(
+                    col(MyDayTask.task_date),
+                    func.sum(case((and_(col(Task.is_completed) == False, col(Task.deleted_at).is_(None)), 1), else_=0)),  # noqa: E712
+                )
+                .join(Task, col(Task.id) == MyDayTask.task_id)
+                .group_by(col(MyDayTask.task_date)),
+            )
+        )
+        session.commit()
+
+        logger.info("Badge counters rebuilt")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to rebuild badge counters: {e}")
+        raise
+
+
+def get_badge_counts(today: date, session: Session) -> dict:
+    """
+    Get open, overdue and important counts for every list and system view.
+
+    On SQLite all counts come from the small trigger-maintained counter
+    tables in a single query, so the cost does not grow with the number of
+    tasks. Other databases have no counter triggers and aggregate the task
+    table directly.
+
+    Args:
+        today: Reference date for overdue and My Day counts
+        session: Database session
+
+    Returns:
+        dict: ``{"lists": {list_id: {"open", "overdue", "important"}},
+        "views": {"My Day", "Important", "Planned", "Tasks"}}``
+    """
+    logger.debug(f"Fetching badge counts for date: {today}")
+
+    try:
+        if is_sqlite(session.get_bind()):
+            has_due = col(TaskCounter.due_key) != ""
+            per_list = sa_select(
+                col(TaskCounter.list_id),
+                func.sum(TaskCounter.open_count),
+                func.sum(TaskCounter.important_count),
+                func.sum(case((and_(has_due, col(TaskCounter.due_key) < today.isoformat()), TaskCounter.open_count), else_=0)),
+                func.sum(case((has_due, TaskCounter.open_count), else_=0)),
+            ).group_by(col(TaskCounter.list_id))
+            my_day = sa_select(null(), col(MyDayCounter.open_count), literal(0), literal(0), literal(0)).where(
+                col(MyDayCounter.task_date) == today
+            )
+        else:
+            is_open = and_(col(Task.is_completed) == False, col(Task.deleted_at).is_(None))  # noqa: E712
+            per_list = (
+                sa_select(
+                    col(Task.list_id),
+                    func.count(),
+                    func.sum(case((col(Task.is_important) == True, 1), else_=0)),  # noqa: E712
+                    func.sum(case((col(Task.due_date) < today, 1), else_=0)),
+                    func.sum(case((col(Task.due_date).isnot(None), 1), else_=0)),
+                )
+                .where(is_open)
+                .group_by(col(Task.list_id))
+            )
+            my_day = (
+                sa_select(null(), func.count(), literal(0), literal(0), literal(0))
+                .select_from(MyDayTask)
+                .join(Task, col(Task.id) == MyDayTask.task_id)
+                .where(col(MyDayTask.task_date) == today, is_open)
+            )
+        # exec() takes no compound selects
+        rows = session.execute(union_all(per_list, my_day)).all()
+
+        lists: dict[int, dict[str, int]] = {}
+        views = {"My Day": 0, "Important": 0, "Planned": 0, "Tasks": 0}
+        for list_id, open_count, important, overdue, planned in rows:
+            if list_id is None:
+                views["My Day"] = open_count
+                continue
+            lists[list_id] = {"open": open_count, "overdue": overdue, "important": important}
+            views["Important"] += important
+            views["Planned"] += planned
+            views["Tasks"] += open_count
+
+        return {"lists": lists, "views": views}
+    except Exception as e:
+        logger.error(f"Failed to fetch badge counts: {e}")
+        raise
+
+
+# ============================================================================
+# My Day Suggestion Service Functions
+# ============================================================================
+
+
+def refresh_suggestions(today: date, session: Session) -> int:
+    """
+    Recompute all suggestion scores for a new day.
+
+    Writes are incremental, so this only runs at day rollover, when overdue
+    and due-today flags and yesterday's My Day change for every task.
+    Only rows whose score changed are updated.
+
+    Args:
+        today: Day to score for
+        session: Database session
+
+    Returns:
+        int: Number of tasks whose score changed
+    """
+    logger.info(f"Refreshing My Day suggestion scores for {today}")
+
+    try:
+        yesterday = today - timedelta(days=1)
+        rows = session.execute(
+            sa_select(col(Task.id), col(Task.due_date), col(Task.is_important), col(Task.updated_at), col(Task.suggestion_score), col(MyDayTask.task_id))
+            .outerjoin(MyDayTask, and_(col(MyDayTask.task_id) == Task.id, col(MyDayTask.task_date) == yesterday))
+            .where(col(Task.is_completed) == False, col(Task.deleted_at).is_(None))  # noqa: E712
+        ).all()
+
+        changes = []
+        for task_id, due_date, is_important, updated_at, old_score, yesterday_task_id in rows:
+            score = score_task(due_date, is_important, updated_at, yesterday_task_id is not None, today)
+            if score != old_score:
+                changes.append({"id": task_id, "suggestion_score": score})
+        if changes:
+            session.exec(update(Task), params=changes)
+
+        cleared = session.exec(
+            update(Task)
+            .where(or_(col(Task.is_completed) == True, col(Task.deleted_at).isnot(None)), col(Task.suggestion_score).isnot(None))  # noqa: E712
+            .values(suggestion_score=None)
+            .execution_options(synchronize_session=False)
+        )
+        session.merge(SuggestionState(id=1, scored_on=today))
+        session.commit()
+
+        logger.info(f"Updated {len(changes)} suggestion scores and cleared {cleared.rowcount} for {today}")
+        return len(changes) + cleared.rowcount
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to refresh suggestion scores: {e}")
+        raise
+
+
+def get_my_day_suggestions(today: date, session: Session, limit: int = 5) -> list[TaskRow]:
+    """
+    Get the best-scored open tasks that are not in today's My Day yet.
+
+    Scores are refreshed first if they were computed for another day;
+    otherwise this is a single query walking the suggestion_score index.
+
+    Args:
+        today: Current day
+        session: Database session
+        limit: Maximum number of suggestions
+
+    Returns:
+        list[TaskRow]: Suggested tasks, best first
+    """
+    logger.info(f"Fetching {limit} My Day suggestions for {today}")
+
+    try:
+        state = session.get(SuggestionState, 1)
+        if state is None or state.scored_on != today:
+            refresh_suggestions(today, session)
+
+        in_my_day = exists().where(col(MyDayTask.task_id) == Task.id, col(MyDayTask.task_date) == today)
+        statement = (
+            _select_task_rows()
+            .where(col(Task.suggestion_score).isnot(None), col(Task.is_completed) == False, col(Task.deleted_at).is_(None), ~in_my_day)  # noqa: E712
+            .order_by(col(Task.suggestion_score).desc())
+            .limit(limit)
+        )
+        tasks = _fetch_task_rows(statement, session)
+
+        logger.info(f"Found {len(tasks)} My Day suggestions")
+        return tasks
+    except Exception as e:
+        logger.error(f"Failed to fetch My Day suggestions: {e}")
+        raise
+
+
+# ============================================================================
+# Ordering Service Functions
+# ============================================================================
+
+
+def move_task(task_id: int, before_id: int | None, after_id: int | None, session: Session) -> Task:
+    """
+    Move a task between two neighbours, rewriting only the moved task's rank.
+
+    The neighbours define the target list, so dropping a task between tasks
+    of another list also moves it there. If both are None, the task moves to
+    the end of its list. When the new key gets longer than
+    RANK_REBALANCE_LENGTH, the list is respaced in the background.
+
+    Args:
+        task_id: ID of the task to move
+        before_id: ID of the task that will be directly above it, or None for the top
+        after_id: ID of the task that will be directly below it, or None for the bottom
+        session: Database session
+
+    Returns:
+        Task: The moved task
+
+    Raises:
+        ValueError: If a task is not found, a neighbour is the task itself, or the neighbours are in different lists or out of order
+    """
+    logger.info(f"Moving task {task_id} between {before_id} and {after_id}")
+
+    if task_id in (before_id, after_id) or (before_id is not None and before_id == after_id):
+        logger.error(f"Cannot move task {task_id}: invalid neighbours {before_id} and {after_id}")
+        raise ValueError("A task cannot be moved next to itself")
+
+    task_instance = get_task_by_id(task_id, session)
+    if not task_instance:
+        logger.error(f"Cannot move task: task with id {task_id} not found")
+        raise ValueError(f"Task with id {task_id} not found")
+
+    neighbours = {}
+    for neighbour_id in (before_id, after_id):
+        if neighbour_id is None:
+            continue
+        row = session.exec(
+            select(Task.list_id, Task.rank).where(col(Task.id) == neighbour_id, col(Task.deleted_at).is_(None))
+        ).first()
+        if row is None:
+            logger.error(f"Cannot move task: neighbour task with id {neighbour_id} not found")
+            raise ValueError(f"Task with id {neighbour_id} not found")
+        neighbours[neighbour_id] = row
+
+    list_ids = {list_id for list_id, _ in neighbours.values()}
+    if len(list_ids) > 1:
+        logger.error(f"Cannot move task {task_id}: neighbours {before_id} and {after_id} are in different lists")
+        raise ValueError("Neighbour tasks are in different lists")
+    previous_list_id = task_instance.list_id
+    list_id = list_ids.pop() if list_ids else previous_list_id
+
+    if before_id is None and after_id is None:
+        rank = rank_between(_last_task_rank(list_id, session), None)
+    else:
+        rank = rank_between(
+            neighbours[before_id][1] if before_id is not None else None,
+            neighbours[after_id][1] if after_id is not None else None,
+        )
+
+    try:
+        session.exec(
+            update(Task)
+            .where(col(Task.id) == task_id)
+            .values(rank=rank, list_id=list_id, updated_at=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+        session.refresh(task_instance)
+
+        logger.info(f"Successfully moved task {task_id} to rank {rank} in list {list_id}")
+        if previous_list_id != list_id:
+            # a move also changes the list it left
+            _publish(session, "task", "updated", task_id, list_id=previous_list_id)
+        _publish(session, "task", "updated", task_id, list_id=list_id)
+        if len(rank) > RANK_REBALANCE_LENGTH:
+            _schedule_rebalance(session, list_id=list_id)
+        return task_instance
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to move task {task_id}: {e}")
+        raise
+
+
+def move_my_day_task(task_id: int, task_date: date, before_id: int | None, after_id: int | None, session: Session) -> MyDayTask:
+    """
+    Move a task within one day's My Day, rewriting only its My Day rank.
+
+    Args:
+        task_id: ID of the task to move
+        task_date: My Day date
+        before_id: ID of the task that will be directly above it, or None for the top
+        after_id: ID of the task that will be directly below it, or None for the bottom
+        session: Database session
+
+    Returns:
+        MyDayTask: The moved My Day entry
+
+    Raises:
+        ValueError: If a task is not in My Day for this date, a neighbour is the task itself, or the neighbours are out of order
+    """
+    logger.info(f"Moving task {task_id} in My Day {task_date} between {before_id} and {after_id}")
+
+    if task_id in (before_id, after_id) or (before_id is not None and before_id == after_id):
+        logger.error(f"Cannot move task {task_id} in My Day: invalid neighbours {before_id} and {after_id}")
+        raise ValueError("A task cannot be moved next to itself")
+
+    entries: dict[int, MyDayTask] = {}
+    for entry_id in (task_id, before_id, after_id):
+        if entry_id is None:
+            continue
+        entry = session.get(MyDayTask, (entry_id, task_date))
+        if entry is None:
+            logger.error(f"Cannot move in My Day: task {entry_id} not in My Day for {task_date}")
+            raise ValueError(f"Task with id {entry_id} not in My Day for {task_date}")
+        entries[entry_id] = entry
+
+    if before_id is None and after_id is None:
+        rank = rank_between(_last_my_day_rank(task_date, session), None)
+    else:
+        rank = rank_between(
+            entries[before_id].rank if before_id is not None else None,
+            entries[after_id].rank if after_id is not None else None,
+        )
+
+    try:
+        entry = entries[task_id]
+        entry.rank = rank
+        session.add(entry)
+        session.commit()
+        session.refresh(entry)
+
+        logger.info(f"Successfully moved task {task_id} in My Day {task_date} to rank {rank}")
+        _publish(session, "my_day", "updated", task_id, task_id=task_id)
+        if len(rank) > RANK_REBALANCE_LENGTH:
+            _schedule_rebalance(session, task_date=task_date)
+        return entry
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to move task {task_id} in My Day {task_date}: {e}")
+        raise
+
+
+def rebalance_ranks(session: Session, max_length: int = RANK_REBALANCE_LENGTH, deadline: float | None = None) -> int:
+    """
+    Respace every list and My Day date with missing or overlong rank keys.
+
+    Runs at bootstrap to give existing rows a rank, and can be run as a
+    maintenance pass. Each list or date is respaced in its own transaction;
+    groups left when the deadline passes are picked up by the next pass.
+
+    Args:
+        session: Database session
+        max_length: Respace groups holding a key longer than this
+        deadline: time.monotonic() value after which no further group is started
+
+    Returns:
+        int: Number of rows whose rank was rewritten
+    """
+    logger.info(f"Rebalancing ranks longer than {max_length}")
+
+    def needs_respace(rank):
+        return func.sum(case((rank.is_(None), 1), (func.length(rank) > max_length, 1), else_=0)) > 0
+
+    try:
+        list_ids = session.exec(
+            select(Task.list_id)
+            .where(col(Task.deleted_at).is_(None))
+            .group_by(col(Task.list_id))
+            .having(needs_respace(col(Task.rank)))
+        ).all()
+        dates = session.exec(
+            select(col(MyDayTask.task_date)).group_by(col(MyDayTask.task_date)).having(needs_respace(col(MyDayTask.rank)))
+        ).all()
+
+        groups = [partial(_respace_list, list_id) for list_id in list_ids]
+        groups += [partial(_respace_my_day, task_date) for task_date in dates]
+        rewritten = 0
+        for index, respace in enumerate(groups):
+            if _deadline_passed(deadline):
+                logger.info(f"Rebalancing stopped at its deadline with {len(groups) - index} groups left")
+                break
+            rewritten += respace(session)
+            session.commit()
+
+        logger.info(f"Rebalanced {len(list_ids)} lists and {len(dates)} My Day dates ({rewritten} rows)")
+        return rewritten
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to rebalance ranks: {e}")
+        raise
+
+
+# ============================================================================
+# Trash Service Functions
+# ============================================================================
+
+
+def get_trash(session: Session) -> dict:
+    """
+    Get the contents of the Trash, most recently deleted first.
+
+    Tasks trashed together with their list are only listed under the list.
+    Both queries walk the partial deleted_at indexes, which hold trashed rows only.
+
+    Args:
+        session: Database session
+
+    Returns:
+        dict: ``{"lists": [TodoList], "tasks": [TaskRow]}``
+    """
+    logger.info("Fetching trash")
+
+    try:
+        lists = session.exec(
+            select(TodoList).where(col(TodoList.deleted_at).isnot(None)).order_by(col(TodoList.deleted_at).desc())
+        ).all()
+        trashed_with_list = exists().where(col(TodoList.id) == Task.list_id, col(TodoList.deleted_at) == Task.deleted_at)
+        tasks = _fetch_task_rows(
+            _select_task_rows().where(col(Task.deleted_at).isnot(None), ~trashed_with_list).order_by(col(Task.deleted_at).desc()),
+            session,
+        )
+
+        logger.info(f"Found {len(lists)} lists and {len(tasks)} tasks in the trash")
+        return {"lists": list(lists), "tasks": tasks}
+    except Exception as e:
+        logger.error(f"Failed to fetch trash: {e}")
+        raise
+
+
+def restore_task(task_id: int, session: Session) -> Task:
+    """
+    Restore a task from the Trash, with its subtasks and My Day entries.
+
+    Args:
+        task_id: ID of the trashed task
+        session: Database session
+
+    Returns:
+        Task: The restored task
+
+    Raises:
+        ValueError: If the task is not in the Trash or its list is
+    """
+    logger.info(f"Restoring task with id: {task_id}")
+
+    task_instance = session.exec(select(Task).where(col(Task.id) == task_id, col(Task.deleted_at).isnot(None))).first()
+    if not task_instance:
+        logger.error(f"Cannot restore task: task with id {task_id} not in the trash")
+        raise ValueError(f"Task with id {task_id} not in the trash")
+    if get_list_by_id(task_instance.list_id, session) is None:
+        logger.error(f"Cannot restore task {task_id}: its list {task_instance.list_id} is in the trash")
+        raise ValueError("Restore the task's list first")
+
+    task_instance.deleted_at = None
+    task_instance.updated_at = datetime.now()
+
+    try:
+        _refresh_task_score(task_instance, session)
+        session.add(task_instance)
+        session.commit()
+        session.refresh(task_instance)
+
+        logger.info(f"Successfully restored task with id: {task_id}")
+        _publish(session, "task", "created", task_id, list_id=task_instance.list_id)
+        return task_instance
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to restore task with id {task_id}: {e}")
+        raise
+
+
+def restore_list(list_id: int, session: Session) -> TodoList:
+    """
+    Restore a list from the Trash, with the tasks that were trashed along with it.
+
+    Tasks deleted individually before the list stay in the Trash. The
+    restored tasks are rescored for My Day suggestions; other scores are
+    left alone.
+
+    Args:
+        list_id: ID of the trashed list
+        session: Database session
+
+    Returns:
+        TodoList: The restored list
+
+    Raises:
+        ValueError: If the list is not in the Trash
+    """
+    logger.info(f"Restoring list with id: {list_id}")
+
+    list_instance = session.exec(
+        select(TodoList).where(col(TodoList.id) == list_id, col(TodoList.deleted_at).isnot(None))
+    ).first()
+    if not list_instance:
+        logger.error(f"Cannot restore list: list with id {list_id} not in the trash")
+        raise ValueError(f"List with id {list_id} not in the trash")
+
+    try:
+        now = datetime.now()
+        today = now.date()
+        rows = session.execute(
+            sa_select(col(Task.id), col(Task.due_date), col(Task.is_important), col(Task.is_completed), col(MyDayTask.task_id))
+            .outerjoin(MyDayTask, and_(col(MyDayTask.task_id) == Task.id, col(MyDayTask.task_date) == today - timedelta(days=1)))
+            .where(col(Task.list_id) == list_id, col(Task.deleted_at) == list_instance.deleted_at)
+        ).all()
+        if rows:
+            # trashed tasks lost their score; only the restored ones need one again
+            session.exec(
+                update(Task),
+                params=[
+                    {
+                        "id": task_id,
+                        "deleted_at": None,
+                        "updated_at": now,
+                        "suggestion_score": None
+                        if is_completed
+                        else score_task(due_date, is_important, now, yesterday_task_id is not None, today),
+                    }
+                    for task_id, due_date, is_important, is_completed, yesterday_task_id in rows
+                ],
+            )
+        list_instance.deleted_at = None
+        session.add(list_instance)
+        session.commit()
+        session.refresh(list_instance)
+
+        logger.info(f"Successfully restored list with id: {list_id} and {len(rows)} tasks")
+        _publish(session, "list", "created", list_id, list_id=list_id)
+        return list_instance
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to restore list with id {list_id}: {e}")
+        raise
+
+
+def purge_trash(older_than: datetime, session: Session, batch_size: int = 500, deadline: float | None = None) -> dict[str, int]:
+    """
+    Permanently delete rows that have been in the Trash since before a cutoff.
+
+    Rows are removed in batches of at most batch_size tasks, each in its own
+    short transaction, so writers are never locked out for long. Lists are
+    removed once none of their tasks are left.
+
+    Args:
+        older_than: Purge rows trashed before this time
+        session: Database session
+        batch_size: Maximum number of tasks deleted per transaction
+        deadline: time.monotonic() value after which no further batch is started
+
+    Returns:
+        dict[str, int]: Number of purged lists and tasks
+    """
+    logger.info(f"Purging trash older than {older_than}")
+
+    purged = {"list": 0, "task": 0}
+    try:
+        while True:
+            task_ids = session.exec(
+                select(Task.id).where(col(Task.deleted_at) < older_than).limit(batch_size)
+            ).all()
+            if not task_ids:
+                break
+            _delete_task_children(task_ids, session)
+            purged["task"] += session.exec(
+                delete(Task).where(col(Task.id).in_(task_ids)).execution_options(synchronize_session=False)
+            ).rowcount
+            session.commit()
+            if _deadline_passed(deadline):
+                logger.info("Trash purge stopped at its deadline")
+                break
+
+        purged["list"] = session.exec(
+            delete(TodoList)
+            .where(col(TodoList.deleted_at) < older_than, ~exists().where(col(Task.list_id) == TodoList.id))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        session.commit()
+
+        logger.info(f"Purged {purged['list']} lists and {purged['task']} tasks from the trash")
+        return purged
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to purge trash: {e}")
+        raise
+
+
+# ============================================================================
+# Archive Service Functions
+# ============================================================================
+
+
+def archive_completed_tasks(older_than: datetime, session: Session, batch_size: int = 500, deadline: float | None = None) -> int:
+    """
+    Move tasks completed before a cutoff, with their subtasks, to the archive tables.
+
+    A task counts as completed at its last update. Tasks that still have
+    My Day entries stay until compact_my_day has folded those days into
+    their summaries, so archiving never loses My Day history. Each batch of
+    at most batch_size tasks is moved in its own transaction, so the hot
+    table only ever holds recent and open work.
+
+    Args:
+        older_than: Archive tasks completed before this time
+        session: Database session
+        batch_size: Maximum number of tasks moved per transaction
+        deadline: time.monotonic() value after which no further batch is started
+
+    Returns:
+        int: Number of archived tasks
+    """
+    logger.info(f"Archiving tasks completed before {older_than}")
+
+    in_my_day = exists().where(col(MyDayTask.task_id) == Task.id)
+    archived = 0
+    try:
+        while True:
+            rows = session.exec(
+                select(Task.id, Task.list_id)
+                .where(
+                    col(Task.is_completed) == True,  # noqa: E712
+                    col(Task.deleted_at).is_(None),
+                    col(Task.updated_at) < older_than,
+                    ~in_my_day,
+                )
+                .order_by(col(Task.updated_at))
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            task_ids = [task_id for task_id, _ in rows]
+            archived_at = datetime.now()
+
+            session.exec(
+                insert(ArchivedTask).from_select(
+                    [
+                        "task_id", "list_id", "title", "description", "due_date", "is_completed",
+                        "is_important", "recurrence", "rank", "created_at", "updated_at", "archived_at",
+                    ],
+                    sa_select(
+                        col(Task.id), col(Task.list_id), col(Task.title), col(Task.description), col(Task.due_date),
+                        col(Task.is_completed), col(Task.is_important), col(Task.recurrence), col(Task.rank),
+                        col(Task.created_at), col(Task.updated_at), literal(archived_at),
+                    ).where(col(Task.id).in_(task_ids)),
+                )
+            )
+            # a task id is unique within one batch, so (task_id, archived_at) finds its archive row
+            session.exec(
+                insert(ArchivedSubtask).from_select(
+                    ["task_id", "title", "is_completed", "created_at"],
+                    select(ArchivedTask.id, Subtask.title, Subtask.is_completed, Subtask.created_at)
+                    .join(
+                        ArchivedTask,
+                        and_(col(ArchivedTask.task_id) == Subtask.task_id, col(ArchivedTask.archived_at) == archived_at),
+                    )
+                    .where(col(Subtask.task_id).in_(task_ids)),
+                )
+            )
+            _delete_task_children(task_ids, session)
+            session.exec(delete(Task).where(col(Task.id).in_(task_ids)).execution_options(synchronize_session=False))
+            session.commit()
+
+            archived += len(task_ids)
+            for task_id, list_id in rows:
+                _publish(session, "task", "deleted", task_id, list_id=list_id)  # type: ignore[arg-type]
+            if _deadline_passed(deadline):
+                logger.info("Archiving stopped at its deadline")
+                break
+
+        logger.info(f"Archived {archived} completed tasks")
+        return archived
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to archive completed tasks: {e}")
+        raise
+
+
+def unarchive_task(archived_id: int, session: Session) -> Task:
+    """
+    Move an archived task and its subtasks back to the hot tables.
+
+    The task gets a new id and goes to the end of its list.
+
+    Args:
+        archived_id: ID of the archived task (TaskRow.id of a row with is_archived set)
+        session: Database session
+
+    Returns:
+        Task: The restored task
+
+    Raises:
+        ValueError: If the archived task is not found or its list is in the Trash
+    """
+    logger.info(f"Unarchiving archived task with id: {archived_id}")
+
+    archived_task = session.get(ArchivedTask, archived_id)
+    if not archived_task:
+        logger.error(f"Cannot unarchive task: archived task with id {archived_id} not found")
+        raise ValueError(f"Archived task with id {archived_id} not found")
+    if get_list_by_id(archived_task.list_id, session) is None:
+        logger.error(f"Cannot unarchive task {archived_id}: list {archived_task.list_id} not found")
+        raise ValueError(f"List with id {archived_task.list_id} not found")
+
+    try:
+        task_instance = Task(
+            list_id=archived_task.list_id,
+            title=archived_task.title,
+            description=archived_task.description,
+            due_date=archived_task.due_date,
+            is_completed=archived_task.is_completed,
+            is_important=archived_task.is_important,
+            recurrence=archived_task.recurrence,
+            rank=rank_between(_last_task_rank(archived_task.list_id, session), None),
+            created_at=archived_task.created_at,
+        )
+        _refresh_task_score(task_instance, session)
+        session.add(task_instance)
+        session.flush()
+        session.exec(
+            insert(Subtask).from_select(
+                ["task_id", "title", "is_completed", "created_at"],
+                select(
+                    literal(task_instance.id), ArchivedSubtask.title, ArchivedSubtask.is_completed, ArchivedSubtask.created_at
+                ).where(ArchivedSubtask.task_id == archived_id),
+            )
+        )
+        session.exec(
+            delete(ArchivedSubtask)
+            .where(col(ArchivedSubtask.task_id) == archived_id)
+            .execution_options(synchronize_session=False)
+        )
+        session.delete(archived_task)
+        session.commit()
+        session.refresh(task_instance)
+
+        logger.info(f"Successfully unarchived task {archived_id} as task {task_instance.id}")
+        _publish(session, "task", "created", task_instance.id, list_id=task_instance.list_id)  # type: ignore[arg-type]
+        return task_instance
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to unarchive task with id {archived_id}: {e}")
+        raise
+
+
+# ============================================================================
+# My Day History Service Functions
+# ============================================================================
+
+
+def compact_my_day(before: date, session: Session, batch_days: int = 30, deadline: float | None = None) -> int:
+    """
+    Replace the My Day entries of days before a cutoff with per-day summaries.
+
+    Each day is reduced to a MyDaySummary row counting its planned and
+    completed tasks, merged into any summary the day already has, and its
+    raw entries are deleted. At most batch_days days are compacted per
+    transaction. Entries of trashed tasks are dropped without being counted.
+
+    Args:
+        before: Compact days before this date; must be yesterday or earlier,
+            which suggestion scoring still reads
+        session: Database session
+        batch_days: Maximum number of days compacted per transaction
+        deadline: time.monotonic() value after which no further batch is started
+
+    Returns:
+        int: Number of deleted My Day entries
+
+    Raises:
+        ValueError: If before is later than yesterday
+    """
+    logger.info(f"Compacting My Day entries before {before}")
+
+    if before > date.today() - timedelta(days=1):
+        logger.error(f"Cannot compact My Day entries before {before}: yesterday must be kept")
+        raise ValueError("My Day entries from yesterday onwards cannot be compacted")
+
+    compacted = 0
+    try:
+        while True:
+            days = session.exec(
+                select(col(MyDayTask.task_date))
+                .where(col(MyDayTask.task_date) < before)
+                .group_by(col(MyDayTask.task_date))
+                .order_by(col(MyDayTask.task_date))
+                .limit(batch_days)
+            ).all()
+            if not days:
+                break
+
+            totals = session.exec(
+                select(
+                    col(MyDayTask.task_date),
+                    func.count(),
+                    func.sum(case((col(Task.is_completed) == True, 1), else_=0)),  # noqa: E712
+                )
+                .join(Task, col(Task.id) == MyDayTask.task_id)
+                .where(col(MyDayTask.task_date).in_(days), col(Task.deleted_at).is_(None))
+                .group_by(col(MyDayTask.task_date))
+            ).all()
+            for task_date, planned, completed in totals:
+                summary = session.get(MyDaySummary, task_date) or MyDaySummary(task_date=task_date)
+                summary.planned += planned
+                summary.completed += completed
+                session.add(summary)
+
+            compacted += session.exec(
+                delete(MyDayTask).where(col(MyDayTask.task_date).in_(days)).execution_options(synchronize_session=False)
+            ).rowcount
+            session.exec(
+                delete(MyDayCounter)
+                .where(col(MyDayCounter.task_date).in_(days))
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+            if _deadline_passed(deadline):
+                logger.info("My Day compaction stopped at its deadline")
+                break
+
+        logger.info(f"Compacted {compacted} My Day entries")
+        return compacted
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to compact My Day entries: {e}")
+        raise
+
+
+
+# every public service function records calls, errors, latency and rows (see vibe_todo.metrics)
+instrument_module(globals())
@@ -1,5 +1,67 @@
+import os
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Iterator, Optional, Set
+
 import streamlit as st
-from typing import Set, Dict, Optional, Any
+
+# Entries kept per namespaced session store before the least recently used are evicted
+SESSION_STORE_MAX_ENTRIES = int(os.getenv("SESSION_STORE_MAX_ENTRIES", "200"))
+
+# Widget and flag keys created per task card, as "<prefix>_<task id>"
+TASK_KEY_PATTERN = re.compile(
+    r"^(?:complete|important|move_\w+|rm_my_day|delete|confirm_del_btn|cancel_del_btn|unarchive"
+    r"|add_suggestion|add_to_my_day|restore_task)_(\d+)$"
+)
+
+
+class LRUStore:
+    """A small mapping that keeps at most max_size entries, evicting the least recently used."""
+
+    def __init__(self, max_size: int = SESSION_STORE_MAX_ENTRIES):
+        self.max_size = max_size
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value for key, marking it as recently used."""
+        if key not in self._data:
+            return default
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def __setitem__(self, key: Hashable, value: Any):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value."""
+        return self._data.pop(key, default)
+
+    def retain(self, keys: Iterable[Hashable]):
+        """Drop every entry whose key is not in keys."""
+        keep = set(keys)
+        for key in [key for key in self._data if key not in keep]:
+            del self._data[key]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def get_store(namespace: str, max_size: int = SESSION_STORE_MAX_ENTRIES) -> LRUStore:
+    """Get this session's store for namespace, creating it on first use."""
+    stores: Dict[str, LRUStore] = st.session_state.setdefault("ui_stores", {})
+    if namespace not in stores:
+        stores[namespace] = LRUStore(max_size)
+    return stores[namespace]
+
 
 def init_session_state():
     """Initialize session state variables if they don't exist."""
@@ -9,10 +71,10 @@ def init_session_state():
         st.session_state.selected_list_id = None
     if "task_filters" not in st.session_state:
         st.session_state.task_filters = {}
-    if "expanded_tasks" not in st.session_state:
-        st.session_state.expanded_tasks = set()
     if "show_add_list_dialog" not in st.session_state:
         st.session_state.show_add_list_dialog = False
+    # tasks rendered by this run, see sweep_task_keys
+    st.session_state.rendered_tasks = set()
 
 def get_current_view() -> str:
     """Get the current view name."""
@@ -29,14 +91,49 @@ def get_selected_list_id() -> Optional[int]:
 
 def toggle_task_expansion(task_id: int):
     """Toggle the expansion state of a task."""
-    if task_id in st.session_state.expanded_tasks:
-        st.session_state.expanded_tasks.remove(task_id)
-    else:
-        st.session_state.expanded_tasks.add(task_id)
+    expanded = get_store("expanded_tasks")
+    if expanded.pop(task_id) is None:
+        expanded[task_id] = True
 
 def is_task_expanded(task_id: int) -> bool:
     """Check if a task is expanded."""
-    return task_id in st.session_state.expanded_tasks
+    return get_store("expanded_tasks").get(task_id, False)
+
+def is_delete_pending(task_id: int) -> bool:
+    """Check if deleting a task awaits confirmation."""
+    return get_store("confirm_delete").get(task_id, False)
+
+def set_delete_pending(task_id: int, pending: bool):
+    """Ask for, or withdraw, confirmation before deleting a task."""
+    if pending:
+        get_store("confirm_delete")[task_id] = True
+    else:
+        get_store("confirm_delete").pop(task_id)
+
+def mark_task_rendered(task_id: int):
+    """Record that this run shows widgets for a task."""
+    st.session_state.setdefault("rendered_tasks", set()).add(task_id)
+
+def sweep_task_keys() -> int:
+    """
+    Drop per-task state for tasks the finished run did not render.
+
+    Removes widget keys matching TASK_KEY_PATTERN and pending delete
+    confirmations, so long sessions over large or changing lists do not
+    accumulate state for every card ever shown.
+
+    Returns:
+        The number of session_state keys removed
+    """
+    rendered: Set[int] = st.session_state.get("rendered_tasks", set())
+    stale = [
+        key for key in list(st.session_state.keys())
+        if (match := TASK_KEY_PATTERN.match(str(key))) and int(match.group(1)) not in rendered
+    ]
+    for key in stale:
+        del st.session_state[key]
+    get_store("confirm_delete").retain(rendered)
+    return len(stale)
 
 def set_task_filter(key: str, value: Any):
     """Set a task filter value."""
@@ -0,0 +1,194 @@
+"""Per-tenant SQLite sharding backed by a bounded LRU pool of engines.
+
+Each tenant gets its own SQLite file under ``data/tenants/``, so tenants no
+longer contend on one file lock. Engines are created and bootstrapped
+lazily on first use, and the least recently used or idle ones are disposed
+to bound open file handles and memory.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import Engine
+
+from vibe_todo.database import DATABASE_URL, bootstrap, create_database_engine, get_engine
+from vibe_todo.invalidation import close_watcher
+from vibe_todo.logger import logger
+from vibe_todo.maintenance import start_maintenance, stop_maintenance
+from vibe_todo.metrics import CACHE_LOOKUPS, CACHE_MISSES
+from vibe_todo.scheduler import stop_reminders
+
+# Directory holding one SQLite file per tenant
+TENANT_DATA_DIR = os.getenv("TENANT_DATA_DIR", "data/tenants")
+
+# Maximum number of tenant engines kept open at once
+TENANT_POOL_SIZE = int(os.getenv("TENANT_POOL_SIZE", "32"))
+
+# Seconds after which an unused tenant engine is disposed
+TENANT_IDLE_SECONDS = float(os.getenv("TENANT_IDLE_SECONDS", "600"))
+
+# Query parameter and header that select a tenant in the app and the HTTP API
+TENANT_QUERY_PARAM = "tenant"
+TENANT_HEADER = "X-Tenant-ID"
+
+_TENANT_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+# Tenants moved off their SQLite shard, e.g. heavy tenants on a server database
+_tenant_database_urls: dict[str, str] = {}
+
+
+def validate_tenant_id(tenant_id: str) -> str:
+    """
+    Validate a tenant id so it can be used safely as a file name.
+
+    Args:
+        tenant_id: Tenant identifier
+
+    Returns:
+        str: The tenant id, unchanged
+
+    Raises:
+        ValueError: If the id is empty, too long or contains other characters than letters, digits, '-' and '_'
+    """
+    if not tenant_id or not _TENANT_ID_PATTERN.match(tenant_id):
+        raise ValueError(f"Invalid tenant id: {tenant_id!r}")
+    return tenant_id
+
+
+def tenant_database_url(tenant_id: str | None) -> str:
+    """
+    Map a tenant to its database URL.
+
+    Args:
+        tenant_id: Tenant identifier, or None for the default single-tenant database
+
+    Returns:
+        str: SQLAlchemy database URL for the tenant
+    """
+    if tenant_id is None:
+        return DATABASE_URL
+    validate_tenant_id(tenant_id)
+    return _tenant_database_urls.get(tenant_id, f"sqlite:///{TENANT_DATA_DIR}/{tenant_id}.db")
+
+
+def set_tenant_database_url(tenant_id: str, database_url: str) -> None:
+    """
+    Point a tenant at its own database URL instead of its SQLite shard.
+
+    Args:
+        tenant_id: Tenant identifier
+        database_url: SQLAlchemy database URL, e.g. a PostgreSQL database
+    """
+    _tenant_database_urls[validate_tenant_id(tenant_id)] = database_url
+
+
+def _release(engine: Engine) -> None:
+    """Stop an engine's background work and dispose it."""
+    stop_maintenance(engine)
+    stop_reminders(engine)
+    close_watcher(engine)
+    engine.dispose()
+
+
+class EnginePool:
+    """
+    Bounded LRU pool of bootstrapped engines keyed by database URL.
+
+    Example:
+        pool = EnginePool(max_size=16, idle_seconds=300)
+        engine = pool.get_engine("acme")
+    """
+
+    def __init__(self, max_size: int = TENANT_POOL_SIZE, idle_seconds: float = TENANT_IDLE_SECONDS):
+        if max_size < 1:
+            raise ValueError("Engine pool size must be at least 1")
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self._engines: OrderedDict[str, tuple[Engine, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+    def __contains__(self, tenant_id: object) -> bool:
+        return isinstance(tenant_id, str | None) and tenant_database_url(tenant_id) in self._engines
+
+    def get_engine(self, tenant_id: str | None) -> Engine:
+        """
+        Get the engine for a tenant, creating and bootstrapping it on first use.
+
+        Args:
+            tenant_id: Tenant identifier, or None for the default database
+
+        Returns:
+            Engine: Bootstrapped engine for the tenant's database
+        """
+        if tenant_id is None:
+            # the default database keeps the shared singleton engine, outside the LRU
+            engine = bootstrap(get_engine())
+            start_maintenance(engine)
+            return engine
+
+        url = tenant_database_url(tenant_id)
+        now = time.monotonic()
+
+        CACHE_LOOKUPS.labels("tenant_engines").inc()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._engines.get(url)
+            if entry is not None:
+                engine = entry[0]
+                self._engines[url] = (engine, now)
+                self._engines.move_to_end(url)
+            else:
+                CACHE_MISSES.labels("tenant_engines").inc()
+                engine = create_database_engine(url)
+                self._engines[url] = (engine, now)
+            while len(self._engines) > self.max_size:
+                evicted_url, (evicted, _) = self._engines.popitem(last=False)
+                _release(evicted)
+                logger.info(f"Evicted least recently used engine: {evicted_url}")
+
+        # Guarded per URL: a no-op once done, and waits while another thread bootstraps
+        bootstrap(engine)
+        start_maintenance(engine)
+        return engine
+
+    def _evict_idle(self, now: float) -> None:
+        """Dispose engines unused for longer than idle_seconds (caller holds the lock)."""
+        while self._engines:
+            url, (engine, last_used) = next(iter(self._engines.items()))
+            if now - last_used < self.idle_seconds:
+                break
+            del self._engines[url]
+            _release(engine)
+            logger.info(f"Evicted idle engine: {url}")
+
+    def dispose_all(self) -> None:
+        """Dispose every pooled engine."""
+        with self._lock:
+            for engine, _ in self._engines.values():
+                _release(engine)
+            self._engines.clear()
+
+
+# Process-wide pool shared by all entry points
+_pool: EnginePool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_engine_pool() -> EnginePool:
+    """
+    Get the process-wide tenant engine pool.
+
+    Returns:
+        EnginePool: Shared engine pool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = EnginePool()
+        return _pool
@@ -0,0 +1,112 @@
+import unittest
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import update
+from sqlmodel import Session, col
+
+from vibe_todo.analytics import TaskSnapshot
+from vibe_todo.models import Task
+from vibe_todo.services import (
+    add_to_my_day,
+    archive_completed_tasks,
+    compact_my_day,
+    create_list,
+    create_subtask,
+    create_task,
+    delete_task,
+    remove_from_my_day,
+    toggle_complete,
+    toggle_subtask_complete,
+)
+from vibe_todo.tests.test_services import make_engine, not_none
+
+
+class TestTaskSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.engine = make_engine()
+        self.session = Session(self.engine)
+        self.today = date.today()
+        self.work = not_none(create_list("Work", self.session).id)
+        self.home = not_none(create_list("Home", self.session).id)
+        self.late = not_none(create_task(self.work, "Late", self.session, due_date=self.today - timedelta(days=2)).id)
+        self.soon = not_none(create_task(self.work, "Soon", self.session, due_date=self.today + timedelta(days=1)).id)
+        self.done = not_none(create_task(self.home, "Done", self.session, is_completed=True).id)
+        self.subtask = not_none(create_subtask(self.late, "Step", self.session).id)
+        add_to_my_day(self.late, self.today, self.session)
+        add_to_my_day(self.done, self.today, self.session)
+        self.snapshot = TaskSnapshot(self.engine)
+        self.snapshot.refresh()
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def test_aggregates(self):
+        rates = self.snapshot.completion_rate_by_list()
+        self.assertEqual(rates[self.work], {"total": 2, "completed": 0, "rate": 0.0})
+        self.assertEqual(rates[self.home], {"total": 1, "completed": 1, "rate": 1.0})
+
+        self.assertEqual(self.snapshot.overdue_count(self.today), 1)
+
+        histogram = self.snapshot.due_date_histogram(self.today, self.today + timedelta(days=2))
+        self.assertEqual(list(histogram.values()), [0, 1, 0])
+
+        adherence = self.snapshot.my_day_adherence(self.today, self.today)
+        self.assertEqual(adherence[self.today], {"planned": 2, "completed": 1, "rate": 0.5})
+
+        self.assertEqual(self.snapshot.subtask_progress(), {"total": 1, "completed": 0, "rate": 0.0})
+
+    def test_incremental_refresh(self):
+        toggle_complete(self.late, self.session)
+        toggle_subtask_complete(self.subtask, self.session)
+        delete_task(self.soon, self.session)
+        create_task(self.home, "New", self.session)
+
+        self.snapshot.refresh()
+
+        self.assertEqual(len(self.snapshot.tasks["id"]), 3)
+        self.assertEqual(self.snapshot.overdue_count(self.today), 0)
+        self.assertEqual(self.snapshot.completion_rate_by_list()[self.work]["completed"], 1)
+        self.assertEqual(self.snapshot.subtask_progress()["completed"], 1)
+        self.assertEqual(self.snapshot.my_day_adherence(self.today, self.today)[self.today]["rate"], 1.0)
+
+    def test_late_commit_behind_the_watermark(self):
+        # another writer stamped this change before the snapshot's newest row but committed it after the refresh
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(Task)
+                .where(col(Task.id) == self.soon)
+                .values(is_completed=True, updated_at=not_none(self.snapshot.watermark) - timedelta(seconds=1))
+            )
+
+        self.snapshot.refresh()
+
+        self.assertEqual(self.snapshot.completion_rate_by_list()[self.work]["completed"], 1)
+        self.assertEqual(len(self.snapshot.tasks["id"]), 3)
+
+    def test_archived_tasks_still_count(self):
+        toggle_complete(self.late, self.session)
+        remove_from_my_day(self.late, self.today, self.session)
+        remove_from_my_day(self.done, self.today, self.session)
+        archive_completed_tasks(datetime.now() + timedelta(seconds=1), self.session)
+        fresh = TaskSnapshot(self.engine)
+
+        for snapshot in (self.snapshot, fresh):
+            snapshot.refresh()
+            self.assertEqual(snapshot.completion_rate_by_list()[self.work], {"total": 2, "completed": 1, "rate": 0.5})
+            self.assertEqual(snapshot.subtask_progress()["total"], 1)
+        self.assertEqual(sorted(fresh.tasks["id"] < 0), [False, True, True])
+
+    def test_compacted_days_keep_their_adherence(self):
+        past = self.today - timedelta(days=10)
+        add_to_my_day(self.late, past, self.session)
+        add_to_my_day(self.done, past, self.session)
+        self.snapshot.refresh()
+        compact_my_day(self.today - timedelta(days=5), self.session)
+        fresh = TaskSnapshot(self.engine)
+
+        for snapshot in (self.snapshot, fresh):
+            snapshot.refresh()
+            adherence = snapshot.my_day_adherence(past, self.today)
+            self.assertEqual(adherence[past], {"planned": 2, "completed": 1, "rate": 0.5})
+            self.assertEqual(adherence[self.today]["planned"], 2)
@@ -0,0 +1,147 @@
+import gzip
+import json
+import tempfile
+import threading
+import unittest
+from http.client import HTTPConnection, HTTPResponse
+from typing import Any
+from unittest.mock import patch
+
+from vibe_todo import api, database, maintenance, tenancy
+from vibe_todo.api import ApiServer
+from vibe_todo.tenancy import EnginePool
+
+
+class TestApi(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.patchers = [
+            patch.object(database, "_bootstrapped", set()),
+            patch.object(tenancy, "TENANT_DATA_DIR", self.tmpdir.name),
+            patch.object(maintenance, "MAINTENANCE_ENABLED", False),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        self.pool = EnginePool()
+        self.server = ApiServer(("127.0.0.1", 0), pool=self.pool)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.connection = HTTPConnection("127.0.0.1", self.server.server_port, timeout=10)
+
+    def tearDown(self):
+        self.connection.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.pool.dispose_all()
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.tmpdir.cleanup()
+
+    def request(self, method, path, body=None, headers=None) -> tuple[HTTPResponse, Any]:
+        headers = {"X-Tenant-ID": "acme", **(headers or {})}
+        payload = json.dumps(body).encode() if body is not None else None
+        self.connection.request(method, path, body=payload, headers=headers)
+        response = self.connection.getresponse()
+        raw = response.read()
+        if response.getheader("Content-Encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        return response, json.loads(raw) if raw else None
+
+    def test_crud_and_errors_over_one_connection(self):
+        response, created = self.request("POST", "/lists", {"name": "Work"})
+        self.assertEqual(response.status, 201)
+        list_id = created["id"]
+
+        response, task = self.request("POST", "/tasks", {"list_id": list_id, "title": "Ship", "due_date": "2030-01-02"})
+        self.assertEqual((response.status, task["due_date"]), (201, "2030-01-02"))
+        response, task = self.request("PATCH", f"/tasks/{task['id']}", {"is_important": True})
+        self.assertTrue(task["is_important"])
+        response, rows = self.request("GET", "/views/important")
+        self.assertEqual([row["title"] for row in rows], ["Ship"])
+
+        self.assertEqual(self.request("DELETE", f"/tasks/{task['id']}")[0].status, 204)
+        self.assertEqual(self.request("GET", f"/tasks/{task['id']}")[0].status, 404)
+        self.assertEqual(self.request("POST", "/tasks", {"list_id": list_id, "title": " "})[0].status, 400)
+        self.assertEqual(self.request("POST", "/tasks", {"list_id": list_id, "bogus": 1})[0].status, 400)
+        self.assertEqual(self.request("PUT", "/lists")[0].status, 405)
+        self.assertEqual(self.request("GET", "/lists", headers={"X-Tenant-ID": "../etc"})[0].status, 400)
+
+    def test_malformed_bodies_are_rejected(self):
+        list_id = self.request("POST", "/lists", {"name": "Work"})[1]["id"]
+        task_id = self.request("POST", "/tasks", {"list_id": list_id, "title": "Ship"})[1]["id"]
+
+        for body in ({"is_completed": "maybe"}, {"title": 5}, {"list_id": "1"}, {"list_id": True}, {"title": None}):
+            with self.subTest(body=body):
+                self.assertEqual(self.request("PATCH", f"/tasks/{task_id}", body)[0].status, 400)
+        for body in ([1, 2], {"before_id": "x"}, {"before_id": task_id}):
+            with self.subTest(body=body):
+                self.assertEqual(self.request("POST", f"/tasks/{task_id}/move", body)[0].status, 400)
+        self.assertEqual(self.request("PATCH", f"/tasks/{task_id}", {"description": None})[0].status, 200)
+        self.assertEqual(self.request("POST", f"/tasks/{task_id}/move")[0].status, 200)
+
+    def test_bulk_and_batch(self):
+        list_id = self.request("POST", "/lists", {"name": "Work"})[1]["id"]
+
+        response, created = self.request(
+            "POST", "/tasks/bulk", {"tasks": [{"list_id": list_id, "title": f"Task {i}"} for i in range(3)]}
+        )
+        self.assertEqual((response.status, len(created["ids"])), (201, 3))
+        response, _ = self.request("POST", "/tasks/bulk", {"tasks": [{"list_id": list_id, "title": "Ok"}, {"list_id": 999, "title": "No"}]})
+        self.assertEqual(response.status, 404)
+        self.assertEqual(len(self.request("GET", f"/lists/{list_id}/tasks")[1]), 3)
+
+        response, results = self.request(
+            "POST",
+            "/batch",
+            {"requests": [
+                {"method": "PUT", "path": f"/views/my-day/{created['ids'][0]}"},
+                {"path": "/views/my-day"},
+                {"path": f"/lists/{list_id}/tasks"},
+                {"method": "POST", "path": "/batch"},
+            ]},
+        )
+        self.assertEqual([r["status"] for r in results], [200, 200, 200, 400])
+        self.assertEqual([row["title"] for row in results[1]["body"]], ["Task 0"])
+        self.assertEqual([t["title"] for t in results[2]["body"]], ["Task 0", "Task 1", "Task 2"])
+
+    def test_batch_reports_a_failing_item_without_losing_the_others(self):
+        list_id = self.request("POST", "/lists", {"name": "Work"})[1]["id"]
+
+        with patch.object(api, "get_tasks_by_list", side_effect=RuntimeError("disk I/O error")):
+            response, results = self.request(
+                "POST",
+                "/batch",
+                {"requests": [
+                    {"method": "POST", "path": "/tasks", "body": {"list_id": list_id, "title": "Kept"}},
+                    {"path": f"/lists/{list_id}/tasks"},
+                    {"method": "POST", "path": "/tasks", "body": {"list_id": list_id, "title": "Also kept"}},
+                ]},
+            )
+
+        self.assertEqual((response.status, [r["status"] for r in results]), (200, [201, 500, 201]))
+        self.assertEqual(len(self.request("GET", f"/lists/{list_id}/tasks")[1]), 2)
+
+    def test_negative_content_length_is_rejected(self):
+        self.connection.putrequest("POST", "/lists")
+        self.connection.putheader("X-Tenant-ID", "acme")
+        self.connection.putheader("Content-Length", "-5")
+        self.connection.endheaders()
+        response = self.connection.getresponse()
+        self.assertEqual((response.status, json.loads(response.read())), (400, {"error": "Invalid Content-Length"}))
+
+    def test_etag_and_gzip(self):
+        list_id = self.request("POST", "/lists", {"name": "Work"})[1]["id"]
+        self.request("POST", "/tasks/bulk", {"tasks": [{"list_id": list_id, "title": f"Task {i}"} for i in range(30)]})
+
+        with patch.object(api, "API_GZIP_MIN_BYTES", 100):
+            response, rows = self.request("GET", "/tasks", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(len(rows), 30)
+        etag = response.getheader("ETag")
+
+        response, body = self.request("GET", "/tasks", headers={"If-None-Match": etag})
+        self.assertEqual((response.status, body), (304, None))
+
+        self.request("POST", "/tasks", {"list_id": list_id, "title": "New"})
+        response, rows = self.request("GET", "/tasks", headers={"If-None-Match": etag})
+        self.assertEqual((response.status, len(rows)), (200, 31))
+        self.assertNotEqual(response.getheader("ETag"), etag)
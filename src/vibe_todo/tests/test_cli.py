@@ -0,0 +1,70 @@
+import io
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlmodel import Session
+
+from vibe_todo import database
+from vibe_todo.cli import main
+from vibe_todo.services import create_list, delete_list
+from vibe_todo.tests.test_services import not_none
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.bootstrapped_patcher = patch.object(database, "_bootstrapped", set())
+        self.bootstrapped_patcher.start()
+        self.database = f"sqlite:///{Path(self.tmpdir.name) / 'todos.db'}"
+
+    def tearDown(self):
+        self.bootstrapped_patcher.stop()
+        self.tmpdir.cleanup()
+
+    def run_cli(self, *args, stdin="", database=None):
+        stdout = io.StringIO()
+        with patch.object(sys, "stdin", io.StringIO(stdin)), patch.object(sys, "stdout", stdout), patch.object(sys, "stderr", io.StringIO()):
+            status = main(["--database", database or self.database, "--batch-size", "2", *args])
+        return status, stdout.getvalue()
+
+    def test_round_trip(self):
+        self.assertEqual(self.run_cli("add", stdin="Milk\nEggs\n\nBread\n")[0], 0)
+        status, output = self.run_cli("add", "--important", "--due", "2030-01-01", "Taxes")
+        self.assertEqual((status, output), (0, "4\n"))
+
+        listing = self.run_cli("list", "--open")[1]
+        self.assertEqual([line.split("\t")[-1] for line in listing.splitlines()], ["Milk", "Eggs", "Bread", "Taxes"])
+        self.run_cli("complete", stdin="\n".join(listing.splitlines()[:2]))
+        self.assertEqual(len(self.run_cli("list", "--completed")[1].splitlines()), 2)
+
+        exported = self.run_cli("export")[1]
+        copy = f"sqlite:///{Path(self.tmpdir.name) / 'copy.db'}"
+        self.assertEqual(self.run_cli("import", stdin=exported, database=copy)[0], 0)
+        self.assertEqual(self.run_cli("export", database=copy)[1], exported)
+        self.assertIn("Important\t1", self.run_cli("stats", database=copy)[1])
+
+    def test_errors_exit_non_zero(self):
+        self.assertEqual(self.run_cli("add", "--list", "Missing", "x")[0], 1)
+        self.assertEqual(self.run_cli("complete", "abc")[0], 1)
+        self.assertEqual(self.run_cli("import", stdin='{"title": "no list"}\n')[0], 1)
+
+    def test_import_into_a_trashed_list_fails(self):
+        engine = database.bootstrap(database.create_database_engine(self.database))
+        with Session(engine) as session:
+            delete_list(not_none(create_list("Old", session).id), session)
+        engine.dispose()
+        self.assertEqual(self.run_cli("import", stdin='{"list": "Old", "title": "Back"}\n')[0], 1)
+
+    def test_does_not_import_streamlit(self):
+        script = "import sys; from vibe_todo.cli import main; main(sys.argv[1:]); print('streamlit' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", script, "--database", self.database, "stats"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.splitlines()[-1], "False")
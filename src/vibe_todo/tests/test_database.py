@@ -0,0 +1,72 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlmodel import Session, create_engine, select
+
+from vibe_todo import database
+from vibe_todo.database import SCHEMA_VERSION, bootstrap, get_schema_version, incremental_vacuum
+from vibe_todo.models import Task, TodoList
+from vibe_todo.purger import TrashPurger
+from vibe_todo.services import create_list, create_task, delete_list
+from vibe_todo.tests.test_services import not_none
+
+
+class TestBootstrap(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.url = f"sqlite:///{Path(self.tmpdir.name) / 'todos.db'}"
+        self.engine = create_engine(self.url)
+        self.bootstrapped_patcher = patch.object(database, "_bootstrapped", set())
+        self.bootstrapped_patcher.start()
+
+    def tearDown(self):
+        self.bootstrapped_patcher.stop()
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_bootstrap_creates_schema_once(self):
+        self.assertEqual(get_schema_version(self.engine), 0)
+
+        with patch.object(database, "create_db_and_tables", wraps=database.create_db_and_tables) as create:
+            bootstrap(self.engine)
+            bootstrap(self.engine)
+            self.assertEqual(create.call_count, 1)
+
+        self.assertEqual(get_schema_version(self.engine), SCHEMA_VERSION)
+        with Session(self.engine) as session:
+            names = session.exec(select(TodoList.name).where(TodoList.is_system == True)).all()  # noqa: E712
+        self.assertEqual(sorted(names), ["Important", "My Day", "Planned", "Tasks"])
+
+    def test_current_schema_skips_creation(self):
+        bootstrap(self.engine)
+        database._bootstrapped.clear()
+
+        with patch.object(database, "create_db_and_tables") as create:
+            bootstrap(self.engine)
+            create.assert_not_called()
+
+    def _checkpointed_size(self) -> int:
+        """Size of the main database file once the WAL is folded into it."""
+        with self.engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        return Path(not_none(self.engine.url.database)).stat().st_size
+
+    def test_purger_shrinks_file(self):
+        bootstrap(self.engine)
+        with Session(self.engine) as session:
+            list_id = not_none(create_list("Bulk", session).id)
+            for i in range(200):
+                create_task(list_id, "x" * 500 + str(i), session)
+            delete_list(list_id, session)
+        size = self._checkpointed_size()
+
+        purged = TrashPurger(self.engine, retention=timedelta(0), batch_size=50).run_once(datetime.now() + timedelta(seconds=1))
+
+        self.assertEqual(purged, {"list": 1, "task": 200})
+        with Session(self.engine) as session:
+            self.assertEqual(session.exec(select(Task)).all(), [])
+        self.assertLess(self._checkpointed_size(), size)
+        self.assertEqual(incremental_vacuum(self.engine), 0)
@@ -0,0 +1,94 @@
+import gc
+import unittest
+
+from sqlmodel import Session
+
+from vibe_todo.events import ChangeEvent, ChangeInbox, EventBus, get_event_bus, set_event_origin
+from vibe_todo.services import create_list, create_subtask, create_task, delete_task, move_task, update_task
+from vibe_todo.tests.test_services import make_engine, not_none
+
+
+class TestEventBus(unittest.TestCase):
+    def test_subscribe_and_unsubscribe(self):
+        bus = EventBus()
+        received = []
+        unsubscribe = bus.subscribe(received.append)
+
+        bus.publish(ChangeEvent("task", "created", 1, list_id=2))
+        unsubscribe()
+        bus.publish(ChangeEvent("task", "deleted", 1, list_id=2))
+
+        self.assertEqual(received, [ChangeEvent("task", "created", 1, list_id=2)])
+
+    def test_weak_subscription_ends_with_owner(self):
+        bus = EventBus()
+        inbox = ChangeInbox("sqlite://")
+        bus.subscribe(inbox.receive, weak=True)
+        self.assertEqual(len(bus), 1)
+
+        del inbox
+        gc.collect()
+        bus.publish(ChangeEvent("list", "created", 1, database="sqlite://"))
+        self.assertEqual(len(bus), 0)
+
+    def test_inbox_skips_other_databases_and_own_origin(self):
+        inbox = ChangeInbox("sqlite:///a.db", origin="me")
+        inbox.receive(ChangeEvent("list", "created", 1, database="sqlite:///b.db", origin="other"))
+        inbox.receive(ChangeEvent("list", "created", 2, database="sqlite:///a.db", origin="me"))
+        inbox.receive(ChangeEvent("list", "created", 3, database="sqlite:///a.db", origin="other"))
+
+        self.assertEqual([event.entity_id for event in inbox.drain()], [3])
+        self.assertEqual(inbox.drain(), [])
+
+
+class TestServiceEvents(unittest.TestCase):
+    def setUp(self):
+        self.engine = make_engine()
+        self.session = Session(self.engine)
+        self.events = []
+        self.unsubscribe = get_event_bus().subscribe(self.events.append)
+        set_event_origin("writer")
+
+    def tearDown(self):
+        set_event_origin(None)
+        self.unsubscribe()
+        self.session.close()
+        self.engine.dispose()
+
+    def test_services_publish_after_commit(self):
+        first = not_none(create_list("First", self.session).id)
+        second = not_none(create_list("Second", self.session).id)
+        task_id = not_none(create_task(first, "Task", self.session).id)
+        create_subtask(task_id, "Step", self.session)
+        update_task(task_id, self.session, list_id=second)
+        delete_task(task_id, self.session)
+        self.assertFalse(delete_task(task_id, self.session))
+
+        self.assertEqual(
+            [(e.entity, e.action, e.list_id) for e in self.events],
+            [
+                ("list", "created", first),
+                ("list", "created", second),
+                ("task", "created", first),
+                ("subtask", "created", None),
+                ("task", "updated", first),
+                ("task", "updated", second),
+                ("task", "deleted", second),
+            ],
+        )
+        self.assertTrue(all(e.origin == "writer" and e.database == str(self.engine.url) for e in self.events))
+
+    def test_move_to_another_list_publishes_both_lists(self):
+        first = not_none(create_list("First", self.session).id)
+        second = not_none(create_list("Second", self.session).id)
+        task_id = not_none(create_task(first, "Task", self.session).id)
+        anchor_id = not_none(create_task(second, "Anchor", self.session).id)
+        del self.events[:]
+
+        move_task(task_id, anchor_id, None, self.session)
+
+        self.assertEqual([(e.entity_id, e.list_id) for e in self.events], [(task_id, first), (task_id, second)])
+
+
+if __name__ == "__main__":
+    unittest.main()
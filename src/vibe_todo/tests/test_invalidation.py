@@ -0,0 +1,112 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from sqlmodel import Session, create_engine
+
+from vibe_todo.database import create_db_and_tables
+from vibe_todo.invalidation import DataVersionWatcher
+from vibe_todo.services import create_list, create_subtask, create_task, toggle_subtask_complete, update_list
+from vibe_todo.tests.test_services import not_none
+
+
+class TestDataVersionWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{Path(self.tmpdir.name) / 'todos.db'}"
+        # two engines on one file stand in for two replicas
+        self.engine = create_engine(url)
+        self.other_engine = create_engine(url)
+        create_db_and_tables(self.engine)
+        self.watcher = DataVersionWatcher(self.engine, poll_interval=0)
+
+    def tearDown(self):
+        self.watcher.close()
+        self.engine.dispose()
+        self.other_engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_external_write_bumps_generation(self):
+        start = self.watcher.poll()
+        self.assertEqual(self.watcher.poll(), start)
+
+        with Session(self.other_engine) as session:
+            create_list("Elsewhere", session)
+
+        bumped = self.watcher.poll()
+        self.assertGreater(bumped, start)
+        self.assertEqual(self.watcher.poll(), bumped)
+
+    def test_local_write_bumps_generation_without_polling(self):
+        start = self.watcher.poll()
+        notified = []
+        self.watcher.subscribe(notified.append)
+
+        with Session(self.engine) as session:
+            create_list("Here", session)
+
+        self.assertGreater(self.watcher.generation, start)
+        self.assertEqual(notified, [self.watcher.generation])
+
+    def test_local_writes_can_be_left_uncounted(self):
+        watcher = DataVersionWatcher(self.engine, poll_interval=0, count_local_writes=False)
+        try:
+            start = watcher.poll()
+            with Session(self.engine) as session:
+                create_list("Here", session)
+            self.assertEqual(watcher.poll(), start)
+
+            with Session(self.other_engine) as session:
+                create_list("Elsewhere", session)
+            self.assertGreater(watcher.poll(), start)
+        finally:
+            watcher.close()
+
+    def test_new_watcher_never_repeats_a_generation(self):
+        # a tenant engine rebuilt for the same URL must not hit cache entries of its predecessor
+        seen = {self.watcher.poll(), self.watcher.invalidate()}
+        self.watcher.close()
+        self.watcher = DataVersionWatcher(self.engine, poll_interval=0)
+
+        self.assertNotIn(self.watcher.poll(), seen)
+
+    def test_poll_interval_throttles_reads(self):
+        watcher = DataVersionWatcher(self.engine, poll_interval=3600)
+        try:
+            start = watcher.poll()
+            with Session(self.other_engine) as session:
+                create_list("Elsewhere", session)
+            self.assertEqual(watcher.poll(), start)
+        finally:
+            watcher.close()
+
+    def test_change_sequence_fallback_sees_every_write(self):
+        # renames and subtask toggles leave row counts and Task.updated_at alone
+        with Session(self.other_engine) as session:
+            todo_list = create_list("Before", session)
+            task = create_task(not_none(todo_list.id), "Task", session)
+            subtask = create_subtask(not_none(task.id), "Step", session)
+            list_id, subtask_id = not_none(todo_list.id), not_none(subtask.id)
+
+        with (
+            mock.patch("vibe_todo.database.is_sqlite", return_value=False),
+            mock.patch("vibe_todo.invalidation.is_sqlite", return_value=False),
+        ):
+            watcher = DataVersionWatcher(self.engine, poll_interval=0, count_local_writes=False)
+            try:
+                start = watcher.poll()
+                with Session(self.other_engine) as session:
+                    update_list(list_id, "After", session)
+                renamed = watcher.poll()
+                self.assertGreater(renamed, start)
+
+                with Session(self.other_engine) as session:
+                    toggle_subtask_complete(subtask_id, session)
+                self.assertGreater(watcher.poll(), renamed)
+            finally:
+                watcher.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
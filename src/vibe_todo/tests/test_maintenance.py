@@ -0,0 +1,107 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlmodel import Session, create_engine
+
+from vibe_todo import database, maintenance
+from vibe_todo.database import bootstrap
+from vibe_todo.maintenance import MaintenanceJob, MaintenanceScheduler, budgeted_connection, checkpoint_wal, wal_size
+from vibe_todo.services import create_list, create_task
+from vibe_todo.tests.test_services import not_none
+
+
+def slow_query(engine, deadline):
+    with budgeted_connection(engine, deadline) as connection:
+        connection.execute(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT count(*) FROM n"
+        ).fetchone()
+    return "finished"
+
+
+class TestMaintenanceScheduler(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.bootstrapped_patcher = patch.object(database, "_bootstrapped", set())
+        self.bootstrapped_patcher.start()
+        self.engine = bootstrap(create_engine(f"sqlite:///{Path(self.tmpdir.name) / 'todos.db'}"))
+        with Session(self.engine) as session:
+            self.list_id = not_none(create_list("Work", session).id)
+
+    def tearDown(self):
+        self.bootstrapped_patcher.stop()
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_idle_jobs_wait_for_quiet_database(self):
+        calls = []
+        jobs = [
+            MaintenanceJob("always", lambda engine, deadline: calls.append("always") or "ok", interval=0, idle_only=False),
+            MaintenanceJob("idle", lambda engine, deadline: calls.append("idle") or "ok", interval=60),
+        ]
+        scheduler = MaintenanceScheduler(self.engine, jobs=jobs, idle_seconds=3600)
+        try:
+            with Session(self.engine) as session:
+                create_task(self.list_id, "Busy", session)
+            self.assertEqual(scheduler.tick(), ["always"])
+
+            scheduler.idle_seconds = 0
+            self.assertEqual(scheduler.tick(), ["always", "idle"])
+            self.assertEqual(scheduler.tick(), ["always"])
+            self.assertEqual(scheduler.stats["idle"].runs, 1)
+            self.assertEqual(scheduler.stats["always"].last_outcome, "ok")
+        finally:
+            scheduler.stop()
+
+    def test_tick_judges_idleness_at_the_given_time(self):
+        calls = []
+        jobs = [MaintenanceJob("idle", lambda engine, deadline: calls.append("idle") or "ok", interval=60)]
+        scheduler = MaintenanceScheduler(self.engine, jobs=jobs, idle_seconds=3600)
+        try:
+            with Session(self.engine) as session:
+                create_task(self.list_id, "Busy", session)
+            self.assertEqual(scheduler.tick(), [])
+            self.assertEqual(scheduler.tick(time.monotonic() + 3600), ["idle"])
+        finally:
+            scheduler.stop()
+
+    def test_job_is_interrupted_at_its_budget(self):
+        scheduler = MaintenanceScheduler(self.engine, jobs=[], time_budget=0.05)
+        try:
+            stats = scheduler.run_job(MaintenanceJob("slow", slow_query, interval=0))
+        finally:
+            scheduler.stop()
+
+        self.assertEqual(stats.last_outcome, "timeout")
+        self.assertEqual(stats.failures, 1)
+        self.assertEqual((stats.timeouts, stats.errors), (1, 0))
+        self.assertLess(stats.last_duration, 2)
+
+    def test_job_stats_export_outcomes_and_last_duration(self):
+        scheduler = MaintenanceScheduler(self.engine, jobs=[])
+        try:
+            scheduler.run_job(MaintenanceJob("flaky", lambda engine, deadline: "ok", interval=0))
+            scheduler.run_job(MaintenanceJob("flaky", lambda engine, deadline: str(1 / 0), interval=0))
+            with patch.dict(maintenance._schedulers, {scheduler.database: scheduler}):
+                families = {family.name: family.samples for family in maintenance._collect_job_stats()}
+        finally:
+            scheduler.stop()
+
+        outcomes = {labels["outcome"]: count for labels, count in families["vibe_todo_maintenance_outcomes_total"]}
+        self.assertEqual(outcomes, {"ok": 1, "timeout": 0, "error": 1})
+        [(labels, duration)] = families["vibe_todo_maintenance_last_duration_seconds"]
+        self.assertEqual(labels["job"], "flaky")
+        self.assertEqual(duration, scheduler.stats["flaky"].last_duration)
+
+    def test_checkpoint_mode_follows_wal_size(self):
+        with Session(self.engine) as session:
+            for i in range(50):
+                create_task(self.list_id, f"Task {i}", session)
+        self.assertGreater(wal_size(self.engine), 0)
+
+        self.assertTrue(checkpoint_wal(self.engine, float("inf")).startswith("skipped"))
+        with patch.object(maintenance, "WAL_CHECKPOINT_BYTES", 0), patch.object(maintenance, "WAL_TRUNCATE_BYTES", 0):
+            self.assertTrue(checkpoint_wal(self.engine, float("inf")).startswith("truncate"))
+        self.assertEqual(wal_size(self.engine), 0)
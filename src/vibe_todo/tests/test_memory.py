@@ -0,0 +1,61 @@
+import tracemalloc
+import unittest
+from collections import deque
+from unittest.mock import patch
+
+from vibe_todo import memory
+from vibe_todo.memory import (
+    RerunCapture,
+    RssSampler,
+    estimate_size,
+    process_rss,
+    record_session_size,
+    session_sizes,
+    session_state_sizes,
+    traced,
+)
+from vibe_todo.state import LRUStore
+from vibe_todo.tests.test_services import not_none
+
+
+class TestMemory(unittest.TestCase):
+    def test_capture_reports_top_allocators_and_stops_tracing(self):
+        self.assertFalse(tracemalloc.is_tracing())
+        with patch.object(memory, "_reports", deque(maxlen=10)):
+            capture = RerunCapture("rerun Test")
+            with traced("render Test"):
+                kept = [bytearray(1024) for _ in range(200)]
+            with traced("skipped", enabled=False):
+                pass
+            report = not_none(capture.finish())
+            self.assertIsNone(capture.finish())
+
+            self.assertFalse(tracemalloc.is_tracing())
+            self.assertEqual([r.label for r in memory.recent_reports()], ["rerun Test", "render Test"])
+            self.assertGreater(report.net_bytes, 200 * 1024)
+            self.assertIn("test_memory.py", report.top[0].location)
+        self.assertEqual(len(kept), 200)
+
+    def test_estimate_size_follows_containers_and_app_objects(self):
+        store = LRUStore()
+        store[1] = "x" * 10_000
+        state = {"expanded": store, "filters": {"q": "y" * 5_000}, "again": store}
+
+        sizes = session_state_sizes(state)
+        self.assertEqual(list(sizes), ["expanded", "filters", "again"])
+        self.assertGreater(sizes["expanded"], 10_000)
+        self.assertLess(sizes["again"], 100)
+        self.assertGreater(estimate_size(state), 15_000)
+
+    def test_rss_and_session_records(self):
+        self.assertGreater(process_rss(), 0)
+        sampler = RssSampler(kept=2)
+        for _ in range(3):
+            sampler.sample()
+        self.assertEqual(len(sampler.samples), 2)
+        self.assertGreaterEqual(sampler.peak, sampler.latest().rss)
+
+        with patch.object(memory, "MEMORY_SESSIONS_KEPT", 2), patch.object(memory, "_sessions", memory.OrderedDict()):
+            for session_id in ("a", "b", "c"):
+                record_session_size(session_id, {"key": 10})
+            self.assertEqual(list(session_sizes()), ["c", "b"])
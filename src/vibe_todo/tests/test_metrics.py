@@ -0,0 +1,88 @@
+import tempfile
+import unittest
+from pathlib import Path
+from urllib.request import urlopen
+
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from vibe_todo import services
+from vibe_todo.metrics import (
+    DB_CHECKOUTS,
+    SERVICE_CALLS,
+    SERVICE_ERRORS,
+    SERVICE_ROWS,
+    MetricsRegistry,
+    start_metrics_server,
+    write_textfile,
+)
+
+
+class TestMetrics(unittest.TestCase):
+    def test_render_text_format(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("app_requests_total", "Requests", ("path",))
+        requests.labels('/a"b').inc(2)
+        latency = registry.histogram("app_latency_seconds", "Latency", buckets=(0.1, 1.0))
+        latency.observe(0.05)
+        latency.observe(0.5)
+        self.assertIs(registry.counter("app_requests_total", "Requests", ("path",)), requests)
+        with self.assertRaises(ValueError):
+            registry.histogram("app_requests_total", "Requests", ("path",))
+
+        self.assertEqual(
+            registry.render().splitlines(),
+            [
+                "# HELP app_requests_total Requests",
+                "# TYPE app_requests_total counter",
+                'app_requests_total{path="/a\\"b"} 2',
+                "# HELP app_latency_seconds Latency",
+                "# TYPE app_latency_seconds histogram",
+                'app_latency_seconds_bucket{le="0.1"} 1',
+                'app_latency_seconds_bucket{le="1"} 2',
+                'app_latency_seconds_bucket{le="+Inf"} 2',
+                "app_latency_seconds_sum 0.55",
+                "app_latency_seconds_count 2",
+            ],
+        )
+
+    def test_services_are_instrumented(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        SQLModel.metadata.create_all(engine)
+        calls = SERVICE_CALLS.labels("get_all_lists").value
+        errors = SERVICE_ERRORS.labels("get_list_by_id").value
+        rows = SERVICE_ROWS.labels("get_all_lists").counts[:]
+        checkouts = DB_CHECKOUTS.labels().value
+
+        with Session(engine) as session:
+            services.create_list("Work", session)
+            services.get_all_lists(session)
+            self.assertIsNone(services.get_list_by_id(999, session))
+            with self.assertRaises(ValueError):
+                services.create_list(" ", session)
+
+        self.assertTrue(hasattr(services.get_all_lists, "__wrapped__"))
+        self.assertFalse(hasattr(services.score_task, "__wrapped__"))
+        self.assertEqual(SERVICE_CALLS.labels("get_all_lists").value, calls + 1)
+        self.assertEqual(SERVICE_ERRORS.labels("get_list_by_id").value, errors)
+        self.assertEqual(sum(SERVICE_ROWS.labels("get_all_lists").counts), sum(rows) + 1)
+        self.assertGreater(SERVICE_ERRORS.labels("create_list").value, 0)
+        self.assertGreater(DB_CHECKOUTS.labels().value, checkouts)
+
+    def test_exporters(self):
+        server = start_metrics_server("127.0.0.1", 0)
+        try:
+            with urlopen(f"http://127.0.0.1:{server.server_port}/metrics", timeout=5) as response:
+                body = response.read().decode()
+                self.assertTrue(response.headers["Content-Type"].startswith("text/plain; version=0.0.4"))
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertIn("# TYPE vibe_todo_service_calls_total counter", body)
+        self.assertIn("process_resident_memory_bytes ", body)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "textfile" / "vibe_todo.prom"
+            write_textfile(path)
+            self.assertIn("vibe_todo_db_pool_checkouts_total", path.read_text())
+            self.assertEqual([p.name for p in path.parent.iterdir()], ["vibe_todo.prom"])
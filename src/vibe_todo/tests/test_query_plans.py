@@ -0,0 +1,247 @@
+"""EXPLAIN QUERY PLAN regression suite for the service queries.
+
+Each case runs a service call against a seeded, ANALYZEd SQLite database,
+records the statements it executes and their query plans, and compares
+them with a golden file in query_plans/. Hot cases must not SCAN the task,
+subtask or mydaytask tables. Under the SQLite version that wrote the golden
+files they must match exactly. Plan wording changes between versions, so
+other versions compare what stays stable: the statements and, for hot
+cases, the indexes each plan uses.
+
+After an intended change, rewrite the golden files and review their diff:
+
+    UPDATE_QUERY_PLANS=1 python -m pytest src/vibe_todo/tests/test_query_plans.py
+"""
+
+import difflib
+import os
+import random
+import re
+import sqlite3
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, NamedTuple, cast
+from unittest.mock import patch
+
+from sqlalchemy import event
+from sqlmodel import Session
+
+from vibe_todo import database, services
+from vibe_todo.database import bootstrap, create_database_engine
+
+GOLDEN_DIR = Path(__file__).parent / "query_plans"
+
+# Set to "1" to rewrite the golden files instead of comparing against them
+UPDATE_QUERY_PLANS = os.getenv("UPDATE_QUERY_PLANS") == "1"
+
+# Tables no hot query may read with a full scan
+HOT_TABLES = ("task", "subtask", "mydaytask")
+
+_SCAN = re.compile(r"\bSCAN (" + "|".join(HOT_TABLES) + r")\b")
+
+_INDEX = re.compile(r"\bUSING (?:COVERING )?INDEX (\w+)|\bUSING (?:INTEGER )?PRIMARY KEY\b")
+
+TODAY = date(2030, 6, 15)
+
+
+class PlanCase(NamedTuple):
+    """A service call whose statements are explained."""
+
+    name: str
+    call: Callable[[Session, dict], object]
+    # full listings read every row by design
+    allow_scan: bool = False
+
+
+CASES = [
+    PlanCase("get_all_lists", lambda s, ids: services.get_all_lists(s)),
+    PlanCase("get_tasks_by_list", lambda s, ids: services.get_tasks_by_list(ids["list"], s)),
+    PlanCase("get_task_by_id", lambda s, ids: services.get_task_by_id(ids["task"], s)),
+    PlanCase("get_all_tasks", lambda s, ids: services.get_all_tasks(s), allow_scan=True),
+    PlanCase("get_all_tasks-list_id", lambda s, ids: services.get_all_tasks(s, filters={"list_id": ids["list"]})),
+    PlanCase(
+        "get_all_tasks-list_id-is_completed",
+        lambda s, ids: services.get_all_tasks(s, filters={"list_id": ids["list"], "is_completed": False}),
+    ),
+    PlanCase(
+        "get_all_tasks-list_id-title",
+        lambda s, ids: services.get_all_tasks(s, filters={"list_id": ids["list"], "title": "report"}),
+    ),
+    PlanCase(
+        "get_all_tasks-list_id-archived",
+        lambda s, ids: services.get_all_tasks(s, filters={"list_id": ids["list"]}, include_archived=True),
+    ),
+    PlanCase("get_all_tasks-is_important", lambda s, ids: services.get_all_tasks(s, filters={"is_important": True})),
+    PlanCase("get_all_tasks-due_date", lambda s, ids: services.get_all_tasks(s, filters={"due_date": TODAY})),
+    # substring search has no index to use
+    PlanCase("get_all_tasks-title", lambda s, ids: services.get_all_tasks(s, filters={"title": "report"}), allow_scan=True),
+    PlanCase("get_important_tasks", lambda s, ids: services.get_important_tasks(s)),
+    PlanCase("get_planned_tasks", lambda s, ids: services.get_planned_tasks(s)),
+    PlanCase("get_my_day_tasks", lambda s, ids: services.get_my_day_tasks(TODAY, s)),
+    PlanCase("get_my_day_suggestions", lambda s, ids: services.get_my_day_suggestions(TODAY, s)),
+    # rescoring every open task once a day is a batch job
+    PlanCase("refresh_suggestions", lambda s, ids: services.refresh_suggestions(TODAY, s), allow_scan=True),
+    PlanCase("get_badge_counts", lambda s, ids: services.get_badge_counts(TODAY, s)),
+    PlanCase("get_subtasks_by_task", lambda s, ids: services.get_subtasks_by_task(ids["task"], s)),
+    PlanCase("get_trash", lambda s, ids: services.get_trash(s)),
+    PlanCase("archive_completed_tasks", lambda s, ids: services.archive_completed_tasks(datetime(2000, 1, 1), s)),
+    PlanCase("purge_trash", lambda s, ids: services.purge_trash(datetime(2000, 1, 1), s)),
+    PlanCase("toggle_complete", lambda s, ids: services.toggle_complete(ids["task"], s)),
+    PlanCase("move_task", lambda s, ids: services.move_task(ids["task"], None, None, s)),
+    PlanCase("add_to_my_day", lambda s, ids: services.add_to_my_day(ids["task"], TODAY, s)),
+    PlanCase("delete_task", lambda s, ids: services.delete_task(ids["task"], s)),
+]
+
+
+def portable(rendered: str, with_indexes: bool) -> list[tuple[str, list[str]]]:
+    """
+    Reduce a rendered capture to the parts that do not depend on the SQLite version.
+
+    Args:
+        rendered: Output of TestQueryPlans.capture or a golden file
+        with_indexes: Keep the indexes of each plan; full listings may change strategy between versions
+
+    Returns:
+        list[tuple[str, list[str]]]: Each statement with the sorted indexes its plan uses
+    """
+    reduced = []
+    for block in rendered.partition("\n\n")[2].strip().split("\n\n"):
+        statement, _, plan = block.partition("\n--\n")
+        indexes = sorted({match.group(1) or "PRIMARY KEY" for match in _INDEX.finditer(plan)}) if with_indexes else []
+        reduced.append((statement, indexes))
+    return reduced
+
+
+def seed(session: Session) -> dict:
+    """Fill the database with a deterministic mix of live, completed, trashed and archived rows."""
+    rng = random.Random(0)
+    list_ids = [services.create_list(f"List {i}", session).id for i in range(8)]
+    task_ids = services.create_tasks(
+        [
+            {
+                "list_id": rng.choice(list_ids),
+                "title": rng.choice(["Write report", "Call", "Buy milk", "Review"]) + f" {i}",
+                "is_important": rng.random() < 0.1,
+                "due_date": TODAY + timedelta(days=rng.randint(-10, 30)) if rng.random() < 0.2 else None,
+            }
+            for i in range(3000)
+        ],
+        session,
+    )
+    for task_id in rng.sample(task_ids, 300):
+        services.create_subtask(task_id, "Step", session)
+    for offset in range(10):
+        for task_id in rng.sample(task_ids, 15):
+            services.add_to_my_day(task_id, TODAY - timedelta(days=offset), session)
+    completed = rng.sample(task_ids, 1200)
+    services.complete_tasks(completed[:600], session)
+    services.archive_completed_tasks(datetime.now() + timedelta(seconds=1), session)
+    services.complete_tasks(completed[600:], session)
+    live = [row.id for row in services.get_all_tasks(session)]
+    for task_id in rng.sample(live, 50):
+        services.delete_task(task_id, session)
+    live = [row.id for row in services.get_all_tasks(session, filters={"is_completed": False})]
+    probe = next(task_id for task_id in live if services.get_subtasks_by_task(task_id, session))
+    services.refresh_suggestions(TODAY, session)
+    return {"list": list_ids[0], "task": probe}
+
+
+def explain(connection: sqlite3.Connection, statement: str, parameters) -> list[str]:
+    """EXPLAIN QUERY PLAN of a statement as indented lines, like the sqlite3 shell prints it."""
+    rows = connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    depth = {0: -1}
+    lines = []
+    for node, parent, _, detail in rows:
+        depth[node] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node] + detail)
+    return lines
+
+
+class TestQueryPlans(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.bootstrapped_patcher = patch.object(database, "_bootstrapped", set())
+        cls.bootstrapped_patcher.start()
+        cls.engine = bootstrap(create_database_engine(f"sqlite:///{Path(cls.tmpdir.name) / 'plans.db'}"))
+        # the planner breaks ties between equally good indexes by creation order, which
+        # follows set iteration in create_all; recreate them in name order for stable plans
+        with cls.engine.begin() as connection:
+            indexes = connection.exec_driver_sql(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL ORDER BY name"
+            ).all()
+            for name, _ in indexes:
+                connection.exec_driver_sql(f'DROP INDEX "{name}"')
+            for _, sql in indexes:
+                connection.exec_driver_sql(sql)
+        with Session(cls.engine) as session:
+            cls.ids = seed(session)
+        with cls.engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE")
+        # connections opened before ANALYZE keep planning without the new statistics
+        cls.engine.dispose()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.engine.dispose()
+        cls.bootstrapped_patcher.stop()
+        cls.tmpdir.cleanup()
+
+    def capture(self, case: PlanCase) -> str:
+        """Run a case and render the statements it executed with their plans."""
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if not executemany and statement.lstrip().split(None, 1)[0].upper() in ("SELECT", "WITH", "UPDATE", "DELETE"):
+                statements.append((statement, parameters))
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        try:
+            with Session(self.engine) as session:
+                case.call(session, self.ids)
+        finally:
+            event.remove(self.engine, "before_cursor_execute", record)
+
+        raw = self.engine.raw_connection()
+        try:
+            blocks = []
+            for statement, parameters in statements:
+                plan = "\n".join(explain(cast(sqlite3.Connection, raw.driver_connection), statement, parameters))
+                blocks.append(f"{statement.strip()}\n--\n{plan}")
+        finally:
+            raw.close()
+        return f"-- SQLite {sqlite3.sqlite_version}\n\n" + "\n\n".join(blocks) + "\n"
+
+    def test_plans(self):
+        GOLDEN_DIR.mkdir(exist_ok=True)
+        # cases run in order on one database, so the writing ones come last
+        for case in CASES:
+            with self.subTest(case.name):
+                actual = self.capture(case)
+                if not case.allow_scan:
+                    scans = sorted({line.strip() for line in actual.splitlines() if _SCAN.search(line)})
+                    self.assertEqual(scans, [], f"{case.name} scans a hot table")
+
+                golden = GOLDEN_DIR / f"{case.name}.txt"
+                if UPDATE_QUERY_PLANS:
+                    golden.write_text(actual)
+                    continue
+                if not golden.exists():
+                    golden.write_text(actual)
+                    self.fail(f"Wrote missing golden file {golden.name}; review and commit it")
+                expected = golden.read_text()
+                if expected.partition("\n")[0] != actual.partition("\n")[0]:
+                    # plan wording differs between SQLite versions
+                    self.assertEqual(
+                        portable(actual, not case.allow_scan),
+                        portable(expected, not case.allow_scan),
+                        f"Statements or indexes of {case.name} changed; rerun with UPDATE_QUERY_PLANS=1 if intended",
+                    )
+                    continue
+                if actual != expected:
+                    diff = "".join(difflib.unified_diff(
+                        expected.splitlines(keepends=True), actual.splitlines(keepends=True), str(golden), "actual"
+                    ))
+                    self.fail(f"Query plan of {case.name} changed; rerun with UPDATE_QUERY_PLANS=1 if intended:\n{diff}")
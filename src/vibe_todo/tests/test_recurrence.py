@@ -0,0 +1,90 @@
+import unittest
+from datetime import date
+
+from sqlalchemy import inspect, text
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from vibe_todo.database import add_missing_columns
+from vibe_todo.models import Subtask, TaskRow
+from vibe_todo.recurrence import expand_occurrences, next_occurrence, validate_rule
+from vibe_todo.services import create_list, create_subtask, create_task, get_planned_tasks, toggle_complete
+from vibe_todo.tests.test_services import make_engine, not_none
+
+WEEKDAYS = "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR"
+
+
+class TestRules(unittest.TestCase):
+    def test_validate_rule(self):
+        self.assertEqual(validate_rule("Every weekday"), WEEKDAYS)
+        self.assertEqual(validate_rule("RRULE:FREQ=MONTHLY;BYMONTHDAY=15"), "FREQ=MONTHLY;BYMONTHDAY=15")
+        with self.assertRaises(ValueError):
+            validate_rule("FREQ=SOMETIMES")
+
+    def test_next_occurrence(self):
+        # Friday -> Monday
+        self.assertEqual(next_occurrence(WEEKDAYS, date(2026, 10, 16)), (date(2026, 10, 19), WEEKDAYS))
+        self.assertEqual(
+            not_none(next_occurrence("FREQ=MONTHLY;BYMONTHDAY=15", date(2026, 10, 15)))[0], date(2026, 11, 15)
+        )
+
+    def test_count_limits_the_series(self):
+        upcoming = not_none(next_occurrence("FREQ=DAILY;COUNT=2", date(2026, 1, 1)))
+        self.assertEqual(upcoming, (date(2026, 1, 2), "FREQ=DAILY;COUNT=1"))
+        self.assertIsNone(next_occurrence(upcoming[1], upcoming[0]))
+
+    def test_expand_occurrences_skips_plain_and_completed_tasks(self):
+        rows = [
+            TaskRow(1, 1, "Standup", None, date(2026, 10, 16), False, False, WEEKDAYS),
+            TaskRow(2, 1, "Plain", None, date(2026, 10, 16), False, False),
+            TaskRow(3, 1, "Done", None, date(2026, 10, 16), True, False, WEEKDAYS),
+        ]
+        occurrences = list(expand_occurrences(rows, date(2026, 10, 16), date(2026, 10, 21)))
+        self.assertEqual(
+            [(d, task.id) for d, task in occurrences],
+            [(date(2026, 10, 19), 1), (date(2026, 10, 20), 1), (date(2026, 10, 21), 1)],
+        )
+
+
+class TestRecurringTasks(unittest.TestCase):
+    def setUp(self):
+        self.engine = make_engine()
+        self.session = Session(self.engine)
+        self.list_id = not_none(create_list("Routines", self.session).id)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def test_completing_materializes_only_the_next_occurrence(self):
+        task_id = not_none(create_task(self.list_id, "Standup", self.session, due_date=date(2026, 10, 16), recurrence="Every weekday").id)
+        create_subtask(task_id, "Notes", self.session)
+
+        toggle_complete(task_id, self.session)
+
+        rows = get_planned_tasks(self.session)
+        self.assertEqual(len(rows), 2)
+        done, upcoming = sorted(rows, key=lambda row: not_none(row.due_date))
+        self.assertTrue(done.is_completed)
+        self.assertIsNone(done.recurrence)
+        self.assertEqual((upcoming.due_date, upcoming.is_completed, upcoming.recurrence), (date(2026, 10, 19), False, WEEKDAYS))
+        steps = self.session.exec(select(Subtask.title, Subtask.is_completed).where(Subtask.task_id == upcoming.id)).all()
+        self.assertEqual(steps, [("Notes", False)])
+
+    def test_recurring_task_defaults_to_today(self):
+        task = create_task(self.list_id, "Water plants", self.session, recurrence="Weekly")
+        self.assertEqual(task.due_date, date.today())
+
+
+class TestAddMissingColumns(unittest.TestCase):
+    def test_adds_recurrence_to_existing_task_table(self):
+        engine = create_engine("sqlite://")
+        SQLModel.metadata.create_all(engine)
+        with engine.begin() as conn:
+            # the task table as created before schema version 2
+            conn.execute(text("ALTER TABLE task DROP COLUMN recurrence"))
+
+        added = add_missing_columns(engine)
+
+        self.assertIn("task.recurrence", added)
+        self.assertIn("recurrence", {column["name"] for column in inspect(engine).get_columns("task")})
+        self.assertEqual(add_missing_columns(engine), [])
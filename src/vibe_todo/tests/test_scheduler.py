@@ -0,0 +1,134 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import update
+from sqlmodel import Session, col, create_engine
+
+from vibe_todo.database import create_db_and_tables
+from vibe_todo.models import Task
+from vibe_todo.scheduler import ReminderScheduler
+from vibe_todo.services import create_list, create_task, delete_list, delete_task, restore_list, toggle_complete, update_task
+from vibe_todo.tests.test_services import make_engine, not_none
+
+NOW = datetime(2026, 10, 19, 9, 0)
+
+
+class TestReminderScheduler(unittest.TestCase):
+    def setUp(self):
+        self.engine = make_engine()
+        self.session = Session(self.engine)
+        self.list_id = not_none(create_list("Work", self.session).id)
+        self.fired = []
+        self.scheduler = ReminderScheduler(self.engine, notifiers=[self.fired.append], lookahead=timedelta(hours=1))
+
+    def tearDown(self):
+        self.scheduler.stop()
+        self.session.close()
+        self.engine.dispose()
+
+    def add_task(self, title, remind_at) -> int:
+        return not_none(create_task(self.list_id, title, self.session, remind_at=remind_at).id)
+
+    def test_only_the_lookahead_window_is_loaded(self):
+        self.add_task("Soon", NOW + timedelta(minutes=30))
+        self.add_task("Tomorrow", NOW + timedelta(days=1))
+
+        self.scheduler.tick(NOW)
+        self.assertEqual(len(self.scheduler), 1)
+
+        fired = self.scheduler.tick(NOW + timedelta(minutes=30))
+        self.assertEqual([reminder.title for reminder in fired], ["Soon"])
+        self.assertEqual(self.fired, fired)
+
+        self.scheduler.tick(NOW + timedelta(hours=23, minutes=30))
+        self.assertEqual(len(self.scheduler), 1)
+        self.assertEqual([r.title for r in self.scheduler.tick(NOW + timedelta(days=1))], ["Tomorrow"])
+
+    def test_service_changes_update_the_heap(self):
+        self.scheduler.tick(NOW)
+
+        moved = self.add_task("Moved", NOW + timedelta(minutes=10))
+        deleted = self.add_task("Deleted", NOW + timedelta(minutes=10))
+        completed = self.add_task("Completed", NOW + timedelta(minutes=10))
+        update_task(moved, self.session, remind_at=NOW + timedelta(minutes=20))
+        delete_task(deleted, self.session)
+        toggle_complete(completed, self.session)
+
+        self.assertEqual(self.scheduler.tick(NOW + timedelta(minutes=15)), [])
+        self.assertEqual([r.task_id for r in self.scheduler.tick(NOW + timedelta(minutes=20))], [moved])
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_fired_reminder_is_not_repeated_after_an_edit(self):
+        task_id = self.add_task("Call", NOW + timedelta(minutes=5))
+        self.scheduler.tick(NOW + timedelta(minutes=5))
+
+        update_task(task_id, self.session, title="Call back")
+        self.assertEqual(self.scheduler.tick(NOW + timedelta(minutes=6)), [])
+
+    def test_trashed_list_silences_its_reminders(self):
+        task_id = self.add_task("Call", NOW + timedelta(minutes=10))
+        self.scheduler.tick(NOW)
+
+        delete_list(self.list_id, self.session)
+        self.assertEqual(self.scheduler.tick(NOW + timedelta(minutes=5)), [])
+        self.assertEqual(len(self.scheduler), 0)
+
+        restore_list(self.list_id, self.session)
+        self.assertEqual([r.task_id for r in self.scheduler.tick(NOW + timedelta(minutes=10))], [task_id])
+
+
+class TestReminderSchedulerReplicas(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{Path(self.tmpdir.name) / 'todos.db'}"
+        # two engines on one file stand in for this process and another replica
+        self.engine = create_engine(url)
+        self.other_engine = create_engine(url)
+        create_db_and_tables(self.engine)
+        self.session = Session(self.engine)
+        self.list_id = not_none(create_list("Work", self.session).id)
+        self.scheduler = ReminderScheduler(self.engine, lookahead=timedelta(hours=1))
+        self.scheduler._watcher.poll_interval = 0
+
+    def tearDown(self):
+        self.scheduler.stop()
+        self.session.close()
+        self.engine.dispose()
+        self.other_engine.dispose()
+        self.tmpdir.cleanup()
+
+    def add_task(self, title, remind_at) -> int:
+        return not_none(create_task(self.list_id, title, self.session, remind_at=remind_at).id)
+
+    def test_write_behind_the_event_bus_is_picked_up(self):
+        task_id = self.add_task("Later", NOW + timedelta(days=1))
+        self.scheduler.tick(NOW)
+
+        # e.g. the CLI or another replica, whose events never reach this process
+        with self.other_engine.begin() as conn:
+            conn.execute(update(Task).where(col(Task.id) == task_id).values(remind_at=NOW + timedelta(minutes=10)))
+
+        self.assertEqual([r.task_id for r in self.scheduler.tick(NOW + timedelta(minutes=10))], [task_id])
+
+    def test_local_write_does_not_reload_the_window(self):
+        task_id = self.add_task("Later", NOW + timedelta(days=1))
+        self.scheduler.tick(NOW)
+
+        with (
+            patch.object(self.scheduler, "_load_range", wraps=self.scheduler._load_range) as load_range,
+            patch.object(self.scheduler, "_reload", wraps=self.scheduler._reload) as reload,
+        ):
+            update_task(task_id, self.session, remind_at=NOW + timedelta(minutes=10))
+            fired = self.scheduler.tick(NOW + timedelta(minutes=10))
+
+        self.assertEqual([r.task_id for r in fired], [task_id])
+        reload.assert_called_once_with({task_id})
+        # only the ten minutes the window slid forward are read
+        load_range.assert_called_once_with(NOW + timedelta(hours=1), NOW + timedelta(minutes=70))
+
+
+if __name__ == "__main__":
+    unittest.main()
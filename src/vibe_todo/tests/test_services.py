@@ -0,0 +1,553 @@
+import os
+import time
+import unittest
+from datetime import date, datetime, timedelta
+from typing import TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, col, create_engine, func, select, update
+
+from vibe_todo.database import install_counter_triggers
+from vibe_todo.models import ArchivedSubtask, ArchivedTask, MyDaySummary, MyDayTask, Subtask, SuggestionState, Task, TaskRow
+from vibe_todo.services import (
+    add_to_my_day,
+    archive_completed_tasks,
+    compact_my_day,
+    complete_tasks,
+    create_list,
+    create_subtask,
+    create_task,
+    create_tasks,
+    delete_list,
+    delete_orphans,
+    delete_task,
+    get_all_tasks,
+    get_badge_counts,
+    get_list_by_id,
+    get_trash,
+    get_important_tasks,
+    get_my_day_suggestions,
+    get_my_day_tasks,
+    get_planned_tasks,
+    get_subtasks_by_task,
+    get_tasks_by_list,
+    move_my_day_task,
+    move_task,
+    move_tasks,
+    purge_trash,
+    rebalance_ranks,
+    rebuild_counters,
+    refresh_suggestions,
+    remove_from_my_day,
+    restore_list,
+    restore_task,
+    toggle_complete,
+    toggle_important,
+    unarchive_task,
+    update_task,
+)
+
+
+# Set to a server database URL (e.g. postgresql+psycopg://...) to run the suite against it
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+def make_engine():
+    if TEST_DATABASE_URL:
+        engine = create_engine(TEST_DATABASE_URL)
+        SQLModel.metadata.drop_all(engine)
+    else:
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    SQLModel.metadata.create_all(engine)
+    install_counter_triggers(engine)
+    return engine
+
+
+T = TypeVar("T")
+
+
+def count(session: Session, model) -> int:
+    return session.exec(select(func.count()).select_from(model)).one()
+
+
+def not_none(value: T | None) -> T:
+    """Narrow an Optional for the type checker, e.g. the id of a committed row."""
+    assert value is not None
+    return value
+
+
+class TestCascadingDeletes(unittest.TestCase):
+    def setUp(self):
+        self.engine = make_engine()
+        self.session = Session(self.engine)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def _seed_list(self, name: str, n_tasks: int) -> int:
+        list_id = not_none(create_list(name, self.session).id)
+        for i in range(n_tasks):
+            task_id = not_none(create_task(list_id, f"{name} {i}", self.session).id)
+            create_subtask(task_id, "step", self.session)
+            add_to_my_day(task_id, date.today(), self.session)
+        return list_id
+
+    def test_delete_list_removes_children(self):
+        doomed = self._seed_list("Doomed", 3)
+        kept = self._seed_list("Kept", 2)
+
+        self.assertTrue(delete_list(doomed, self.session))
+        self.assertEqual(count(self.session, Task), 5)
+        purge_trash(datetime.now() + timedelta(seconds=1), self.session, batch_size=2)
+
+        self.assertEqual(count(self.session, Task), 2)
+        self.assertEqual(count(self.session, Subtask), 2)
+        self.assertEqual(count(self.session, MyDayTask), 2)
+        remaining = self.session.exec(select(Task.list_id).distinct()).all()
+        self.assertEqual(remaining, [kept])
+
+    def test_delete_missing_list_returns_false(self):
+        self.assertFalse(delete_list(999, self.session))
+
+    def test_delete_task_removes_children(self):
+        list_id = self._seed_list("Work", 2)
+        task_id = not_none(self.session.exec(select(Task.id).where(Task.list_id == list_id)).first())
+
+        self.assertTrue(delete_task(task_id, self.session))
+        self.assertFalse(delete_task(task_id, self.session))
+        purge_trash(datetime.now() + timedelta(seconds=1), self.session)
+
+        self.assertEqual(count(self.session, Task), 1)
+        self.assertEqual(count(self.session, Subtask), 1)
+        self.assertEqual(count(self.session, MyDayTask), 1)
+
+    @unittest.skipIf(TEST_DATABASE_URL, "orphans can only be created with SQLite foreign keys disabled")
+    def test_delete_orphans(self):
+        list_id = self._seed_list("Legacy", 2)
+        with self.engine.connect() as conn:
+            conn.execute(text("PRAGMA foreign_keys=OFF"))
+            conn.execute(text("DELETE FROM todo_list WHERE id = :id"), {"id": list_id})
+            conn.commit()
+            conn.execute(text("PRAGMA foreign_keys=ON"))
+
+        counts = delete_orphans(self.session)
+
+        self.assertEqual(counts, {"task": 2, "subtask": 2, "mydaytask": 2})
+        self.assertEqual(count(self.session, Task), 0)
+        self.assertEqual(count(self.session, Subtask), 0)
+        self.assertEqual(count(self.session, MyDayTask), 0)
+
+
+class TestTrash(unittest.TestCase):
+    def setUp(self):
+        self.engine = make_engine()
+        self.session = Session(self.engine)
+        self.list_id = not_none(create_list("Errands", self.session).id)
+        self.first = not_none(create_task(self.list_id, "Milk", self.session, is_important=True).id)
+        self.second = not_none(create_task(self.list_id, "Bread", self.session).id)
+        add_to_my_day(self.first, date.today(), self.session)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def test_trashed_task_is_hidden_and_restorable(self):
+        delete_task(self.first, self.session)
+
+        self.assertEqual([t.id for t in get_all_tasks(self.session)], [self.second])
+        self.assertEqual(get_my_day_tasks(date.today(), self.session), [])
+        self.assertEqual([t.id for t in get_trash(self.session)["tasks"]], [self.first])
+        badges = get_badge_counts(date.today(), self.session)
+        self.assertEqual(badges["views"], {"My Day": 0, "Important": 0, "Planned": 0, "Tasks": 1})
+
+        restore_task(self.first, self.session)
+
+        self.assertEqual(len(get_my_day_tasks(date.today(), self.session)), 1)
+        self.assertEqual(get_badge_counts(date.today(), self.session)["views"]["Tasks"], 2)
+        with self.assertRaises(ValueError):
+            restore_task(self.first, self.session)
+
+    def test_restore_list_brings_back_its_tasks_only(self):
+        delete_task(self.second, self.session)
+        delete_list(self.list_id, self.session)
+
+        self.assertIsNone(get_list_by_id(self.list_id, self.session))
+        trash = get_trash(self.session)
+        self.assertEqual([lst.id for lst in trash["lists"]], [self.list_id])
+        self.assertEqual([t.id for t in trash["tasks"]], [self.second])
+        with self.assertRaises(ValueError):
+            restore_task(self.second, self.session)
+        with self.assertRaises(ValueError):
+            create_list("Errands", self.session)
+
+        restore_list(self.list_id, self.session)
+
+        self.assertEqual([t.id for t in get_all_tasks(self.session)], [self.first])
+
+    def test_purge_respects_cutoff(self):
+        delete_list(self.list_id, self.session)
+
+        self.assertEqual(purge_trash(datetime.now() - timedelta(days=1), self.session), {"list": 0, "task": 0})
+        purged = purge_trash(datetime.now() + timedelta(seconds=1), self.session, batch_size=1)
+
+        self.assertEqual(purged, {"list": 1, "task": 2})
+        self.assertEqual(count(self.session, Task), 0)
+        self.assertEqual(count(self.session, MyDayTask), 0)
+
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        self.engine = make_engine()
+        self.session = Session(self.engine)
+        self.list_id = not_none(create_list("Chores", self.session).id)
+        self.old = not_none(create_task(self.list_id, "Old", self.session, is_important=True).id)
+        create_subtask(self.old, "step", self.session)
+        self.pinned = not_none(create_task(self.list_id, "Pinned", self.session).id)
+        add_to_my_day(self.pinned, date.today(), self.session)
+        self.open = not_none(create_task(self.list_id, "Open", self.session).id)
+        for task_id in (self.old, self.pinned):
+            toggle_complete(task_id, self.session)
+        self.session.exec(update(Task).values(updated_at=datetime.now() - timedelta(days=60)))
+        self.session.commit()
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def test_archive_moves_old_completed_tasks_with_subtasks(self):
+        archived = archive_completed_tasks(datetime.now() - timedelta(days=30), self.session, batch_size=1)
+
+        self.assertEqual(archived, 1)
+        self.assertEqual(count(self.session, Task), 2)
+        self.assertEqual(count(self.session, ArchivedSubtask), 1)
+        self.assertEqual(self.session.exec(select(ArchivedTask.task_id)).all(), [self.old])
+        self.assertEqual([t.title for t in get_all_tasks(self.session)], ["Pinned", "Open"])
+        rows = get_all_tasks(self.session, include_archived=True)
+        self.assertEqual([(t.title, t.is_archived) for t in rows], [("Old", True), ("Pinned", False), ("Open", False)])
+        self.assertEqual([t.title for t in get_important_tasks(self.session, include_archived=True)], ["Old"])
+
+    def test_archive_waits_until_my_day_history_is_compacted(self):
+        day = date.today() - timedelta(days=40)
+        add_to_my_day(self.old, day, self.session)
+        self.session.exec(update(Task).values(updated_at=datetime.now() - timedelta(days=60)))
+        self.session.commit()
+        cutoff = datetime.now() - timedelta(days=30)
+
+        self.assertEqual(archive_completed_tasks(cutoff, self.session), 0)
+        compact_my_day(date.today() - timedelta(days=30), self.session)
+        self.assertEqual(archive_completed_tasks(cutoff, self.session), 1)
+        summary = not_none(self.session.get(MyDaySummary, day))
+        self.assertEqual((summary.planned, summary.completed), (1, 1))
+
+    def test_archive_stops_between_batches_at_its_deadline(self):
+        toggle_complete(self.open, self.session)
+        self.session.exec(update(Task).values(updated_at=datetime.now() - timedelta(days=60)))
+        self.session.commit()
+        cutoff = datetime.now() - timedelta(days=30)
+
+        self.assertEqual(archive_completed_tasks(cutoff, self.session, batch_size=1, deadline=time.monotonic()), 1)
+        self.assertEqual(archive_completed_tasks(cutoff, self.session, batch_size=1), 1)
+
+    def test_unarchive_restores_task_and_subtasks(self):
+        archive_completed_tasks(datetime.now() - timedelta(days=30), self.session)
+        archived_id = not_none(self.session.exec(select(ArchivedTask.id)).one())
+
+        task = unarchive_task(archived_id, self.session)
+
+        self.assertEqual(task.title, "Old")
+        self.assertTrue(task.is_completed)
+        self.assertEqual([s.title for s in get_subtasks_by_task(not_none(task.id), self.session)], ["step"])
+        self.assertEqual(count(self.session, ArchivedTask), 0)
+        self.assertEqual(count(self.session, ArchivedSubtask), 0)
+
+
+class TestMyDayCompaction(unittest.TestCase):
+    def setUp(self):
+        self.engine = make_engine()
+        self.session = Session(self.engine)
+        self.today = date.today()
+        self.list_id = not_none(create_list("Chores", self.session).id)
+        self.done = not_none(create_task(self.list_id, "Done", self.session, is_completed=True).id)
+        self.open = not_none(create_task(self.list_id, "Open", self.session).id)
+        for days_ago in (1, 40, 41, 42):
+            for task_id in (self.done, self.open):
+                add_to_my_day(task_id, self.today - timedelta(days=days_ago), self.session)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def test_old_days_become_summaries(self):
+        compacted = compact_my_day(self.today - timedelta(days=30), self.session, batch_days=2)
+
+        self.assertEqual(compacted, 6)
+        self.assertEqual(count(self.session, MyDayTask), 2)
+        summaries = self.session.exec(select(MyDaySummary).order_by(col(MyDaySummary.task_date))).all()
+        self.assertEqual(
+            [(s.task_date, s.planned, s.completed) for s in summaries],
+            [(self.today - timedelta(days=days_ago), 2, 1) for days_ago in (42, 41, 40)],
+        )
+        self.assertEqual(len(get_my_day_tasks(self.today - timedelta(days=1), self.session)), 2)
+
+    def test_late_entries_merge_into_existing_summary(self):
+        compact_my_day(self.today - timedelta(days=30), self.session)
+        late = not_none(create_task(self.list_id, "Late", self.session).id)
+        add_to_my_day(late, self.today - timedelta(days=40), self.session)
+
+        compact_my_day(self.today - timedelta(days=30), self.session)
+
+        summary = not_none(self.session.get(MyDaySummary, self.today - timedelta(days=40)))
+        self.assertEqual((summary.planned, summary.completed), (3, 1))
+        with self.assertRaises(ValueError):
+            compact_my_day(self.today, self.session)
+
+
+class TestTaskRowViews(unittest.TestCase):
+    def setUp(self):
+        self.engine = make_engine()
+        self.session = Session(self.engine)
+        self.list_id = not_none(create_list("Home", self.session).id)
+        self.plain = create_task(self.list_id, "Plain", self.session)
+        self.starred = create_task(
+            self.list_id, "Starred", self.session, is_important=True, due_date=date(2026, 1, 2)
+        )
+        add_to_my_day(not_none(self.plain.id), date(2026, 1, 1), self.session)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def test_views_return_task_rows(self):
+        important = get_important_tasks(self.session)
+        self.assertEqual(len(important), 1)
+        self.assertIsInstance(important[0], TaskRow)
+        self.assertEqual(important[0].title, "Starred")
+        self.assertTrue(important[0].is_important)
+
+        planned = get_planned_tasks(self.session)
+        self.assertEqual([t.due_date for t in planned], [date(2026, 1, 2)])
+
+        my_day = get_my_day_tasks(date(2026, 1, 1), self.session)
+        self.assertEqual([t.id for t in my_day], [self.plain.id])
+
+    def test_get_all_tasks_filters(self):
+        self.assertEqual(len(get_all_tasks(self.session)), 2)
+        rows = get_all_tasks(self.session, filters={"list_id": self.list_id, "title": "star"})
+        self.assertEqual([t.id for t in rows], [self.starred.id])
+
+
+class TestBadgeCounters(unittest.TestCase):
+    def setUp(self):
+        self.engine = make_engine()
+        self.session = Session(self.engine)
+        self.today = date(2026, 3, 10)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def assert_counters_consistent(self):
+        incremental = get_badge_counts(self.today, self.session)
+        rebuild_counters(self.session)
+        self.assertEqual(incremental, get_badge_counts(self.today, self.session))
+        return incremental
+
+    def test_triggers_track_task_changes(self):
+        work = not_none(create_list("Work", self.session).id)
+        home = not_none(create_list("Home", self.session).id)
+        late = not_none(create_task(work, "Late", self.session, due_date=date(2026, 3, 1), is_important=True).id)
+        soon = not_none(create_task(work, "Soon", self.session, due_date=date(2026, 3, 12)).id)
+        chore = not_none(create_task(home, "Chore", self.session).id)
+        add_to_my_day(late, self.today, self.session)
+        add_to_my_day(chore, self.today, self.session)
+
+        counts = self.assert_counters_consistent()
+        self.assertEqual(counts["lists"][work], {"open": 2, "overdue": 1, "important": 1})
+        self.assertEqual(counts["views"], {"My Day": 2, "Important": 1, "Planned": 2, "Tasks": 3})
+
+        toggle_complete(late, self.session)
+        toggle_important(soon, self.session)
+        update_task(chore, self.session, list_id=work, due_date=date(2026, 3, 9))
+        counts = self.assert_counters_consistent()
+        self.assertEqual(counts["lists"], {work: {"open": 2, "overdue": 1, "important": 1}})
+        self.assertEqual(counts["views"], {"My Day": 1, "Important": 1, "Planned": 2, "Tasks": 2})
+
+        remove_from_my_day(chore, self.today, self.session)
+        toggle_complete(late, self.session)
+        delete_task(soon, self.session)
+        counts = self.assert_counters_consistent()
+        self.assertEqual(counts["views"], {"My Day": 1, "Important": 1, "Planned": 2, "Tasks": 2})
+
+        delete_list(work, self.session)
+        counts = self.assert_counters_consistent()
+        self.assertEqual(counts, {"lists": {}, "views": {"My Day": 0, "Important": 0, "Planned": 0, "Tasks": 0}})
+
+    def test_foreign_key_cascade_keeps_counters(self):
+        work = not_none(create_list("Work", self.session).id)
+        task = not_none(create_task(work, "Task", self.session).id)
+        add_to_my_day(task, self.today, self.session)
+
+        with self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM task WHERE id = :id"), {"id": task})
+
+        counts = self.assert_counters_consistent()
+        self.assertEqual(counts["views"]["My Day"], 0)
+
+
+class TestMyDaySuggestions(unittest.TestCase):
+    def setUp(self):
+        self.engine = make_engine()
+        self.session = Session(self.engine)
+        self.today = date.today()
+        self.list_id = not_none(create_list("Work", self.session).id)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def titles(self, limit=5):
+        return [task.title for task in get_my_day_suggestions(self.today, self.session, limit=limit)]
+
+    def test_scores_rank_suggestions(self):
+        create_task(self.list_id, "Overdue", self.session, due_date=self.today - timedelta(days=2), is_important=True)
+        create_task(self.list_id, "Today", self.session, due_date=self.today)
+        create_task(self.list_id, "Tomorrow", self.session, due_date=self.today + timedelta(days=1))
+        create_task(self.list_id, "Plain", self.session)
+        done = not_none(create_task(self.list_id, "Done", self.session, due_date=self.today).id)
+        toggle_complete(done, self.session)
+
+        self.assertEqual(self.titles(), ["Overdue", "Today", "Tomorrow", "Plain"])
+        self.assertEqual(self.titles(limit=2), ["Overdue", "Today"])
+
+    def test_writes_rescore_incrementally_and_my_day_is_excluded(self):
+        today_task = not_none(create_task(self.list_id, "Today", self.session, due_date=self.today).id)
+        plain = not_none(create_task(self.list_id, "Plain", self.session).id)
+        self.assertEqual(self.titles(), ["Today", "Plain"])
+
+        toggle_important(plain, self.session)
+        self.assertEqual(self.titles(), ["Today", "Plain"])
+        update_task(plain, self.session, due_date=self.today - timedelta(days=1))
+        self.assertEqual(self.titles(), ["Plain", "Today"])
+
+        add_to_my_day(today_task, self.today, self.session)
+        self.assertEqual(self.titles(), ["Plain"])
+
+    def test_day_rollover_rescores_yesterdays_my_day(self):
+        yesterday = self.today - timedelta(days=1)
+        carried = not_none(create_task(self.list_id, "Carried over", self.session, due_date=self.today + timedelta(days=1)).id)
+        create_task(self.list_id, "Tomorrow", self.session, due_date=self.today + timedelta(days=1))
+        add_to_my_day(carried, yesterday, self.session)
+
+        refresh_suggestions(yesterday, self.session)
+        self.assertEqual(self.titles(), ["Carried over", "Tomorrow"])
+
+    def test_restored_list_is_rescored_without_dropping_other_scores(self):
+        home = not_none(create_list("Home", self.session).id)
+        create_task(home, "Elsewhere", self.session)
+        create_task(self.list_id, "Today", self.session, due_date=self.today)
+        self.assertEqual(self.titles(), ["Today", "Elsewhere"])
+        delete_list(self.list_id, self.session)
+        self.assertEqual(self.titles(), ["Elsewhere"])
+
+        restore_list(self.list_id, self.session)
+
+        self.assertEqual(not_none(self.session.get(SuggestionState, 1)).scored_on, self.today)
+        self.assertEqual(self.titles(), ["Today", "Elsewhere"])
+
+
+class TestManualOrdering(unittest.TestCase):
+    def setUp(self):
+        self.engine = make_engine()
+        self.session = Session(self.engine)
+        self.list_id = not_none(create_list("Work", self.session).id)
+        self.ids = [not_none(create_task(self.list_id, title, self.session).id) for title in "ABCD"]
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def titles(self, list_id=None):
+        return [task.title for task in get_tasks_by_list(list_id or self.list_id, self.session)]
+
+    def ranks(self) -> dict[int, str]:
+        return {not_none(task_id): not_none(rank) for task_id, rank in self.session.exec(select(Task.id, Task.rank))}
+
+    def test_move_rewrites_only_the_moved_task(self):
+        a, b, c, d = self.ids
+        before = self.ranks()
+
+        move_task(d, a, b, self.session)
+        self.assertEqual(self.titles(), ["A", "D", "B", "C"])
+        after = self.ranks()
+        self.assertEqual({task_id for task_id in before if before[task_id] != after[task_id]}, {d})
+
+        move_task(a, None, None, self.session)
+        self.assertEqual(self.titles(), ["D", "B", "C", "A"])
+        move_task(c, None, d, self.session)
+        self.assertEqual(self.titles(), ["C", "D", "B", "A"])
+        with self.assertRaises(ValueError):
+            move_task(b, a, c, self.session)
+
+    def test_move_between_tasks_of_another_list(self):
+        other = not_none(create_list("Home", self.session).id)
+        x = not_none(create_task(other, "X", self.session).id)
+
+        move_task(self.ids[0], None, x, self.session)
+        self.assertEqual(self.titles(other), ["A", "X"])
+        self.assertEqual(self.titles(), ["B", "C", "D"])
+
+    def test_move_rejects_invalid_neighbours(self):
+        a, b, _, _ = self.ids
+        other = not_none(create_list("Home", self.session).id)
+        x = not_none(create_task(other, "X", self.session).id)
+        before = self.ranks()
+
+        for before_id, after_id in [(a, None), (None, a), (b, b), (b, x)]:
+            with self.subTest(before_id=before_id, after_id=after_id), self.assertRaises(ValueError):
+                move_task(a, before_id, after_id, self.session)
+        self.assertEqual(self.ranks(), before)
+        self.assertEqual(self.titles(), ["A", "B", "C", "D"])
+
+    def test_rebalance_respaces_long_keys(self):
+        a, b, c, d = self.ids
+        for _ in range(8):
+            move_task(d, a, b, self.session)
+            move_task(c, a, d, self.session)
+        order = self.titles()
+
+        rebalance_ranks(self.session, max_length=1)
+        self.assertEqual(self.titles(), order)
+        self.assertTrue(all(len(rank) <= 2 for rank in self.ranks().values()))
+
+    def test_my_day_order(self):
+        a, b, c, _ = self.ids
+        for task_id in (a, b, c):
+            add_to_my_day(task_id, date(2026, 3, 10), self.session)
+
+        move_my_day_task(c, date(2026, 3, 10), None, a, self.session)
+        self.assertEqual([t.title for t in get_my_day_tasks(date(2026, 3, 10), self.session)], ["C", "A", "B"])
+
+    def test_bulk_create_move_and_complete(self):
+        other = not_none(create_list("Home", self.session).id)
+        created = create_tasks([{"list_id": other, "title": f"T{i}"} for i in range(500)], self.session)
+        ranks = self.ranks()
+        self.assertEqual(self.titles(other), [f"T{i}" for i in range(500)])
+        self.assertLessEqual(max(len(ranks[task_id]) for task_id in created), 3)
+        with self.assertRaises(ValueError):
+            create_tasks([{"list_id": other, "title": "ok"}, {"list_id": other, "title": ""}], self.session)
+        self.assertEqual(len(self.titles(other)), 500)
+
+        self.assertEqual(move_tasks([self.ids[1], self.ids[0], 9999], other, self.session), 2)
+        self.assertEqual(self.titles(other)[-2:], ["B", "A"])
+        self.assertEqual(self.titles(), ["C", "D"])
+
+        recurring = not_none(create_task(self.list_id, "Daily", self.session, recurrence="FREQ=DAILY").id)
+        self.assertEqual(complete_tasks([self.ids[2], recurring, created[0]], self.session), 3)
+        self.assertEqual(complete_tasks([self.ids[2]], self.session), 0)
+        self.assertEqual(get_badge_counts(date.today(), self.session)["lists"][self.list_id]["open"], 2)
@@ -9,7 +9,13 @@ from vibe_todo.state import (
     is_task_expanded,
     set_task_filter,
     get_task_filter,
-    clear_task_filters
+    clear_task_filters,
+    get_store,
+    is_delete_pending,
+    mark_task_rendered,
+    set_delete_pending,
+    sweep_task_keys,
+    LRUStore,
 )
 
 class MockSessionState(dict):
@@ -34,8 +40,8 @@ class TestState(unittest.TestCase):
         self.assertIsNone(self.mock_st.session_state.selected_list_id)
         self.assertIn("task_filters", self.mock_st.session_state)
         self.assertEqual(self.mock_st.session_state.task_filters, {})
-        self.assertIn("expanded_tasks", self.mock_st.session_state)
-        self.assertEqual(self.mock_st.session_state.expanded_tasks, set())
+        self.assertEqual(len(get_store("expanded_tasks")), 0)
+        self.assertEqual(self.mock_st.session_state.rendered_tasks, set())
 
     def test_view_management(self):
         self.mock_st.session_state.current_view = "Old"
@@ -49,8 +55,6 @@ class TestState(unittest.TestCase):
         self.assertEqual(get_selected_list_id(), 123)
 
     def test_task_expansion(self):
-        self.mock_st.session_state.expanded_tasks = set()
-        
         toggle_task_expansion(1)
         self.assertTrue(is_task_expanded(1))
         
@@ -65,3 +69,31 @@ class TestState(unittest.TestCase):
         
         clear_task_filters()
         self.assertEqual(self.mock_st.session_state.task_filters, {})
+
+    def test_lru_store_evicts_least_recently_used(self):
+        store = LRUStore(max_size=2)
+        store[1] = "a"
+        store[2] = "b"
+        store.get(1)
+        store[3] = "c"
+        self.assertEqual(list(store), [1, 3])
+
+        store.retain([3])
+        self.assertEqual(list(store), [3])
+        self.assertIs(get_store("expanded_tasks", max_size=2), get_store("expanded_tasks"))
+
+    def test_sweep_drops_keys_of_tasks_not_rendered(self):
+        init_session_state()
+        session_state = self.mock_st.session_state
+        session_state.update({"complete_1": True, "move_up_1": False, "complete_2": False, "important_2": False, "current_view": "List"})
+        set_delete_pending(1, True)
+        set_delete_pending(2, True)
+        mark_task_rendered(1)
+
+        self.assertEqual(sweep_task_keys(), 2)
+        self.assertIn("complete_1", session_state)
+        self.assertIn("move_up_1", session_state)
+        self.assertNotIn("complete_2", session_state)
+        self.assertEqual(session_state.current_view, "List")
+        self.assertTrue(is_delete_pending(1))
+        self.assertFalse(is_delete_pending(2))
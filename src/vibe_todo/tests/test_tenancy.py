@@ -0,0 +1,90 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlmodel import Session
+
+from vibe_todo import database, scheduler, tenancy
+from vibe_todo.metrics import CACHE_LOOKUPS, CACHE_MISSES
+from vibe_todo.scheduler import start_reminders
+from vibe_todo.services import create_list, get_all_lists
+from vibe_todo.tenancy import EnginePool, tenant_database_url
+
+
+class TestEnginePool(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.patchers = [
+            patch.object(tenancy, "TENANT_DATA_DIR", self.tmpdir.name),
+            patch.object(database, "_bootstrapped", set()),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        self.tmpdir.cleanup()
+
+    def test_invalid_tenant_ids(self):
+        for tenant_id in ["", "../etc", "a/b", "x" * 65, "-lead"]:
+            with self.assertRaises(ValueError):
+                tenant_database_url(tenant_id)
+
+    def test_tenants_get_separate_bootstrapped_files(self):
+        pool = EnginePool(max_size=4)
+        for tenant_id in ["acme", "globex"]:
+            with Session(pool.get_engine(tenant_id)) as session:
+                create_list(f"{tenant_id} list", session)
+
+        self.assertTrue((Path(self.tmpdir.name) / "acme.db").exists())
+        with Session(pool.get_engine("acme")) as session:
+            names = [lst.name for lst in get_all_lists(session) if not lst.is_system]
+        self.assertEqual(names, ["acme list"])
+        pool.dispose_all()
+
+    def test_lru_eviction(self):
+        pool = EnginePool(max_size=2)
+        first = pool.get_engine("a")
+        pool.get_engine("b")
+        self.assertIs(pool.get_engine("a"), first)
+        pool.get_engine("c")
+
+        self.assertEqual(len(pool), 2)
+        self.assertIn("a", pool)
+        self.assertNotIn("b", pool)
+        pool.dispose_all()
+
+    def test_engine_lookups_are_counted(self):
+        lookups, misses = CACHE_LOOKUPS.labels("tenant_engines"), CACHE_MISSES.labels("tenant_engines")
+        start = (lookups.value, misses.value)
+        pool = EnginePool(max_size=2)
+        pool.get_engine("a")
+        pool.get_engine("a")
+
+        self.assertEqual((lookups.value - start[0], misses.value - start[1]), (2, 1))
+        pool.dispose_all()
+
+    def test_eviction_stops_the_reminder_scheduler(self):
+        pool = EnginePool(max_size=1)
+        engine = pool.get_engine("a")
+        reminders = start_reminders(engine)
+        pool.get_engine("b")
+
+        self.assertIsNone(reminders._thread)
+        self.assertNotIn(str(engine.url), scheduler._schedulers)
+        pool.dispose_all()
+
+    def test_idle_eviction(self):
+        pool = EnginePool(max_size=4, idle_seconds=60)
+        with patch.object(tenancy.time, "monotonic", return_value=0):
+            pool.get_engine("a")
+        with patch.object(tenancy.time, "monotonic", return_value=30):
+            pool.get_engine("b")
+        with patch.object(tenancy.time, "monotonic", return_value=75):
+            pool.get_engine("c")
+
+        self.assertNotIn("a", pool)
+        self.assertIn("b", pool)
+        pool.dispose_all()
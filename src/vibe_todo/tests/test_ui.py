@@ -0,0 +1,26 @@
+import unittest
+from unittest.mock import Mock, call
+
+from vibe_todo.models import TaskRow
+from vibe_todo.ui import _neighbour_moves
+
+
+class TestNeighbourMoves(unittest.TestCase):
+    def setUp(self):
+        self.tasks = [TaskRow(task_id, 1, f"Task {task_id}", None, None, False, False) for task_id in (10, 20, 30, 40)]
+
+    def test_entries_pass_their_own_neighbours(self):
+        move = Mock()
+        moves = _neighbour_moves(self.tasks, 1, move)
+
+        moves["⬆️ Move up"]()
+        moves["⬇️ Move down"]()
+        self.assertEqual(move.call_args_list, [call(20, None, 10), call(20, 30, 40)])
+
+    def test_ends_only_move_inwards(self):
+        self.assertEqual(list(_neighbour_moves(self.tasks, 0, Mock())), ["⬇️ Move down"])
+        self.assertEqual(list(_neighbour_moves(self.tasks, 3, Mock())), ["⬆️ Move up"])
+
+
+if __name__ == "__main__":
+    unittest.main()
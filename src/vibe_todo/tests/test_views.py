@@ -0,0 +1,12 @@
+import unittest
+
+from vibe_todo.views import VIEW_REGISTRY, get_view_renderer
+
+
+class TestViewRegistry(unittest.TestCase):
+    def test_registered_views_resolve(self):
+        for name in VIEW_REGISTRY:
+            self.assertTrue(callable(get_view_renderer(name)), name)
+
+    def test_unknown_view(self):
+        self.assertIsNone(get_view_renderer("List"))
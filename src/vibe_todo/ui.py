@@ -4,7 +4,7 @@ from datetime import date, timedelta
 import streamlit as st
 from sqlmodel import Session
 
-from vibe_todo.models import Task
+from vibe_todo.models import TaskRow
 from vibe_todo.services import (
     toggle_complete,
     toggle_important,
@@ -15,11 +15,20 @@ from vibe_todo.services import (
     add_to_my_day,
     get_important_tasks,
     get_planned_tasks,
-    get_all_lists
+    get_all_lists,
+    get_my_day_suggestions,
+    move_task,
+    move_my_day_task,
+    get_trash,
+    restore_task,
+    restore_list,
+    unarchive_task
 )
 from vibe_todo.logger import logger
+from vibe_todo.recurrence import expand_occurrences
+from vibe_todo.state import is_delete_pending, mark_task_rendered, set_delete_pending
 
-def render_task_card(task: Task, session: Session, show_remove_from_my_day: bool = False):
+def render_task_card(task: TaskRow, session: Session, show_remove_from_my_day: bool = False, moves: dict | None = None):
     """
     Render a single task card.
 
@@ -27,7 +36,13 @@ def render_task_card(task: Task, session: Session, show_remove_from_my_day: bool
         task: The task to display
         session: Database session
         show_remove_from_my_day: Whether to show the 'Remove from My Day' button
+        moves: Optional menu entries mapping a label to a callback that moves the task
     """
+    mark_task_rendered(task.id)
+    if task.is_archived:
+        render_archived_task_card(task, session)
+        return
+
     with st.container(border=True):
         col1, col2, col3, col4 = st.columns([0.05, 0.75, 0.1, 0.1])
 
@@ -56,6 +71,8 @@ def render_task_card(task: Task, session: Session, show_remove_from_my_day: bool
                 details.append(task.description)
             if task.due_date:
                 details.append(f"📅 {task.due_date.strftime('%Y-%m-%d')}")
+            if task.recurrence:
+                details.append("🔁 Repeats")
             
             if details:
                 st.caption(" • ".join(details))
@@ -79,6 +96,9 @@ def render_task_card(task: Task, session: Session, show_remove_from_my_day: bool
         with col4:
             # More actions (Delete, Remove from My Day)
             with st.popover("⋮"):
+                for label, on_move in (moves or {}).items():
+                    st.button(label, key=f"move_{label.split()[-1].lower()}_{task.id}", use_container_width=True, on_click=on_move)
+
                 if show_remove_from_my_day:
                     def on_remove_my_day():
                         try:
@@ -97,7 +117,7 @@ def render_task_card(task: Task, session: Session, show_remove_from_my_day: bool
                     except Exception as e:
                         st.error(f"Error deleting task: {e}")
 
-                if st.session_state.get(f"confirm_delete_{task.id}"):
+                if is_delete_pending(task.id):
                     st.warning("Are you sure?")
                     col_del_1, col_del_2 = st.columns(2)
                     with col_del_1:
@@ -105,14 +125,63 @@ def render_task_card(task: Task, session: Session, show_remove_from_my_day: bool
                             on_delete()
                     with col_del_2:
                         if st.button("No", key=f"cancel_del_btn_{task.id}", use_container_width=True):
-                            st.session_state[f"confirm_delete_{task.id}"] = False
+                            set_delete_pending(task.id, False)
                             st.rerun()
                 else:
                     if st.button("🗑️ Delete", key=f"delete_{task.id}", type="primary", use_container_width=True):
-                        st.session_state[f"confirm_delete_{task.id}"] = True
+                        set_delete_pending(task.id, True)
                         st.rerun()
 
 
+def render_archived_task_card(task: TaskRow, session: Session):
+    """
+    Render a read-only card for an archived task with a button to restore it.
+
+    Args:
+        task: The archived task row
+        session: Database session
+    """
+    with st.container(border=True):
+        col1, col2 = st.columns([0.8, 0.2])
+        with col1:
+            st.markdown(f"{'⭐ ' if task.is_important else ''}~~{task.title}~~")
+            details = ["🗄️ Archived"]
+            if task.due_date:
+                details.append(f"📅 {task.due_date.strftime('%Y-%m-%d')}")
+            st.caption(" • ".join(details))
+        with col2:
+            if st.button("Restore", key=f"unarchive_{task.id}", use_container_width=True):
+                try:
+                    unarchive_task(task.id, session)
+                    st.rerun()
+                except ValueError as e:
+                    st.error(f"Error restoring task: {e}")
+
+
+def _neighbour_moves(tasks: list[TaskRow], index: int, move) -> dict:
+    """
+    Build 'Move up' / 'Move down' entries for the task at index in an ordered list.
+
+    Args:
+        tasks: Tasks in display order
+        index: Position of the task to build entries for
+        move: Function taking (task_id, before_id, after_id)
+    """
+    def ids(*positions):
+        return [tasks[i].id if 0 <= i < len(tasks) else None for i in positions]
+
+    task_id = tasks[index].id
+    moves = {}
+    if index > 0:
+        before_id, after_id = ids(index - 2, index - 1)
+        # bind the neighbours now; the names are reassigned for the other entry
+        moves["⬆️ Move up"] = lambda b=before_id, a=after_id: move(task_id, b, a)
+    if index < len(tasks) - 1:
+        before_id, after_id = ids(index + 1, index + 2)
+        moves["⬇️ Move down"] = lambda b=before_id, a=after_id: move(task_id, b, a)
+    return moves
+
+
 def render_my_day_view(session: Session):
     """
     Render the 'My Day' view.
@@ -125,16 +194,39 @@ def render_my_day_view(session: Session):
     
     try:
         tasks = get_my_day_tasks(today, session)
+        all_tasks = get_all_tasks(session)
         
         if not tasks:
             st.info("No tasks in My Day. Add some tasks from other lists!")
         else:
-            for task in tasks:
-                render_task_card(task, session, show_remove_from_my_day=True)
+            def move(task_id, before_id, after_id):
+                move_my_day_task(task_id, today, before_id, after_id, session)
+
+            for index, task in enumerate(tasks):
+                render_task_card(task, session, show_remove_from_my_day=True, moves=_neighbour_moves(tasks, index, move))
+
+        # Recurring tasks that would repeat today once their current occurrence is done
+        repeating_today = [task for _, task in expand_occurrences(all_tasks, today, today)]
+        if repeating_today:
+            st.caption("🔁 Also repeating today: " + ", ".join(task.title for task in repeating_today))
+
+        suggestions = get_my_day_suggestions(today, session)
+        if suggestions:
+            st.subheader("💡 Suggestions")
+            for task in suggestions:
+                mark_task_rendered(task.id)
+                c1, c2 = st.columns([0.8, 0.2])
+                with c1:
+                    st.write(f"{'⭐ ' if task.is_important else ''}{task.title}")
+                    if task.due_date:
+                        st.caption(f"📅 {task.due_date.strftime('%Y-%m-%d')}")
+                with c2:
+                    if st.button("Add", key=f"add_suggestion_{task.id}"):
+                        add_to_my_day(task.id, today, session)
+                        st.rerun()
 
         st.divider()
         with st.expander("➕ Add tasks from other lists"):
-            all_tasks = get_all_tasks(session)
             # Filter out tasks already in My Day and completed tasks
             my_day_ids = {t.id for t in tasks} if tasks else set()
             available_tasks = [t for t in all_tasks if t.id not in my_day_ids and not t.is_completed]
@@ -143,6 +235,7 @@ def render_my_day_view(session: Session):
                 st.info("No available tasks to add.")
             else:
                 for task in available_tasks:
+                    mark_task_rendered(task.id)
                     c1, c2 = st.columns([0.8, 0.2])
                     with c1:
                         st.write(f"{task.title}")
@@ -200,7 +293,7 @@ def render_important_view(session: Session):
         st.error("Failed to load Important tasks")
 
 
-def _group_tasks_by_date(tasks: list[Task]) -> dict[str, list[Task]]:
+def _group_tasks_by_date(tasks: list[TaskRow]) -> dict[str, list[TaskRow]]:
     """
     Helper function to group tasks by date categories.
     
@@ -218,27 +311,34 @@ def _group_tasks_by_date(tasks: list[Task]) -> dict[str, list[Task]]:
     }
     
     today = date.today()
-    tomorrow = today + timedelta(days=1)
-    next_week_end = today + timedelta(days=7)
     
     for task in tasks:
         if not task.due_date:
             continue
             
-        d = task.due_date
-        
-        if d <= today:
-            grouped["Today"].append(task)
-        elif d == tomorrow:
-            grouped["Tomorrow"].append(task)
-        elif tomorrow < d <= next_week_end:
-            grouped["This Week"].append(task)
-        else:
-            grouped["Later"].append(task)
+        grouped[_date_group(task.due_date, today)].append(task)
             
     return grouped
 
 
+def _date_group(d: date, today: date) -> str:
+    """Name the Planned group a date falls into."""
+    tomorrow = today + timedelta(days=1)
+    if d <= today:
+        return "Today"
+    if d == tomorrow:
+        return "Tomorrow"
+    if d <= today + timedelta(days=7):
+        return "This Week"
+    return "Later"
+
+
+def _render_occurrences(occurrences: list[tuple[date, TaskRow]]):
+    """Render computed occurrences of recurring tasks as read-only lines."""
+    for occurrence, task in occurrences:
+        st.caption(f"🔁 {task.title} · {occurrence.strftime('%a, %b %d')}")
+
+
 def render_planned_view(session: Session):
     """
     Render the 'Planned' view.
@@ -262,24 +362,35 @@ def render_planned_view(session: Session):
             st.info("No planned tasks found. Add a due date to your tasks to see them here!")
             return
 
+        # Upcoming occurrences of recurring tasks, computed only for the coming week
+        today = date.today()
+        upcoming = {"Today": [], "Tomorrow": [], "This Week": []}
+        for occurrence, task in sorted(
+            expand_occurrences(tasks, today, today + timedelta(days=7)), key=lambda item: item[0]
+        ):
+            upcoming[_date_group(occurrence, today)].append((occurrence, task))
+
         # Render groups
         # Today
-        if grouped["Today"]:
-            with st.expander(f"Today ({len(grouped['Today'])})", expanded=True):
+        if grouped["Today"] or upcoming["Today"]:
+            with st.expander(f"Today ({len(grouped['Today']) + len(upcoming['Today'])})", expanded=True):
                 for task in grouped["Today"]:
                     render_task_card(task, session)
+                _render_occurrences(upcoming["Today"])
         
         # Tomorrow
-        if grouped["Tomorrow"]:
-            with st.expander(f"Tomorrow ({len(grouped['Tomorrow'])})", expanded=True):
+        if grouped["Tomorrow"] or upcoming["Tomorrow"]:
+            with st.expander(f"Tomorrow ({len(grouped['Tomorrow']) + len(upcoming['Tomorrow'])})", expanded=True):
                 for task in grouped["Tomorrow"]:
                     render_task_card(task, session)
+                _render_occurrences(upcoming["Tomorrow"])
 
         # This Week
-        if grouped["This Week"]:
-            with st.expander(f"This Week ({len(grouped['This Week'])})", expanded=True):
+        if grouped["This Week"] or upcoming["This Week"]:
+            with st.expander(f"This Week ({len(grouped['This Week']) + len(upcoming['This Week'])})", expanded=True):
                 for task in grouped["This Week"]:
                     render_task_card(task, session)
+                _render_occurrences(upcoming["This Week"])
                     
         # Later
         if grouped["Later"]:
@@ -343,6 +454,7 @@ def render_tasks_view(session: Session):
             st.write("")
             st.write("")
             filter_important = st.checkbox("Show only Important", key="tasks_filter_important")
+            include_archived = st.checkbox("Include archived", key="tasks_include_archived")
 
     # Build filters dictionary
     filters = {}
@@ -359,12 +471,19 @@ def render_tasks_view(session: Session):
         filters["is_important"] = True
 
     try:
-        tasks = get_all_tasks(session, filters=filters)
+        tasks = get_all_tasks(session, filters=filters, include_archived=include_archived)
         
         st.caption(f"Found {len(tasks)} tasks")
         
         if not tasks:
             st.info("No tasks found matching the selected filters.")
+        elif selected_list_id is not None and not filters.keys() - {"list_id"} and not include_archived:
+            # manual order only makes sense on a whole, unfiltered list
+            def move(task_id, before_id, after_id):
+                move_task(task_id, before_id, after_id, session)
+
+            for index, task in enumerate(tasks):
+                render_task_card(task, session, moves=_neighbour_moves(tasks, index, move))
         else:
             for task in tasks:
                 render_task_card(task, session)
@@ -372,3 +491,56 @@ def render_tasks_view(session: Session):
     except Exception as e:
         logger.error(f"Error rendering Tasks view: {e}")
         st.error("Failed to load tasks")
+
+
+def render_trash_view(session: Session):
+    """
+    Render the 'Trash' view with restore buttons.
+
+    Args:
+        session: Database session
+    """
+    st.title("🗑️ Trash")
+
+    try:
+        trash = get_trash(session)
+        st.caption("Deleted lists and tasks are removed permanently after a while.")
+
+        if not trash["lists"] and not trash["tasks"]:
+            st.info("The trash is empty.")
+            return
+
+        if trash["lists"]:
+            st.subheader("Lists")
+            for lst in trash["lists"]:
+                col1, col2 = st.columns([0.8, 0.2])
+                with col1:
+                    st.markdown(f"📁 **{lst.name}**")
+                    st.caption(f"Deleted {lst.deleted_at:%Y-%m-%d %H:%M}")
+                with col2:
+                    if st.button("Restore", key=f"restore_list_{lst.id}", use_container_width=True):
+                        try:
+                            restore_list(lst.id, session)
+                            st.rerun()
+                        except ValueError as e:
+                            st.error(f"Error restoring list: {e}")
+
+        if trash["tasks"]:
+            st.subheader("Tasks")
+            for task in trash["tasks"]:
+                mark_task_rendered(task.id)
+                col1, col2 = st.columns([0.8, 0.2])
+                with col1:
+                    title = f"~~{task.title}~~" if task.is_completed else task.title
+                    st.markdown(f"{'⭐ ' if task.is_important else ''}{title}")
+                with col2:
+                    if st.button("Restore", key=f"restore_task_{task.id}", use_container_width=True):
+                        try:
+                            restore_task(task.id, session)
+                            st.rerun()
+                        except ValueError as e:
+                            st.error(f"Error restoring task: {e}")
+
+    except Exception as e:
+        logger.error(f"Error rendering Trash view: {e}")
+        st.error("Failed to load the trash")
@@ -0,0 +1,73 @@
+"""Admin view with process and session memory accounting."""
+
+import streamlit as st
+from sqlmodel import Session
+
+from vibe_todo.memory import (
+    MEMORY_TRACE_RERUNS,
+    recent_reports,
+    session_sizes,
+    session_state_sizes,
+    start_rss_sampler,
+)
+
+_MIB = 2**20
+
+
+def render_admin_view(session: Session):
+    """
+    Render the 'Admin' view: process RSS, session_state sizes and tracemalloc reports.
+
+    Args:
+        session: Database session (unused, views share one signature)
+    """
+    st.title("🛠️ Admin")
+
+    sampler = start_rss_sampler()
+    latest = sampler.latest()
+    own_state = session_state_sizes(st.session_state)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Process RSS", f"{latest.rss / _MIB:.1f} MiB")
+    col2.metric("Peak RSS", f"{sampler.peak / _MIB:.1f} MiB")
+    col3.metric("This session's state", f"{sum(own_state.values()) / 1024:.1f} KiB")
+
+    if len(sampler.samples) > 1:
+        st.line_chart({"RSS (MiB)": [sample.rss / _MIB for sample in sampler.samples]}, height=200)
+
+    st.subheader("Session state")
+    st.caption("Estimated sizes; shared resources such as engines count once, at their first key.")
+    st.dataframe(
+        [{"key": key, "KiB": round(size / 1024, 1)} for key, size in list(own_state.items())[:20]],
+        hide_index=True,
+        use_container_width=True,
+    )
+    sessions = session_sizes()
+    if sessions:
+        st.caption(f"Latest estimates of {len(sessions)} sessions in this process")
+        st.dataframe(
+            [
+                {"session": session_id[:8], "KiB": round(size.total / 1024, 1), "keys": size.keys, "largest": size.largest, "at": size.at}
+                for session_id, size in sessions.items()
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
+
+    st.subheader("Allocations")
+    if MEMORY_TRACE_RERUNS:
+        st.caption("Every rerun is traced (MEMORY_TRACE_RERUNS).")
+    elif st.button("Trace the next rerun", help="Runs tracemalloc for one rerun of this page, then stops it"):
+        st.session_state.memory_capture_requested = True
+        st.rerun()
+
+    for report in recent_reports():
+        with st.expander(f"{report.at:%H:%M:%S} · {report.label} · {report.net_bytes / 1024:+.1f} KiB in {report.duration:.2f}s"):
+            st.caption(f"Traced peak {report.peak_bytes / _MIB:.1f} MiB")
+            st.dataframe(
+                [
+                    {"location": a.location, "KiB": round(a.size_diff / 1024, 1), "blocks": a.count_diff, "total KiB": round(a.size / 1024, 1)}
+                    for a in report.top
+                ],
+                hide_index=True,
+                use_container_width=True,
+            )
@@ -0,0 +1,94 @@
+"""Stats dashboard view, kept separate so NumPy only loads when it is opened."""
+
+from datetime import date, timedelta
+
+import streamlit as st
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+from vibe_todo.analytics import TaskSnapshot
+from vibe_todo.invalidation import get_data_generation
+from vibe_todo.logger import logger
+from vibe_todo.metrics import CACHE_LOOKUPS, CACHE_MISSES
+from vibe_todo.services import get_all_lists
+
+
+@st.cache_resource
+def get_task_snapshot(database_url: str, _engine: Engine) -> TaskSnapshot:
+    """
+    Get the process-wide analytics snapshot for a database.
+
+    The snapshot keeps its column arrays between reruns and only merges
+    changes on refresh.
+
+    Args:
+        database_url: Database URL, used as the cache key
+        _engine: Engine the snapshot reads from (not hashed)
+
+    Returns:
+        TaskSnapshot: Shared analytics snapshot
+    """
+    CACHE_MISSES.labels("task_snapshot").inc()
+    return TaskSnapshot(_engine)
+
+
+def render_stats_view(session: Session):
+    """
+    Render the 'Stats' dashboard from the columnar analytics snapshot.
+
+    Args:
+        session: Database session
+    """
+    st.title("📊 Stats")
+
+    try:
+        engine = session.get_bind().engine
+        CACHE_LOOKUPS.labels("task_snapshot").inc()
+        snapshot = get_task_snapshot(str(engine.url), engine)
+        snapshot.refresh(get_data_generation(engine))
+        today = date.today()
+
+        total = len(snapshot.tasks["id"])
+        completed = int(snapshot.tasks["is_completed"].sum())
+        subtasks = snapshot.subtask_progress()
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Tasks", total)
+        col2.metric("Open", total - completed)
+        col3.metric("Overdue", snapshot.overdue_count(today))
+        col4.metric("Subtasks done", f"{subtasks['completed']}/{subtasks['total']}")
+
+        st.subheader("Completion by list")
+        list_names = {lst.id: lst.name for lst in get_all_lists(session)}
+        rates = snapshot.completion_rate_by_list()
+        if not rates:
+            st.info("No tasks yet.")
+        else:
+            st.dataframe(
+                [
+                    {
+                        "List": list_names.get(list_id, f"#{list_id}"),
+                        "Tasks": stats["total"],
+                        "Completed": stats["completed"],
+                        "Completion rate": f"{stats['rate']:.0%}",
+                    }
+                    for list_id, stats in rates.items()
+                ],
+                use_container_width=True,
+                hide_index=True,
+            )
+
+        st.subheader("Open tasks due in the next 30 days")
+        histogram = snapshot.due_date_histogram(today, today + timedelta(days=29))
+        st.bar_chart({"Due": {day.isoformat(): n for day, n in histogram.items()}})
+
+        st.subheader("My Day adherence (last 14 days)")
+        adherence = snapshot.my_day_adherence(today - timedelta(days=13), today)
+        if not adherence:
+            st.info("No My Day history in this period.")
+        else:
+            st.line_chart({"Completion rate": {day.isoformat(): stats["rate"] for day, stats in adherence.items()}})
+
+    except Exception as e:
+        logger.error(f"Error rendering Stats view: {e}")
+        st.error("Failed to load stats")
@@ -0,0 +1,52 @@
+"""Lazy registry of view renderers.
+
+Views are registered by import path and only imported the first time they
+are rendered, so a cold worker pays for the active view's module alone.
+"""
+
+import importlib
+from functools import cache
+from typing import Callable
+
+from sqlmodel import Session
+
+# View name -> "module:function" of its renderer; every renderer takes a session
+VIEW_REGISTRY: dict[str, str] = {
+    "My Day": "vibe_todo.ui:render_my_day_view",
+    "Important": "vibe_todo.ui:render_important_view",
+    "Planned": "vibe_todo.ui:render_planned_view",
+    "Tasks": "vibe_todo.ui:render_tasks_view",
+    "Stats": "vibe_todo.ui_stats:render_stats_view",
+    "Trash": "vibe_todo.ui:render_trash_view",
+    "Admin": "vibe_todo.ui_admin:render_admin_view",
+}
+
+
+def register_view(name: str, target: str) -> None:
+    """
+    Register a view renderer by import path.
+
+    Args:
+        name: View name as stored in session state
+        target: Renderer location in "module:function" form
+    """
+    VIEW_REGISTRY[name] = target
+    get_view_renderer.cache_clear()
+
+
+@cache
+def get_view_renderer(name: str) -> Callable[[Session], None] | None:
+    """
+    Import and return the renderer registered for a view.
+
+    Args:
+        name: View name
+
+    Returns:
+        Callable[[Session], None] | None: The renderer, or None if the view is not registered
+    """
+    target = VIEW_REGISTRY.get(name)
+    if target is None:
+        return None
+    module_name, function_name = target.split(":")
+    return getattr(importlib.import_module(module_name), function_name)